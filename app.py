@@ -5,7 +5,7 @@ from datetime import datetime, timedelta
 import textwrap
 import extra_streamlit_components as stx
 import time
-from services.espn_api import (calculate_game_score, get_score_color)
+from services.espn_api import get_score_color
 from auth import check_authentication_enhanced, inject_auth_bridge, logout_enhanced
 import os
 import pickle
@@ -756,15 +756,12 @@ from components.sidebar import render_sidebar
 from components.tables import render_tables
 from components.mvp_lvp import render_mvp_lvp_section
 from services.espn_api import (
-    get_last_available_game_date,
     get_cached_boxscore,
-    get_scoreboard
+    get_rewatch_games
 )
+from services import date_bundle, resilience, scoring
+from components.service_status import render_service_status
 
-try:
-    from services.scoring import calculate_scores
-except ImportError:
-    pass
 
 load_styles()
 
@@ -1071,16 +1068,8 @@ def show_boxscore_dialog(game_info):
         st.warning("Box score details are not available yet.")
         return
 
+    # Stat'lar tipli gelir (boxscore ingest), FG/3PT/FT gösterim string'leri hazır
     df = pd.DataFrame(players)
-    numeric_cols = ["PTS", "REB", "AST", "STL", "BLK", "TO", "FGM", "FGA", "3Pts", "3PTA", "FTM", "FTA"]
-    for c in numeric_cols:
-        df[c] = pd.to_numeric(df.get(c, 0), errors="coerce").fillna(0)
-
-    df["FG"] = df.apply(lambda x: f"{int(x['FGM'])}-{int(x['FGA'])}", axis=1)
-    df["3PT"] = df.apply(lambda x: f"{int(x['3Pts'])}-{int(x['3PTA'])}", axis=1)
-    df["FT"] = df.apply(lambda x: f"{int(x['FTM'])}-{int(x['FTA'])}", axis=1)
-    if "MIN" not in df.columns:
-        df["MIN"] = "--"
 
     display_cols = ["PLAYER", "MIN", "FG", "3PT", "FT", "PTS", "REB", "AST", "STL", "BLK", "TO"]
     final_cols = [c for c in display_cols if c in df.columns]
@@ -1116,7 +1105,7 @@ def show_boxscore_dialog(game_info):
             with container:
                 team_df = df[df["TEAM"].astype(str).str.contains(team_name, case=False, na=False)].copy()
                 if not team_df.empty:
-                    team_df = team_df.sort_values("MIN", ascending=False, key=lambda x: pd.to_numeric(x, errors='coerce').fillna(0))
+                    team_df = team_df.sort_values("MIN", ascending=False)
                     if is_pro and user:
                         wl = db.get_watchlist(user['id'])
                         wl_names = [w['player_name'] for w in wl]
@@ -1139,6 +1128,32 @@ def show_boxscore_dialog(game_info):
 
 
 # ==================== 14. ANA SAYFA ====================
+def render_rewatch_games(end_date):
+    """Son 7 günün en heyecanlı maçları (skor gösterilmez, ek istek atılmaz)."""
+    ranked = get_rewatch_games(end_date, days=7, limit=5)
+    if ranked.empty:
+        return
+
+    with st.expander("🔁 Best Games to Re-watch (last 7 days)", expanded=False):
+        for _, g in ranked.iterrows():
+            details = []
+            if pd.notna(g.get('lead_changes')):
+                details.append(f"{int(g['lead_changes'])} lead changes")
+            if pd.notna(g.get('overtimes')) and g['overtimes'] > 0:
+                details.append("OT" if g['overtimes'] == 1 else f"{int(g['overtimes'])}OT")
+            if pd.notna(g.get('late_margin')) and g['late_margin'] <= 5:
+                details.append("close finish")
+            day = datetime.strptime(g['game_date'], "%Y-%m-%d").strftime("%b %d")
+            st.markdown(f"""
+                <div style="display:flex;align-items:center;gap:10px;margin-bottom:6px;">
+                    <span style="background-color:{get_score_color(g['excitement'])};color:white;
+                        padding:2px 8px;border-radius:10px;font-weight:bold;font-size:0.78em;">★ {g['excitement']}</span>
+                    <span style="font-weight:bold;">{g['away_team']} @ {g['home_team']}</span>
+                    <span style="color:grey;font-size:0.85em;">{day}{' · ' + ' · '.join(details) if details else ''}</span>
+                </div>
+            """, unsafe_allow_html=True)
+
+
 def home_page():
     if 'active_dialog' not in st.session_state:
         st.session_state.active_dialog = None
@@ -1169,12 +1184,15 @@ def home_page():
         st.info("Select parameters and click Run.")
         return
 
-    resolved_date, game_ids = get_last_available_game_date(date)
-    if not game_ids:
+    # Scoreboard + tüm boxscore'lar paralel, günlük frame ve heyecan puanları tek seferde
+    bundle = date_bundle.get_date_bundle(date)
+    if bundle is None:
         st.warning("No NBA games found.")
         return
 
-    games = get_scoreboard(resolved_date)
+    resolved_date = bundle["date"]
+    games = bundle["games"]
+    excitement = bundle["excitement"]
     st.caption(f"Games from {resolved_date.strftime('%B %d, %Y')}")
 
     col_header1, col_header2 = st.columns([3, 1])
@@ -1211,7 +1229,7 @@ def home_page():
                 with cols[i]:
                     with st.container(border=True):
                         game_id = g.get('game_id', f'game_{i}')
-                        game_score = calculate_game_score(g.get('home_score'), g.get('away_score'), g.get('status'))
+                        game_score = excitement.get(str(game_id))
 
                         if game_score:
                             score_color = get_score_color(game_score)
@@ -1273,22 +1291,13 @@ def home_page():
                 st.session_state.show_all_games = True
                 st.rerun()
 
+    render_rewatch_games(resolved_date)
+
     st.divider()
     st.subheader("Daily Fantasy Stats")
 
-    all_players = []
-    for gid in game_ids:
-        box = get_cached_boxscore(gid)
-        if box:
-            all_players.extend(box)
-
-    if all_players:
-        df = pd.DataFrame(all_players)
-        num_cols = ["PTS", "REB", "AST", "STL", "BLK", "TO", "FGA", "FGM", "FTA", "FTM", "3Pts"]
-        for c in num_cols:
-            if c not in df.columns:
-                df[c] = 0
-            df[c] = pd.to_numeric(df[c], errors="coerce").fillna(0)
+    df = bundle["players_df"]
+    if not df.empty:
         st.session_state["period_df"] = df.copy()
 
         if is_pro and user:
@@ -1313,7 +1322,9 @@ def home_page():
         elif not is_pro:
             st.info("**PRO Feature:** Login with a PRO account to add players to your watchlist!")
 
-        render_tables(df, weights=weights)
+        # Kayıtlı puanlama ayarı varsa aynı matris çarpımında ikinci kolon olarak
+        saved = scoring.saved_weights(prefs)
+        render_tables(df, weights=weights, profiles={"My Score": saved} if saved else None)
     else:
         st.info("No stats available for the selected date.")
 
@@ -1324,4 +1335,11 @@ def home_page():
         render_mvp_lvp_section(date_range, weights, current_period)
 
 
-home_page()
\ No newline at end of file
+# ESPN yavaşken sayfa sabit sürede çizilir: istekler bu bütçeyi aşamaz,
+# aşılırsa son başarılı veri (stale) gösterilir
+HOME_PAGE_BUDGET = 10  # saniye
+
+status_slot = st.empty()
+with resilience.page_budget(HOME_PAGE_BUDGET) as page_status:
+    home_page()
+render_service_status(status_slot, page_status)
@@ -1,98 +1,158 @@
+import threading
 import streamlit as st
+import numpy as np
 import pandas as pd
-from collections import Counter
-
-def calculate_mvp_lvp_from_df(df: pd.DataFrame, weights: dict):
+from collections import Counter, OrderedDict
+from services import aggregation, scoring
+
+MVP_TOP_K = 10          # Daily Top/Bottom list size
+POOL_MINUTES = 20       # Minutes needed to be ranked on a day
+MIN_MINUTES = 5         # Minutes needed for team metadata
+MVP_CACHE_MAX = 32      # Cached (data, date range, weights, thresholds) results
+
+_cache_lock = threading.Lock()
+_mvp_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+
+
+def _frequency_table(players: pd.Series, first_seen: np.ndarray, meta: pd.Series, top_n: int) -> pd.DataFrame:
+    """Appearance counts, most first; ties keep the order players first made the list."""
+    if players.empty:
+        return pd.DataFrame()
+    by_player = pd.Series(first_seen, index=players.to_numpy()).groupby(level=0, sort=False)
+    counts = pd.DataFrame({"Appearances": by_player.size(), "first": by_player.min()})
+    counts = counts.sort_values(["Appearances", "first"], ascending=[False, True]).head(top_n)
+    return pd.DataFrame({
+        "Player": counts.index,
+        "Team": meta.reindex(counts.index).fillna("").to_numpy(),
+        "Appearances": counts["Appearances"].to_numpy(),
+    })
+
+
+def calculate_mvp_lvp_from_df(df: pd.DataFrame, weights: dict, k: int = MVP_TOP_K,
+                              pool_minutes: float = POOL_MINUTES, min_minutes: float = MIN_MINUTES,
+                              top_n: int = 15):
     """
-    Calculates the frequency of players appearing in the Top 10 (MVP) 
-    or Bottom 10 (LVP) for each distinct day in the dataframe.
+    Calculates the frequency of players appearing in the Top k (MVP) 
+    or Bottom k (LVP) for each distinct day in the dataframe.
+    One groupby/rank pass over all days: players with at least pool_minutes
+    are ranked within their day, ranks <= k are counted.
     """
-    df = df.copy()
+    if "DATE" not in df.columns or df.empty:
+        return pd.DataFrame(), pd.DataFrame()
 
-    # ------------------
-    # 1. DATE CHECK
-    # ------------------
-    if "DATE" not in df.columns:
+    minutes = pd.to_numeric(df["MIN"], errors="coerce").fillna(0).to_numpy() if "MIN" in df.columns \
+        else np.zeros(len(df))
+    frame = pd.DataFrame({
+        "PLAYER": df["PLAYER"].to_numpy(),
+        "TEAM": df["TEAM"].to_numpy() if "TEAM" in df.columns else "",
+        "DAY": pd.factorize(df["DATE"])[0],     # days in order of first appearance
+        "MIN": minutes,
+        "score": scoring.score_frame(df, weights).to_numpy(),
+    })
+    # Undated rows (NaT -> code -1) belong to no day
+    frame = frame[frame["DAY"] >= 0]
+
+    # Team metadata: first qualifying row per player (day order, then row order)
+    played = frame[frame["MIN"] >= min_minutes].sort_values("DAY", kind="stable")
+    meta = played.drop_duplicates("PLAYER").set_index("PLAYER")["TEAM"]
+
+    pool = frame[frame["MIN"] >= max(pool_minutes, min_minutes)]
+    if pool.empty:
         return pd.DataFrame(), pd.DataFrame()
+    by_day = pool.groupby("DAY", sort=False)["score"]
+    best = by_day.rank(method="first", ascending=False)
+    worst = by_day.rank(method="first", ascending=True)
+
+    def counted(rank):
+        chosen = pool[rank <= k]
+        first_seen = chosen["DAY"].to_numpy() * (k + 1) + rank[rank <= k].to_numpy()
+        return _frequency_table(chosen["PLAYER"], first_seen, meta, top_n)
+
+    return counted(best), counted(worst)
 
-    # ------------------
-    # 2. NUMERIC CLEAN
-    # ------------------
-    for stat in weights.keys():
-        if stat not in df.columns:
-            df[stat] = 0
-        df[stat] = pd.to_numeric(df[stat], errors="coerce").fillna(0)
-
-    df["MIN"] = pd.to_numeric(df.get("MIN", 0), errors="coerce").fillna(0)
-
-    # ------------------
-    # 3. CALCULATE FANTASY SCORE
-    # ------------------
-    df["fantasy_score"] = 0.0
-    for stat, w in weights.items():
-        df["fantasy_score"] += df[stat] * w
-
-    # ------------------
-    # 4. DAY BASED ANALYSIS
-    # ------------------
+
+def games_played_column(df: pd.DataFrame):
+    """Season totals frames (one row per player) carry GP / GAMES; per-game logs don't."""
+    for col in ("GAMES", "GP"):
+        if col in df.columns:
+            return col
+    return None
+
+
+def calculate_mvp_lvp_from_totals(df: pd.DataFrame, weights: dict, k: int = MVP_TOP_K,
+                                  pool_minutes: float = POOL_MINUTES, max_games: int = 82):
+    """
+    Aggregate-aware MVP/LVP for season averages (no per-game logs available).
+
+    Each player's average is ranked against every player who had played at least
+    as many games: for the n-th game slice the pool is players with GP > n, and a
+    player appears once per slice where the player is in the Top/Bottom k. Slices only
+    change at distinct GP values, so this runs one nlargest per distinct GP
+    instead of expanding every player into GP rows.
+    Returns: (mvp_df, lvp_df, slice_count)
+    """
+    gp_col = games_played_column(df)
+    if gp_col is None or df.empty:
+        return pd.DataFrame(), pd.DataFrame(), 0
+
+    frame = pd.DataFrame({
+        "PLAYER": df["PLAYER"].to_numpy(),
+        "TEAM": df["TEAM"].to_numpy() if "TEAM" in df.columns else "",
+        "MIN": pd.to_numeric(df.get("MIN", 0), errors="coerce").fillna(0).to_numpy(),
+        "GP": pd.to_numeric(df[gp_col], errors="coerce").fillna(0).clip(upper=max_games).astype(int).to_numpy(),
+        "fantasy_score": scoring.score_frame(df, weights).to_numpy(),
+    })
+    frame = frame[frame["GP"] > 0]
+    player_meta = dict(zip(frame["PLAYER"], frame["TEAM"]))
+
+    # Same pools as the daily path: at least pool_minutes
+    pool = frame[frame["MIN"] >= pool_minutes]
     top_counter = Counter()
     worst_counter = Counter()
-    player_meta = {}
+    previous = 0
+    for gp in sorted(pool["GP"].unique()):
+        active = pool[pool["GP"] >= gp]
+        slices = int(gp) - previous
+        previous = int(gp)
+        for p in active.nlargest(k, "fantasy_score")["PLAYER"]:
+            top_counter[p] += slices
+        for p in active.nsmallest(k, "fantasy_score")["PLAYER"]:
+            worst_counter[p] += slices
 
-    # Get unique dates in the filtered dataframe
-    unique_dates = df["DATE"].unique()
-    
-    if len(unique_dates) == 0:
-        return pd.DataFrame(), pd.DataFrame()
+    def build_df(counter):
+        return pd.DataFrame([
+            {"Player": player, "Team": player_meta.get(player, ""), "Appearances": cnt}
+            for player, cnt in counter.most_common(15)
+        ])
 
-    # Group by DATE so we find the best/worst relative to THAT specific night
-    for day in unique_dates:
-        day_df = df[df["DATE"] == day].copy()
-        
-        # Filter: Ignore players with very low minutes generally
-        day_df = day_df[day_df["MIN"] >= 5]
-        
-        if day_df.empty:
-            continue
-
-        # Store metadata (Team)
-        for _, r in day_df.iterrows():
-            player_meta.setdefault(
-                r["PLAYER"], 
-                {"team": r.get("TEAM", "")}
-            )
+    return build_df(top_counter), build_df(worst_counter), previous
 
-        # MVP — Top 10 of the day (Must play at least 20 mins)
-        mvp_pool = day_df[day_df["MIN"] >= 20] \
-            .sort_values("fantasy_score", ascending=False) \
-            .head(10)
-        
-        for p in mvp_pool["PLAYER"]:
-            top_counter[p] += 1
-
-        # LVP — Worst 10 of the day (Must play at least 15 mins to qualify as 'bad')
-        lvp_pool = day_df[day_df["MIN"] >= 20] \
-            .sort_values("fantasy_score", ascending=True) \
-            .head(10)
-        
-        for p in lvp_pool["PLAYER"]:
-            worst_counter[p] += 1
 
-    def build_df(counter):
-        rows = []
-        for player, cnt in counter.most_common(15):
-            meta = player_meta.get(player, {})
-            rows.append({
-                "Player": player,
-                "Team": meta.get("team", ""),
-                "Appearances": cnt
-            })
-        return pd.DataFrame(rows)
-
-    mvp_df = build_df(top_counter)
-    lvp_df = build_df(worst_counter)
-    
-    return mvp_df, lvp_df
+def compute_mvp_lvp(df: pd.DataFrame, date_range, weights: dict, k: int = MVP_TOP_K,
+                    pool_minutes: float = POOL_MINUTES, min_minutes: float = MIN_MINUTES):
+    """
+    Date-range filter + the matching engine (per-game logs or season totals).
+    Returns: (top_df, worst_df, caption, empty_message)
+    """
+    if not pd.api.types.is_datetime64_any_dtype(df["DATE"]):
+        df = df.assign(DATE=pd.to_datetime(df["DATE"], errors='coerce'))
+
+    # Filter logic: Check if date_range is a tuple (Start, End)
+    if date_range and isinstance(date_range, (list, tuple)) and len(date_range) == 2:
+        start_date, end_date = date_range
+        df = aggregation.filter_window(df, start_date, end_date, date_col="DATE")
+        if df.empty:
+            return pd.DataFrame(), pd.DataFrame(), "", f"No games found between {start_date} and {end_date}."
+
+    # Season totals (no stored game logs): rank averages, no row expansion
+    if games_played_column(df):
+        top_df, worst_df, slices = calculate_mvp_lvp_from_totals(df, weights, k=k, pool_minutes=pool_minutes)
+        caption = f"Season averages over {slices} game slice(s) • Top/Bottom {k} among players with that many games"
+    else:
+        top_df, worst_df = calculate_mvp_lvp_from_df(df, weights, k=k, pool_minutes=pool_minutes,
+                                                     min_minutes=min_minutes)
+        caption = f"Analyzing {df['DATE'].nunique()} game day(s) • Top/Bottom {k} players per day"
+    return top_df, worst_df, caption, None
 
 
 def render_mvp_lvp_section(date_range, weights, label):
@@ -104,39 +164,39 @@ def render_mvp_lvp_section(date_range, weights, label):
         st.info("No data available for this period.")
         return
 
-    # ---------------------------------------------------------
-    # FILTER DATAFRAME BY DATE_RANGE
-    # ---------------------------------------------------------
-    df = df.copy()
-
-    # Ensure DATE column exists and is datetime
     if "DATE" not in df.columns:
         st.warning("DATE column not found in data.")
         return
-        
-    if not pd.api.types.is_datetime64_any_dtype(df["DATE"]):
-        df["DATE"] = pd.to_datetime(df["DATE"], errors='coerce')
 
-    # Filter logic: Check if date_range is a tuple (Start, End)
-    if date_range and isinstance(date_range, (list, tuple)) and len(date_range) == 2:
-        start_date, end_date = date_range
-        mask = (df["DATE"].dt.date >= start_date) & (df["DATE"].dt.date <= end_date)
-        df = df.loc[mask]
-        
-        if df.empty:
-            st.warning(f"No games found between {start_date} and {end_date}.")
-            return
-    
-    # Calculate MVP/LVP from filtered data
-    top_df, worst_df = calculate_mvp_lvp_from_df(df, weights)
+    # Results are cached per (period data version, date range, weights, thresholds)
+    version = st.session_state.get("period_version")
+    key = None
+    if version is not None:
+        key = (version, tuple(date_range or ()), scoring.profiles_key({"w": weights}),
+               MVP_TOP_K, POOL_MINUTES, MIN_MINUTES)
+    with _cache_lock:
+        cached = _mvp_cache.get(key) if key is not None else None
+        if cached is not None:
+            _mvp_cache.move_to_end(key)
+    if cached is None:
+        cached = compute_mvp_lvp(df, date_range, weights)
+        if key is not None:
+            with _cache_lock:
+                _mvp_cache[key] = cached
+                while len(_mvp_cache) > MVP_CACHE_MAX:
+                    _mvp_cache.popitem(last=False)
+    top_df, worst_df, caption, empty_message = cached
+
+    if empty_message:
+        st.warning(empty_message)
+        return
 
     if top_df.empty and worst_df.empty:
         st.info("Not enough data in this range to calculate MVP/LVP appearances.")
         return
 
     # Show stats info
-    unique_days = df["DATE"].nunique()
-    st.caption(f"Analyzing {unique_days} game day(s) • Top/Bottom 10 players per day")
+    st.caption(caption)
 
     col1, col2 = st.columns(2)
 
@@ -0,0 +1,24 @@
+from datetime import datetime
+
+from services import resilience
+
+
+def render_service_status(slot, page):
+    """
+    Shows a banner when ESPN endpoints are failing (circuit open) or when
+    parts of this page were served from the last good copy (stale).
+    """
+    open_endpoints = resilience.open_endpoints()
+    if not open_endpoints and not page.stale:
+        slot.empty()
+        return
+
+    parts = []
+    if page.stale:
+        oldest = datetime.fromtimestamp(min(page.stale.values()))
+        parts.append(f"showing saved data from {oldest.strftime('%H:%M')} for {len(page.stale)} item(s)")
+    if open_endpoints:
+        names = ", ".join(e.rsplit("/", 1)[-1] for e in open_endpoints)
+        parts.append(f"paused requests: {names}")
+
+    slot.warning(f"⚠️ ESPN is slow or unavailable — {'; '.join(parts)}. Data will refresh automatically.")
@@ -1,8 +1,8 @@
 import streamlit as st
 import pandas as pd
 from datetime import datetime, timedelta
-from utils.helpers import parse_minutes
-from services.espn_api import get_historical_boxscores, get_injuries, get_current_team_rosters, get_nba_season_stats_official 
+from services.espn_api import get_injuries
+from services import aggregation, period_snapshots, player_form, scoring, team_ratings
 
 # =================================================================
 # TEAM MAPPING (KISALTMALAR -> TAM İSİMLER)
@@ -24,23 +24,12 @@ TEAM_MAP = {
     'TOR': 'Toronto Raptors', 'UTA': 'Utah Jazz', 'UTAH': 'Utah Jazz', 'WSH': 'Washington Wizards'
 }
 
+FULL_LIST_PAGE_SIZE = 50    # Full Player List rows per page
+
 # =================================================================
 # 1. HELPER CALCULATION FUNCTIONS
 # =================================================================
 
-def calculate_fantasy_score(stats_dict, weights):
-    """
-    Calculates fantasy score based on given stats and weights.
-    """
-    score = 0.0
-    for stat, weight in weights.items():
-        val = stats_dict.get(stat, 0)
-        try:
-            score += float(val) * float(weight)
-        except (ValueError, TypeError):
-            pass
-    return score
-
 def get_date_range(period):
     """
     Returns date range based on selected period.
@@ -62,200 +51,6 @@ def get_date_range(period):
         return season_start.date(), today.date()
     return today.date(), today.date()
 
-def normalize_player_name(name):
-    """Normalizes names for comparison."""
-    if not name:
-        return ""
-    return name.replace(".", "").replace("'", "").replace("-", " ").lower().strip()
-
-def aggregate_player_stats(all_game_data, weights):
-    """
-    Aggregates historical game data, calculates averages and scores.
-    **UPDATE:** Matches player IDs and adds them to the DataFrame.
-    """
-    # Get current roster info
-    try:
-        current_rosters = get_current_team_rosters()
-        print(f"✓ Roster info received: {len(current_rosters)} players")
-    except Exception as e:
-        print(f"❌ Roster could not be fetched: {e}")
-        current_rosters = {}
-    
-    # Create normalized roster dictionary
-    normalized_rosters = {}
-    for player_name, info in current_rosters.items():
-        norm_name = normalize_player_name(player_name)
-        
-        # info can be a dict {'team': 'LAL', 'id': '1234'} or a string
-        if isinstance(info, dict):
-            team_code = info.get('team')
-            p_id = info.get('id')
-        else:
-            team_code = info
-            p_id = None
-
-        normalized_rosters[norm_name] = {
-            'team': team_code,
-            'id': p_id,
-            'original_name': player_name
-        }
-    
-    print(f"✓ Normalized roster: {len(normalized_rosters)} players")
-    
-    player_totals = {}
-    matched_count = 0
-    unmatched_count = 0
-    
-    for game_day in all_game_data:
-        players = game_day.get('players', [])
-        game_date = game_day.get('date')
-        
-        for player in players:
-            raw_name = player.get('PLAYER')
-            if not raw_name:
-                continue
-            
-            # Normalize name
-            norm_name = normalize_player_name(raw_name)
-            
-            # Find player in current roster
-            roster_info = normalized_rosters.get(norm_name)
-            
-            player_id = None # Default no ID
-
-            if roster_info:
-                # Found in roster
-                display_name = roster_info['original_name']
-                current_team = roster_info['team']
-                player_id = roster_info['id']
-                matched_count += 1
-            else:
-                # Not in roster - use raw name
-                display_name = raw_name
-                current_team = player.get('TEAM', 'UNK')
-                unmatched_count += 1
-                
-                # Debug
-                if game_date:
-                    try:
-                        date_diff = (datetime.now() - pd.to_datetime(game_date)).days
-                        if date_diff < 7 and unmatched_count <= 5:
-                            print(f"⚠️ Not found in roster: {raw_name}")
-                    except:
-                        pass
-            
-            # KEY: PLAYER NAME ONLY
-            key = display_name
-            
-            if key not in player_totals:
-                player_totals[key] = {
-                    'PLAYER': display_name,
-                    'PLAYER_ID': player_id,
-                    'TEAM': current_team,
-                    'GAMES': 0,
-                    'MIN_TOTAL': 0,
-                    'PTS': 0, 'REB': 0, 'AST': 0, 'STL': 0, 'BLK': 0, 'TO': 0,
-                    'FGM': 0, 'FGA': 0, '3Pts': 0, '3PTA': 0, 'FTM': 0, 'FTA': 0,
-                    '+/-': 0,
-                    'game_logs': [],
-                    'teams_played_for': set()
-                }
-            
-            stats = player_totals[key]
-            
-            # Update ID if found later
-            if stats['PLAYER_ID'] is None and player_id is not None:
-                stats['PLAYER_ID'] = player_id
-
-            # Update team info (always latest)
-            stats['TEAM'] = current_team
-            
-            # Track teams played for
-            game_team = player.get('TEAM', '')
-            if game_team:
-                stats['teams_played_for'].add(game_team)
-            
-            # Increment games
-            stats['GAMES'] += 1
-            
-            # Parse minutes
-            min_val = parse_minutes(player.get('MIN', '0'))
-            stats['MIN_TOTAL'] += min_val
-            
-            # Sum numeric stats
-            numeric_stats = ['PTS', 'REB', 'AST', 'STL', 'BLK', 'TO', 
-                           'FGM', 'FGA', '3Pts', '3PTA', 'FTM', 'FTA', '+/-']
-            
-            for stat in numeric_stats:
-                val = player.get(stat, 0)
-                try: 
-                    stats[stat] += float(val)
-                except: 
-                    pass
-            
-            # Log game
-            game_log = {
-                'DATE': game_date,
-                'MIN': min_val,
-                'TEAM': game_team
-            }
-            for stat in numeric_stats:
-                try:
-                    game_log[stat] = float(player.get(stat, 0))
-                except:
-                    game_log[stat] = 0
-            stats['game_logs'].append(game_log)
-    
-    # Calculate averages
-    result = []
-    for stats in player_totals.values():
-        games = stats['GAMES']
-        if games == 0:
-            continue
-            
-        avg_stats = stats.copy()
-        
-        # Average minutes
-        avg_min = stats['MIN_TOTAL'] / games
-        avg_stats['MIN'] = f"{int(avg_min)}"
-        avg_stats['MIN_INT'] = avg_min
-        
-        # Other averages
-        stats_to_average = ['PTS', 'REB', 'AST', 'STL', 'BLK', 'TO', 
-                          'FGM', 'FGA', '3Pts', '3PTA', 'FTM', 'FTA', '+/-']
-        
-        for k in stats_to_average:
-            avg_stats[k] = stats[k] / games
-
-        # Calculate Fantasy Score
-        avg_stats['USER_SCORE'] = calculate_fantasy_score(avg_stats, weights)
-        
-        # Formatting shooting
-        avg_stats['FG'] = f"{avg_stats['FGM']:.1f}/{avg_stats['FGA']:.1f}"
-        avg_stats['3PT'] = f"{avg_stats['3Pts']:.1f}/{avg_stats['3PTA']:.1f}"
-        avg_stats['FT'] = f"{avg_stats['FTM']:.1f}/{avg_stats['FTA']:.1f}"
-        
-        # Trade info
-        if len(stats['teams_played_for']) > 1:
-            teams_list = sorted(list(stats['teams_played_for']))
-            avg_stats['TRADED'] = f"({' → '.join(teams_list)})"
-        else:
-            avg_stats['TRADED'] = ""
-        
-        result.append(avg_stats)
-    
-    df = pd.DataFrame(result)
-    
-    # Debug summary
-    print(f"\n{'='*60}")
-    print(f"📊 AGGREGATE SUMMARY")
-    print(f"{'='*60}")
-    print(f"✓ Total {len(df)} player rows created")
-    print(f"✓ Roster match: {matched_count} records")
-    print(f"{'='*60}\n")
-    
-    return df
-
 # =================================================================
 # 2. PLAYER ANALYSIS MODAL (REFRESHED PRO UI & ANALYSIS)
 # =================================================================
@@ -491,6 +286,30 @@ def show_player_analysis(player_row, weights):
                 'text': f'{plus_minus:.0f} plus/minus. Team struggled with them on the court - defense or chemistry issues.'
             })
         
+        # 10. TEAM CONTEXT (pace / offensive rating - boxscore'lardan, ek istek yok)
+        team_rating = team_ratings.get_team(team_abbr)
+        league = team_ratings.league_average()
+        if team_rating and league:
+            pace_diff = team_rating['pace'] - league['pace']
+            if pace_diff >= 2:
+                analysis.append({
+                    'type': 'info',
+                    'title': 'Fast-Paced Team',
+                    'text': f'{team_abbr} plays at {team_rating["pace"]:.1f} possessions per 48 ({pace_diff:+.1f} vs league). Extra possessions inflate counting stats.'
+                })
+            elif pace_diff <= -2:
+                analysis.append({
+                    'type': 'info',
+                    'title': 'Slow-Paced Team',
+                    'text': f'{team_abbr} plays at {team_rating["pace"]:.1f} possessions per 48 ({pace_diff:+.1f} vs league). Fewer chances to pile up numbers.'
+                })
+            if team_rating['offensive_rating'] >= league['offensive_rating'] + 3:
+                analysis.append({
+                    'type': 'info',
+                    'title': 'Elite Offense',
+                    'text': f'{team_abbr} scores {team_rating["offensive_rating"]:.1f} points per 100 possessions. A strong offensive environment for scoring and assists.'
+                })
+        
         return analysis
     
     def generate_fantasy_outlook():
@@ -851,15 +670,65 @@ def show_player_analysis(player_row, weights):
         else:
             st.error(f"**{outlook['title']}**\n\n{outlook['text']}")
 
+    # ======================================================
+    # G. RECENT FORM (precomputed last 5/10/15 games, looked up on open)
+    # ======================================================
+    if not is_single_game:
+        form = player_form.player_form(st.session_state.get("period_form"), player_row.get("PLAYER_KEY"),
+                                       weights, logs=st.session_state.get("period_logs"))
+        if form is not None and form["summary"]["GAMES"].max() > 1:
+            st.markdown("### 📈 Recent Form")
+            summary = form["summary"]
+            # Pencereden az maçı olan oyuncuda aynı satırları tekrar gösterme
+            summary = summary[~summary["GAMES"].duplicated()]
+            summary.index = [f"Last {n}" for n in summary["GAMES"]]
+            st.dataframe(
+                summary.drop(columns=["GAMES"]),
+                use_container_width=True,
+                column_config={
+                    "FP": st.column_config.NumberColumn("FP", format="%.1f"),
+                    "FP_STD": st.column_config.NumberColumn("± STD", format="%.1f"),
+                    "FP_TREND": st.column_config.NumberColumn("Trend / Game", format="%+.2f"),
+                    "MIN": st.column_config.NumberColumn("MIN", format="%.1f"),
+                    "PTS": st.column_config.NumberColumn("PTS", format="%.1f"),
+                    "REB": st.column_config.NumberColumn("REB", format="%.1f"),
+                    "AST": st.column_config.NumberColumn("AST", format="%.1f"),
+                }
+            )
+            if len(form["chart"]) > 1:
+                st.line_chart(form["chart"].round(1))
+
+    # ======================================================
+    # H. GAME LOG (sliced from the shared period log table on open)
+    # ======================================================
+    if not is_single_game:
+        history = aggregation.player_log(st.session_state.get("period_logs"), player_row.get("PLAYER_KEY"))
+        if not history.empty:
+            st.markdown("### 📅 Game Log")
+            history["FP"] = scoring.score_frame(history, weights).round(1)
+            history["DATE"] = pd.to_datetime(history["DATE"]).dt.strftime("%b %d")
+            log_cols = [c for c in ["DATE", "TEAM", "FP", "MIN", "PTS", "REB", "AST", "STL", "BLK", "TO", "3Pts"]
+                        if c in history.columns]
+            st.dataframe(
+                history.iloc[::-1][log_cols],
+                hide_index=True,
+                use_container_width=True,
+                column_config={
+                    "MIN": st.column_config.NumberColumn("MIN", format="%.0f"),
+                    "3Pts": st.column_config.NumberColumn("3PM", format="%d"),
+                }
+            )
+
 
 # =================================================================
 # 3. MAIN TABLE FUNCTION
 # =================================================================
 
-def render_tables(today_df, weights, default_period="Today"):
+def render_tables(today_df, weights, default_period="Today", profiles=None):
     """
     Renders the main table.
     Uses different data sources based on period selection (Today, Season, Week).
+    profiles: extra {column name: weights} scored alongside USER_SCORE (shown next to it).
     """
     
     # Initialize Session State
@@ -878,216 +747,58 @@ def render_tables(today_df, weights, default_period="Today"):
             st.rerun()
             
     current_period = st.session_state.stats_period
-    active_df = pd.DataFrame()
     
     # =================================================================
-    # DATA PREPARATION (DATA FETCHING STRATEGY)
+    # DATA PREPARATION (PROCESS-WIDE PERIOD SNAPSHOT)
     # =================================================================
-    
-    # --- CASE 1: SEASON (Official API - Single Request) ---
-    if current_period == "Season":
-        with st.spinner("Fetching official NBA Season Leaders..."):
-            # 2026 Season (2025-26)
-            season_df = get_nba_season_stats_official(season_year=2026)
-            
-            if not season_df.empty:
-                # Calculate Fantasy Score
-                season_df["USER_SCORE"] = season_df.apply(lambda x: calculate_fantasy_score(x, weights), axis=1)
-                
-                # Store and format MIN value
-                season_df["MIN_INT"] = season_df["MIN"] # Numeric copy
-                season_df["MIN"] = season_df["MIN"].apply(lambda x: f"{x:.1f}")
-                
-                # Check and fix +/- value
-                if "+/-" in season_df.columns:
-                    season_df["+/-"] = pd.to_numeric(season_df["+/-"], errors='coerce').fillna(0)
-                else:
-                    season_df["+/-"] = 0.0
-                
-                # Convert shooting percentages to string format
-                season_df["FG"] = season_df.apply(lambda x: f"{x['FGM']:.1f}/{x['FGA']:.1f}", axis=1)
-                season_df["3PT"] = season_df.apply(lambda x: f"{x['3Pts']:.1f}/{x['3PTA']:.1f}", axis=1)
-                season_df["FT"] = season_df.apply(lambda x: f"{x['FTM']:.1f}/{x['FTA']:.1f}", axis=1)
-                
-                # IMPORTANT: Fetch current roster info and match
-                try:
-                    current_rosters = get_current_team_rosters()
-                    
-                    # Create normalized roster dictionary
-                    normalized_rosters = {}
-                    for player_name, info in current_rosters.items():
-                        norm_name = normalize_player_name(player_name)
-                        
-                        # info check: dict or str
-                        if isinstance(info, dict):
-                            team_code = info.get('team')
-                            p_id = info.get('id')
-                        else:
-                            team_code = info
-                            p_id = None
-                            
-                        normalized_rosters[norm_name] = {
-                            'team': team_code,
-                            'id': p_id, # Store ID
-                            'original_name': player_name
-                        }
-                    
-                    # Match each player with roster to update TEAM and PLAYER_ID
-                    def update_player_info(row):
-                        player_name = row.get('PLAYER', '')
-                        norm_name = normalize_player_name(player_name)
-                        roster_info = normalized_rosters.get(norm_name)
-                        
-                        current_team = row.get('TEAM', 'FA') # Default
-                        p_id = None
-                        
-                        if roster_info:
-                            current_team = roster_info['team']
-                            p_id = roster_info['id']
-                        
-                        return pd.Series([current_team, p_id])
-                    
-                    # Update TEAM and PLAYER_ID columns at once
-                    season_df[['TEAM', 'PLAYER_ID']] = season_df.apply(update_player_info, axis=1)
-                    
-                    print(f"✓ {len(season_df)} player team and ID info updated")
-                    
-                except Exception as e:
-                    print(f"⚠️ Error in roster matching: {e}")
-                    if 'TEAM' not in season_df.columns:
-                        season_df['TEAM'] = 'UNK'
-                    season_df['PLAYER_ID'] = None # Pass empty on error
-                
-                # Add DATE column for MVP/LVP
-                season_start = datetime(2025, 10, 22)
-                season_df["DATE"] = season_start
-                
-                active_df = season_df.copy()
-                
-                # Create daily format data for MVP/LVP widget (Simulation)
-                mvp_df = season_df.copy()
-                if 'GAMES' in mvp_df.columns or 'GP' in mvp_df.columns:
-                    gp_col = 'GAMES' if 'GAMES' in mvp_df.columns else 'GP'
-                    
-                    expanded_rows = []
-                    for _, player_row in mvp_df.iterrows():
-                        games_played = int(player_row[gp_col])
-                        if games_played == 0: continue
-                        
-                        for game_num in range(min(games_played, 82)):
-                            game_date = season_start + timedelta(days=game_num * 2)
-                            
-                            # Create dict instead of copying row (for performance)
-                            game_row = player_row.to_dict()
-                            game_row['DATE'] = game_date
-                            expanded_rows.append(game_row)
-                    
-                    if expanded_rows:
-                        period_df = pd.DataFrame(expanded_rows)
-                        period_df['DATE'] = pd.to_datetime(period_df['DATE'])
-                        st.session_state["period_df"] = period_df
-                    else:
-                        st.session_state["period_df"] = pd.DataFrame()
-                else:
-                    st.session_state["period_df"] = season_df.copy()
-
-    # --- CASE 2: TODAY (Live Data) ---
-    elif current_period == "Today":
-        active_df = today_df.copy()
-        if not active_df.empty:
-            active_df["USER_SCORE"] = active_df.apply(lambda x: calculate_fantasy_score(x, weights), axis=1)
-            active_df["DATE"] = datetime.now().date()
-            
-            if "MIN_INT" not in active_df.columns:
-                active_df["MIN_INT"] = active_df["MIN"].apply(parse_minutes)
-            
-            # Today ID adding logic (If not in today_df)
-            if "PLAYER_ID" not in active_df.columns:
-                # Simple roster matching
-                try:
-                    current_rosters = get_current_team_rosters()
-                    normalized_rosters = {normalize_player_name(k): v for k, v in current_rosters.items()}
-                    
-                    def get_id_today(name):
-                        norm = normalize_player_name(name)
-                        info = normalized_rosters.get(norm)
-                        if isinstance(info, dict):
-                            return info.get('id')
-                        return None
-                        
-                    active_df["PLAYER_ID"] = active_df["PLAYER"].apply(get_id_today)
-                except:
-                    active_df["PLAYER_ID"] = None
-
-            st.session_state["period_df"] = active_df.copy()
-
-    # --- CASE 3: WEEKLY / MONTHLY (Historical Game Collection) ---
-    else:
-        start_date, end_date = get_date_range(current_period)
-        with st.spinner(f"Fetching stats for {current_period}..."):
-            historical_data = get_historical_boxscores(start_date, end_date)
-            
-            if historical_data:
-                # 1. Aggregate Data for Table (ID is added here)
-                active_df = aggregate_player_stats(historical_data, weights)
-                
-                # 2. Daily Data for Charts
-                all_daily_records = []
-                for game_day in historical_data:
-                    game_date = game_day.get('date')
-                    players = game_day.get('players', [])
-                    for player in players:
-                        try:
-                            rec = player.copy()
-                            rec['DATE'] = pd.to_datetime(game_date) if game_date else pd.Timestamp.now()
-                            
-                            numeric_stats = ['PTS', 'REB', 'AST', 'STL', 'BLK', 'TO', 'FGM', 'FGA', '3Pts', 'FTM', 'FTA']
-                            for stat in numeric_stats:
-                                rec[stat] = float(player.get(stat, 0))
-                            
-                            rec['MIN'] = parse_minutes(player.get('MIN', 0))
-                            if not rec.get('PLAYER'): continue
-                            
-                            all_daily_records.append(rec)
-                        except Exception:
-                            continue
-                
-                if all_daily_records:
-                    daily_df = pd.DataFrame(all_daily_records)
-                    daily_df["USER_SCORE"] = daily_df.apply(lambda x: calculate_fantasy_score(x, weights), axis=1)
-                    st.session_state["period_df"] = daily_df
-                else:
-                    st.session_state["period_df"] = pd.DataFrame()
+    # Base table is built once per data refresh and shared by all sessions;
+    # only the fantasy scoring below is per user (on a copy).
+    spinner_text = ("Fetching official NBA Season Leaders..." if current_period == "Season"
+                    else f"Fetching stats for {current_period}...")
+    with st.spinner(spinner_text):
+        snapshot = period_snapshots.get_snapshot(
+            current_period,
+            today_df=today_df,
+            date_range=get_date_range(current_period)
+        )
+
+    # Weight change = one matrix product on the prepared stat block (no refetch / reformat);
+    # scored table + top/low/full-list order are cached per (period, data, weights)
+    views = period_snapshots.scored_views(
+        current_period, snapshot, weights, profiles,
+        low_min_minutes=15 if current_period == "Today" else 20
+    )
+    active_df = views["table"]
+    # Shared read-only frames: MVP/LVP input, the game-log table and form tables the modal slices
+    st.session_state["period_df"] = snapshot["mvp_df"]
+    st.session_state["period_logs"] = snapshot["logs"]
+    st.session_state["period_form"] = snapshot["form"]
+    # MVP/LVP results are cached per data version (None = unversioned, not cached)
+    st.session_state["period_version"] = (
+        (current_period, snapshot["version"], snapshot["built_at"]) if snapshot.get("built_at") is not None else None
+    )
 
     # --- DATA CHECK ---
     if active_df.empty:
-        st.warning(f"No data available for {current_period}")
+        if snapshot.get("building"):
+            st.info(f"{current_period} stats are being prepared, refresh in a moment.")
+        else:
+            st.warning(f"No data available for {current_period}")
         return
 
-    # --- TABLE FORMATTING SETTINGS ---
-    if "USER_SCORE" in active_df.columns:
-        active_df["USER_SCORE"] = active_df["USER_SCORE"].astype(float).round(2)
-    
-    if "+/-" in active_df.columns:
-         active_df["+/-"] = pd.to_numeric(active_df["+/-"], errors='coerce').fillna(0)
-
+    # --- TABLE FORMATTING SETTINGS (stat formatting is done once in the snapshot) ---
+    profile_cols = [c for c in (profiles or {}) if c in active_df.columns]
     is_today = (current_period == "Today")
     stat_fmt = "%d" if is_today else "%.1f"
-    
-    stat_cols = ["PTS", "REB", "AST", "STL", "BLK", "TO", "+/-"]
-    for col in stat_cols:
-        if col in active_df.columns:
-            if is_today:
-                active_df[col] = active_df[col].fillna(0).astype(int)
-            else:
-                active_df[col] = active_df[col].astype(float).round(1)
 
     column_order = ["PLAYER", "TEAM", "USER_SCORE", "MIN", "PTS", "FG", "3PT", "FT", "REB", "AST", "STL", "BLK", "TO", "+/-"]
-    
+    column_order[3:3] = profile_cols   # Kayıtlı profil puanları Score'un yanında
+
+    if current_period == "Season" and "PTS_DELTA" in active_df.columns:
+        column_order.insert(column_order.index("PTS") + 1, "PTS_DELTA")
+
     if not is_today:
         column_order.insert(2, "GAMES")
-        if "GP" in active_df.columns:
-            active_df = active_df.rename(columns={"GP": "GAMES"})
         
     available_cols = [c for c in column_order if c in active_df.columns]
 
@@ -1104,14 +815,19 @@ def render_tables(today_df, weights, default_period="Today"):
         "BLK": st.column_config.NumberColumn("BLK", format=stat_fmt, width="small"),
         "TO": st.column_config.NumberColumn("TO", format=stat_fmt, width="small"),
         "+/-": st.column_config.NumberColumn("+/-", format=stat_fmt, width="small"),
+        "PTS_DELTA": st.column_config.NumberColumn("Δ PTS", format="%+.1f", width="small",
+                                                   help="Change in points per game since the previous day's snapshot"),
     }
+    for col in profile_cols:
+        col_config[col] = st.column_config.NumberColumn(col, format="%.2f", width="small",
+                                                        help="Score with your saved scoring settings")
 
     st.markdown("---")
     st.caption("💡 **Tip:** Click on a player row to see **Context & Injury Analysis**.")
 
     # --- 1. TOP 10 PERFORMANCES ---
     st.markdown(f"## Top 10 Performances ({current_period})")
-    top_df = active_df.sort_values("USER_SCORE", ascending=False).head(10)
+    top_df = views["top"]
     
     event_top = st.dataframe(
         top_df[available_cols],
@@ -1131,15 +847,7 @@ def render_tables(today_df, weights, default_period="Today"):
     # --- 2. LOWEST 10 PERFORMANCES ---
     st.markdown(f"## Lowest 10 Performances ({current_period})")
     
-    min_minutes = 20 if not is_today else 15
-    if "MIN_INT" in active_df.columns:
-        filtered_low = active_df[active_df["MIN_INT"] >= min_minutes]
-        if len(filtered_low) < 5: 
-            filtered_low = active_df[active_df["MIN_INT"] >= 5]
-    else:
-        filtered_low = active_df
-
-    low_df = filtered_low.sort_values("USER_SCORE", ascending=True).head(10)
+    low_df = views["low"]
     
     event_low = st.dataframe(
         low_df[available_cols],
@@ -1158,14 +866,19 @@ def render_tables(today_df, weights, default_period="Today"):
 
     # --- 3. FULL LIST (EXPANDER) ---
     with st.expander(f" Full Player List ({len(active_df)} players)"):
-        full_sorted_df = active_df.sort_values("USER_SCORE", ascending=False).reset_index(drop=True)
-        full_sorted_df.insert(0, '#', full_sorted_df.index + 1)
+        # Server-side pages: only the visible rows are sent to the browser
+        page_count = max((len(active_df) - 1) // FULL_LIST_PAGE_SIZE + 1, 1)
+        page = 1
+        if page_count > 1:
+            page = st.number_input(f"Page (of {page_count})", min_value=1, max_value=page_count,
+                                   value=1, step=1, key=f"full_list_page_{current_period}")
+        page_df = period_snapshots.page_of(views, int(page), FULL_LIST_PAGE_SIZE)
         cols_with_rank = ['#'] + available_cols
         full_col_config = col_config.copy()
         full_col_config['#'] = st.column_config.NumberColumn("#", format="%d", width="40px")
 
         st.dataframe(
-            full_sorted_df[cols_with_rank], 
+            page_df[cols_with_rank], 
             use_container_width=True, 
             hide_index=True, 
             column_config=full_col_config
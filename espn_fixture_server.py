@@ -0,0 +1,272 @@
+"""
+ESPN fixture kaydedici + yerel replay sunucusu (offline geliştirme / benchmark)
+
+Kullanım:
+  # 1) Canlı ESPN yanıtlarını fixture klasörüne kaydet
+  python espn_fixture_server.py record --out fixtures/espn --start 2025-10-21 --end 2026-04-12 [--league-id 12345]
+
+  # 2) Fixture'ları gecikme / hata oranıyla sun
+  python espn_fixture_server.py serve --dir fixtures/espn --port 8765 --latency-ms 80 --jitter-ms 40 --error-rate 0.02
+
+  # 3) Uygulamayı sunucuya yönlendir
+  ESPN_API_OVERRIDE=http://127.0.0.1:8765 streamlit run app.py
+
+  # 4) Tam sezon backfill benchmark'ı (sunucu aynı process'te açılır)
+  python espn_fixture_server.py bench --dir fixtures/espn --start 2025-10-21 --end 2026-04-12 --sessions 20
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+
+def _parse_day(value):
+    return datetime.strptime(value, "%Y-%m-%d")
+
+
+def _temp_store():
+    # Kalıcı depo boş olmalı: aksi halde final maçlar ESPN'e hiç sorulmaz
+    return os.path.join(tempfile.mkdtemp(prefix="hooplife_fixture_"), "games.sqlite3")
+
+
+# =================================================================
+# RECORD
+# =================================================================
+
+def record(args):
+    os.environ.pop("ESPN_API_OVERRIDE", None)
+    os.environ["ESPN_RECORD_DIR"] = os.path.abspath(args.out)
+    os.environ["HOOPLIFE_STORE_PATH"] = _temp_store()
+
+    # Ortam değişkenleri import'tan ÖNCE ayarlanmalı
+    from services import espn_api, espn_fixtures, schedule_index
+
+    start, end = _parse_day(args.start), _parse_day(args.end)
+    t0 = time.time()
+
+    print("📅 Season schedule (range requests)...")
+    for season in sorted({schedule_index.season_of(start), schedule_index.season_of(end)}):
+        schedule_index.ensure_season(datetime(season, 10, 1))
+
+    print("📋 Daily scoreboards...")
+    day = start
+    while day <= end:
+        espn_api.get_scoreboard(day)
+        day += timedelta(days=1)
+
+    print("🏀 Boxscores (summary)...")
+    games = espn_api.get_historical_boxscores(start, end)
+    print(f"   {len(games)} games")
+
+    print("🩹 Injuries, teams, rosters, season leaders...")
+    espn_api.get_injuries()
+    espn_api.get_current_team_rosters()
+    espn_api.get_nba_season_stats_official(season_year=end.year if end.month < 10 else end.year + 1)
+
+    if args.league_id:
+        print(f"🏆 Fantasy league {args.league_id}...")
+        for views in (None, ['mTeam'], ['mMatchupScore', 'mScoreboard']):
+            try:
+                espn_api.call_espn_api(args.league_id, views=views)
+            except Exception as e:
+                print(f"   fantasy views={views}: {e}")
+
+    print(f"\n✓ {espn_fixtures.recorded_count()} responses recorded to {args.out} ({time.time() - t0:.1f}s)")
+
+
+# =================================================================
+# SERVE
+# =================================================================
+
+class FixtureServer:
+    """Fixture klasörünü belleğe alır, gecikme / hata enjeksiyonuyla sunar."""
+
+    def __init__(self, directory, latency_ms=0, jitter_ms=0, error_rate=0.0, timeout_rate=0.0, seed=None):
+        from services import espn_fixtures
+
+        self.keys = espn_fixtures
+        self.latency = latency_ms / 1000
+        self.jitter = jitter_ms / 1000
+        self.error_rate = error_rate
+        self.timeout_rate = timeout_rate
+        self.rng = random.Random(seed)
+        self.fixtures = {}
+        self.stats = {"requests": 0, "served": 0, "missing": 0, "errors": 0, "timeouts": 0}
+        self._load(directory)
+
+    def _load(self, directory):
+        for root, _, files in os.walk(directory):
+            for name in files:
+                if not name.endswith(".json"):
+                    continue
+                path = os.path.join(root, name)
+                with open(path, encoding="utf-8") as f:
+                    entry = json.load(f)
+                self.fixtures[os.path.relpath(path, directory)] = (entry["status"], entry["body"].encode("utf-8"))
+        print(f"Loaded {len(self.fixtures)} fixtures from {directory}")
+
+    async def handle(self, request):
+        from aiohttp import web
+
+        self.stats["requests"] += 1
+        if request.path == "/_stats":
+            return web.json_response(self.stats)
+
+        host, _, path = request.path.lstrip("/").partition("/")
+        key = self.keys.fixture_key(host, "/" + path, request.query_string)
+
+        delay = self.latency + self.rng.uniform(0, self.jitter)
+        roll = self.rng.random()
+        if roll < self.timeout_rate:
+            self.stats["timeouts"] += 1
+            await asyncio.sleep(60)
+        elif delay:
+            await asyncio.sleep(delay)
+
+        if roll < self.timeout_rate + self.error_rate:
+            self.stats["errors"] += 1
+            return web.json_response({"error": "injected failure"}, status=503)
+
+        fixture = self.fixtures.get(key)
+        if fixture is None:
+            self.stats["missing"] += 1
+            print(f"Fixture missing: {host}/{path}?{request.query_string}")
+            return web.json_response({"error": "fixture not found"}, status=404)
+
+        self.stats["served"] += 1
+        status, body = fixture
+        return web.Response(status=status, body=body, content_type="application/json")
+
+    def start(self, host, port, background=False):
+        from aiohttp import web
+
+        app = web.Application()
+        app.router.add_route("GET", "/{tail:.*}", self.handle)
+
+        if not background:
+            web.run_app(app, host=host, port=port)
+            return
+
+        ready = threading.Event()
+
+        def run():
+            loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
+            runner = web.AppRunner(app)
+            loop.run_until_complete(runner.setup())
+            loop.run_until_complete(web.TCPSite(runner, host, port).start())
+            ready.set()
+            loop.run_forever()
+
+        threading.Thread(target=run, name="fixture-server", daemon=True).start()
+        ready.wait(10)
+
+
+def _server_from_args(args):
+    return FixtureServer(args.dir, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                         error_rate=args.error_rate, timeout_rate=args.timeout_rate, seed=args.seed)
+
+
+def serve(args):
+    server = _server_from_args(args)
+    print(f"Serving on http://{args.host}:{args.port}  (ESPN_API_OVERRIDE=http://{args.host}:{args.port})")
+    server.start(args.host, args.port)
+
+
+# =================================================================
+# BENCH
+# =================================================================
+
+def bench(args):
+    # Ortam değişkenleri services import'undan ÖNCE ayarlanmalı
+    os.environ["ESPN_API_OVERRIDE"] = f"http://{args.host}:{args.port}"
+    os.environ["HOOPLIFE_STORE_PATH"] = _temp_store()
+    os.environ.pop("ESPN_RECORD_DIR", None)
+    server = _server_from_args(args)
+    server.start(args.host, args.port, background=True)
+
+    from services import date_bundle, espn_api, http_client, single_flight
+
+    start, end = _parse_day(args.start), _parse_day(args.end)
+
+    t0 = time.time()
+    games = espn_api.get_historical_boxscores(start, end)
+    cold = time.time() - t0
+    t0 = time.time()
+    espn_api.get_historical_boxscores(start, end)
+    warm = time.time() - t0
+    print(f"\n📊 Backfill {args.start} → {args.end}: {len(games)} games | cold {cold:.2f}s | warm (store) {warm:.2f}s")
+
+    if args.sessions:
+        latencies = []
+        lock = threading.Lock()
+
+        def session():
+            s0 = time.time()
+            date_bundle.get_date_bundle(end)
+            with lock:
+                latencies.append(time.time() - s0)
+
+        threads = [threading.Thread(target=session) for _ in range(args.sessions)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        latencies.sort()
+        p95 = latencies[max(0, int(len(latencies) * 0.95) - 1)]
+        print(f"👥 {args.sessions} concurrent home-page sessions: "
+              f"p50 {statistics.median(latencies):.2f}s | p95 {p95:.2f}s | max {latencies[-1]:.2f}s")
+
+    flights = single_flight.get_stats()
+    pool = http_client.get_pool_stats()
+    print(f"🔁 Deduplicated requests: {flights['deduplicated']} / {flights['calls']}")
+    print(f"🌐 HTTP requests: {pool['requests']} (retries {pool['retries']}, failures {pool['failures']})")
+    print(f"🗄  Server: {server.stats}")
+
+
+# =================================================================
+# CLI
+# =================================================================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="ESPN fixture recorder / replay server")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_record = sub.add_parser("record", help="Record live ESPN responses")
+    p_record.add_argument("--out", default="fixtures/espn")
+    p_record.add_argument("--start", required=True, help="YYYY-MM-DD")
+    p_record.add_argument("--end", required=True, help="YYYY-MM-DD")
+    p_record.add_argument("--league-id", type=int, default=None)
+    p_record.set_defaults(func=record)
+
+    for name, func, help_text in (("serve", serve, "Replay fixtures over HTTP"),
+                                  ("bench", bench, "Benchmark a backfill against the fixtures")):
+        p = sub.add_parser(name, help=help_text)
+        p.add_argument("--dir", default="fixtures/espn")
+        p.add_argument("--host", default="127.0.0.1")
+        p.add_argument("--port", type=int, default=8765)
+        p.add_argument("--latency-ms", type=float, default=0)
+        p.add_argument("--jitter-ms", type=float, default=0)
+        p.add_argument("--error-rate", type=float, default=0.0)
+        p.add_argument("--timeout-rate", type=float, default=0.0)
+        p.add_argument("--seed", type=int, default=None)
+        if name == "bench":
+            p.add_argument("--start", required=True, help="YYYY-MM-DD")
+            p.add_argument("--end", required=True, help="YYYY-MM-DD")
+            p.add_argument("--sessions", type=int, default=0, help="Concurrent home-page sessions")
+        p.set_defaults(func=func)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
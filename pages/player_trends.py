@@ -1,10 +1,9 @@
 import streamlit as st
 import pandas as pd
 from datetime import datetime, timedelta
-import concurrent.futures
 import streamlit.components.v1 as components
-import requests
 import feedparser
+from services import aggregation, boxscore_ingest, espn_fixtures, http_client, scoring
 from typing import List, Dict
 
 
@@ -586,7 +585,10 @@ def fetch_rss_rumors() -> List[Dict]:
         
         for rss_source in rss_sources:
             try:
-                feed = feedparser.parse(rss_source['url'])
+                response = http_client.get(rss_source['url'], retries=1)
+                if response.status_code != 200:
+                    continue
+                feed = feedparser.parse(response.content)
                 
                 for entry in feed.entries[:8]:
                     title = entry.get('title', 'No Title')
@@ -663,8 +665,8 @@ def fetch_espn_headlines() -> List[Dict]:
             'rumor', 'interested', 'pursuing', 'available'
         ]
         
-        url = "https://site.api.espn.com/apis/site/v2/sports/basketball/nba/news"
-        response = requests.get(url, timeout=10)
+        url = f"{espn_fixtures.api_base(espn_fixtures.SITE_API_HOST)}/apis/site/v2/sports/basketball/nba/news"
+        response = http_client.get(url)
         
         if response.status_code != 200:
             return []
@@ -730,7 +732,7 @@ def fetch_reddit_rumors() -> List[Dict]:
         }
         headers = {'User-Agent': 'Mozilla/5.0 (compatible; NBA-Rumor-Bot/1.0)'}
         
-        response = requests.get(url, params=params, headers=headers, timeout=10)
+        response = http_client.get(url, params=params, headers=headers)
         if response.status_code != 200:
             return []
         
@@ -822,7 +824,7 @@ def fetch_season_data(days, _cache_key=None):
         days: Kaç günlük veri (999 = full season)
         _cache_key: Saatlik cache key (her saat yenilenir)
     """
-    from services.espn_api import get_game_ids, get_cached_boxscore
+    from services.espn_api import iter_historical_boxscores
     
     today = datetime.now()
     
@@ -831,57 +833,10 @@ def fetch_season_data(days, _cache_key=None):
     else:
         start_date = today - timedelta(days=days)
     
-    total_days = (today - start_date).days + 1
-    dates_to_fetch = [start_date + timedelta(days=i) for i in range(total_days)]
-    
-    all_records = []
-    all_game_tasks = []
-    
-    # Phase 1: Collect game IDs (paralel, cached per date)
-    with concurrent.futures.ThreadPoolExecutor(max_workers=30) as executor:
-        future_to_date = {executor.submit(get_game_ids, d): d for d in dates_to_fetch}
-        
-        for future in concurrent.futures.as_completed(future_to_date):
-            date = future_to_date[future]
-            try:
-                ids = future.result()
-                if ids:
-                    for gid in ids:
-                        all_game_tasks.append((gid, date))
-            except:
-                pass
-    
-    if not all_game_tasks:
-        return pd.DataFrame()
-    
-    # Phase 2: Fetch boxscores (paralel, cached per game_id)
-    def fetch_box(task):
-        game_id, game_date = task
-        try:
-            players = get_cached_boxscore(game_id)
-            if players:
-                result = []
-                for p in players:
-                    p_copy = dict(p)
-                    p_copy['date'] = game_date
-                    result.append(p_copy)
-                return result
-        except:
-            pass
-        return []
-    
-    with concurrent.futures.ThreadPoolExecutor(max_workers=30) as executor:
-        futures = [executor.submit(fetch_box, task) for task in all_game_tasks]
-        
-        for future in concurrent.futures.as_completed(futures):
-            result = future.result()
-            if result:
-                all_records.extend(result)
-    
-    if all_records:
-        return pd.DataFrame(all_records)
-    
-    return pd.DataFrame()
+    # Scoreboard + boxscore istekleri tek event loop üzerinden akar;
+    # final maçlar diskten, eksikler geldikçe eklenir.
+    # Tek tipli frame (int16 stat, float dakika, date kolonu)
+    return boxscore_ingest.games_frame(iter_historical_boxscores(start_date, today))
 
 
 def render_player_trends_page():
@@ -902,7 +857,7 @@ def render_player_trends_page():
     st.title("Player Form & Trends")
     
     try:
-        from services.espn_api import get_game_ids, get_cached_boxscore
+        from services.espn_api import iter_historical_boxscores
     except ImportError as e:
         st.error(f"Import Error: {e}")
         st.info("Make sure `services/espn_api.py` exists with required functions.")
@@ -982,54 +937,31 @@ def render_player_trends_page():
     st.success(f"Loaded {len(df):,} player performances ({'Full Season' if max_days >= 999 else f'Last {max_days} Days'})")
 
     # DATA PROCESSING
-    numeric_cols = ["PTS", "REB", "AST", "STL", "BLK", "TO", "FGM", "FGA", "FTM", "FTA", "3Pts"]
-    for c in numeric_cols:
-        if c in df.columns:
-            df[c] = pd.to_numeric(df[c], errors="coerce").fillna(0)
-        else:
-            df[c] = 0
-
-    def calc_score(row):
-        score = 0
-        for stat, weight in DEFAULT_WEIGHTS.items():
-            score += row.get(stat, 0) * weight
-        return score
+    # Stat kolonları fetch_season_data'da tiplenmiş olarak gelir
 
-    df["fantasy_score"] = df.apply(calc_score, axis=1)
+    df["fantasy_score"] = scoring.score_frame(df, DEFAULT_WEIGHTS)
     df["date"] = pd.to_datetime(df["date"])
     
     today_ts = pd.Timestamp.now()
     
-    # Filter data for periods
-    if period1_days == 999:
-        df_p1 = df.copy()
-    else:
-        p1_start_date = today_ts - pd.Timedelta(days=period1_days)
-        df_p1 = df[df["date"] >= p1_start_date].copy()
+    # Aggregate stats (ortak groupby motoru, 999 = tüm sezon)
+    def aggregate_period(days, suffix):
+        # date > now - days  ->  start günü hariç
+        start = None if days == 999 else today_ts.normalize() - pd.Timedelta(days=days - 1)
+        grp = aggregation.aggregate_players(df, start=start, stats=["fantasy_score"], track_teams=False)
+        if grp.empty:
+            return grp
+        return grp.set_index("PLAYER")[["fantasy_score", "TEAM", "GAMES"]].rename(
+            columns={"fantasy_score": f"avg_{suffix}", "GAMES": f"games_{suffix}"}
+        )
     
-    if period2_days == 999:
-        df_p2 = df.copy()
-    else:
-        p2_start_date = today_ts - pd.Timedelta(days=period2_days)
-        df_p2 = df[df["date"] >= p2_start_date].copy()
+    grp_p1 = aggregate_period(period1_days, "p1")
+    grp_p2 = aggregate_period(period2_days, "p2")
 
-    if df_p1.empty or df_p2.empty:
+    if grp_p1.empty or grp_p2.empty:
         st.info("Not enough data for selected periods.")
         return
 
-    # Aggregate stats
-    grp_p1 = df_p1.groupby("PLAYER").agg({
-        "fantasy_score": "mean",
-        "TEAM": "first",
-        "date": "count"
-    }).rename(columns={"fantasy_score": "avg_p1", "date": "games_p1"})
-
-    grp_p2 = df_p2.groupby("PLAYER").agg({
-        "fantasy_score": "mean",
-        "TEAM": "first",
-        "date": "count"
-    }).rename(columns={"fantasy_score": "avg_p2", "date": "games_p2"})
-
     analysis_df = grp_p1.join(grp_p2[["avg_p2", "games_p2"]], how="inner")
     
     # Apply filters
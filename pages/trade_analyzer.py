@@ -1,6 +1,7 @@
 import streamlit as st
 import pandas as pd
 from services.espn_api import get_active_players_stats
+from services import scoring
 from datetime import datetime
 import streamlit.components.v1 as components
 
@@ -538,6 +539,21 @@ BASE_WEIGHTS = {
     "FG%": 0.0, "FT%": 0.0
 }
 
+
+def punt_weights(punt_cats):
+    """Punt edilen kategorilerin ağırlıkları 0 olan BASE_WEIGHTS kopyası."""
+    weights = BASE_WEIGHTS.copy()
+    for cat in punt_cats:
+        if cat == "FG Punt":
+            weights["FGM"] = 0.0
+            weights["FGA"] = 0.0
+        elif cat == "FT Punt":
+            weights["FTM"] = 0.0
+            weights["FTA"] = 0.0
+        elif cat == "TO Punt":
+            weights["TO"] = 0.0
+    return weights
+
 # --- TEAM MAP ---
 TEAM_MAP = {
     'ATL': 'Atlanta Hawks', 'BOS': 'Boston Celtics', 'BKN': 'Brooklyn Nets',
@@ -561,34 +577,19 @@ TEAM_MAP = {
 # ============================================
 
 def calculate_threshold_value(df, punt_cats, min_threshold=12.0, penalty_curve=0.3):
-    weights = BASE_WEIGHTS.copy()
-    
-    # Punt kategorilerini 0 yap
-    for cat in punt_cats:
-        if cat == "FG Punt":
-            weights["FGM"] = 0.0
-            weights["FGA"] = 0.0
-        elif cat == "FT Punt":
-            weights["FTM"] = 0.0
-            weights["FTA"] = 0.0
-        elif cat == "TO Punt":
-            weights["TO"] = 0.0
+    weights = punt_weights(punt_cats)
     
     available_cols = [col for col in weights.keys() if col in df.columns]
     if not available_cols: 
         return 0.0, []
     
-    # Her oyuncu için FP hesapla
-    player_fps = []
-    for idx, row in df.iterrows():
-        raw_fp = sum(row.get(col, 0) * weights[col] for col in available_cols)
-        player_fps.append({
-            'player': row.get('PLAYER', 'Unknown'),
-            'raw_fp': raw_fp,
-            'adjusted_fp': 0.0,
-            'tier': '',
-            'multiplier': 1.0
-        })
+    # Her oyuncu için FP hesapla (tek matris çarpımı)
+    raw_fps = scoring.score_frame(df, weights)
+    names = df['PLAYER'] if 'PLAYER' in df.columns else pd.Series('Unknown', index=df.index)
+    player_fps = [
+        {'player': name, 'raw_fp': float(raw_fp), 'adjusted_fp': 0.0, 'tier': '', 'multiplier': 1.0}
+        for name, raw_fp in zip(names, raw_fps)
+    ]
     
     if not player_fps:
         return 0.0, []
@@ -652,26 +653,13 @@ def calculate_quality_over_quantity(df, punt_cats, top_player_bonus=1.5):
     - En iyi oyuncu: %50 bonus
     - Diğer oyuncular: Normal değer
     """
-    weights = BASE_WEIGHTS.copy()
-    
-    for cat in punt_cats:
-        if cat == "FG Punt":
-            weights["FGM"] = 0.0
-            weights["FGA"] = 0.0
-        elif cat == "FT Punt":
-            weights["FTM"] = 0.0
-            weights["FTA"] = 0.0
-        elif cat == "TO Punt":
-            weights["TO"] = 0.0
+    weights = punt_weights(punt_cats)
     
     available_cols = [col for col in weights.keys() if col in df.columns]
     if not available_cols: 
         return 0.0
     
-    fps = []
-    for idx, row in df.iterrows():
-        fp = sum(row.get(col, 0) * weights[col] for col in available_cols)
-        fps.append(fp)
+    fps = scoring.score_frame(df, weights).tolist()
     
     if not fps:
         return 0.0
@@ -695,26 +683,13 @@ def calculate_diminishing_returns(df, punt_cats):
     
     Katsayılar: 1.0, 0.85, 0.70, 0.55, 0.45...
     """
-    weights = BASE_WEIGHTS.copy()
-    
-    for cat in punt_cats:
-        if cat == "FG Punt":
-            weights["FGM"] = 0.0
-            weights["FGA"] = 0.0
-        elif cat == "FT Punt":
-            weights["FTM"] = 0.0
-            weights["FTA"] = 0.0
-        elif cat == "TO Punt":
-            weights["TO"] = 0.0
+    weights = punt_weights(punt_cats)
     
     available_cols = [col for col in weights.keys() if col in df.columns]
     if not available_cols: 
         return 0.0
     
-    fps = []
-    for idx, row in df.iterrows():
-        fp = sum(row.get(col, 0) * weights[col] for col in available_cols)
-        fps.append(fp)
+    fps = scoring.score_frame(df, weights).tolist()
     
     fps.sort(reverse=True)
     
@@ -848,16 +823,7 @@ def render_trade_analyzer_page():
         st.markdown("---")
         st.markdown("**Active Weights:**")
         
-        display_weights = BASE_WEIGHTS.copy()
-        for cat in punt_cats:
-            if cat == "FG Punt":
-                display_weights["FGM"] = 0.0
-                display_weights["FGA"] = 0.0
-            elif cat == "FT Punt":
-                display_weights["FTM"] = 0.0
-                display_weights["FTA"] = 0.0
-            elif cat == "TO Punt":
-                display_weights["TO"] = 0.0
+        display_weights = punt_weights(punt_cats)
         
         weights_df = pd.DataFrame(list(display_weights.items()), columns=['Stat', 'Weight'])
         weights_df = weights_df[weights_df['Weight'] != 0]
@@ -969,20 +935,9 @@ def render_trade_analyzer_page():
                         fp_preview = calculate_diminishing_returns(df_subset, punt_cats)
                         player_details = []
                     else:  # Simple Average
-                        weights = BASE_WEIGHTS.copy()
-                        for cat in punt_cats:
-                            if cat == "FG Punt":
-                                weights["FGM"] = 0.0
-                                weights["FGA"] = 0.0
-                            elif cat == "FT Punt":
-                                weights["FTM"] = 0.0
-                                weights["FTA"] = 0.0
-                            elif cat == "TO Punt":
-                                weights["TO"] = 0.0
+                        weights = punt_weights(punt_cats)
                         
-                        available_cols = [col for col in weights.keys() if col in df_players.columns]
-                        avg_stats = df_subset[available_cols].mean()
-                        fp_preview = sum(avg_stats[col] * weights[col] for col in available_cols)
+                        fp_preview = scoring.score_frame(df_subset, weights).mean() if not df_subset.empty else 0.0
                         player_details = []
                     
                     st.markdown(f"**Total Value: {fp_preview:.1f} FP**")
@@ -1067,20 +1022,9 @@ def render_trade_analyzer_page():
             fp = calculate_diminishing_returns(df, punt_cats)
             player_details = []
         else:
-            weights = BASE_WEIGHTS.copy()
-            for cat in punt_cats:
-                if cat == "FG Punt":
-                    weights["FGM"] = 0.0
-                    weights["FGA"] = 0.0
-                elif cat == "FT Punt":
-                    weights["FTM"] = 0.0
-                    weights["FTA"] = 0.0
-                elif cat == "TO Punt":
-                    weights["TO"] = 0.0
+            weights = punt_weights(punt_cats)
             
-            available_cols = [col for col in weights.keys() if col in df.columns]
-            avg_stats = df[available_cols].mean()
-            fp = sum(avg_stats[col] * weights[col] for col in available_cols)
+            fp = scoring.score_frame(df, weights).mean() if not df.empty else 0.0
             player_details = []
         
         numeric_cols = df.select_dtypes(include='number').columns
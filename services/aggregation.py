@@ -0,0 +1,178 @@
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from services import boxscore_ingest, player_index
+
+
+# =================================================================
+# ORTAK OYUNCU AGGREGATION MOTORU
+# =================================================================
+# "Oyuncu başına topla, maç sayısına böl, FG%/FT% hesapla" mantığı
+# tables / trade analyzer / player trends için tek yerde, kolonsal
+# game frame üzerinde groupby ile yapılır (satır döngüsü yok).
+
+SUM_STATS = ['PTS', 'REB', 'AST', 'STL', 'BLK', 'TO',
+             'FGM', 'FGA', '3Pts', '3PTA', 'FTM', 'FTA', '+/-']
+
+# yüzde kolonu -> (made, attempted)
+PCT_COLUMNS = {
+    'FG%': ('FGM', 'FGA'),
+    'FT%': ('FTM', 'FTA'),
+    '3P%': ('3Pts', '3PTA'),
+}
+
+LOG_COLUMNS = ['DATE', 'PLAYER', 'MIN', 'TEAM'] + SUM_STATS
+LOG_INDEX = ['PLAYER_KEY', 'DATE']
+
+
+def build_game_frame(games: Iterable[Dict], date_col: str = 'date') -> pd.DataFrame:
+    """[{'date', 'players'}, ...] -> tipli, tarih kolonu datetime olan game frame."""
+    frame = boxscore_ingest.games_frame(games, date_col=date_col)
+    if not frame.empty:
+        frame[date_col] = pd.to_datetime(frame[date_col])
+    return frame
+
+
+def filter_window(frame: pd.DataFrame, start=None, end=None, date_col: str = 'date') -> pd.DataFrame:
+    """Tarih penceresi filtresi (start / end dahil, None ise sınırsız)."""
+    if frame.empty or (start is None and end is None):
+        return frame
+    dates = frame[date_col]
+    mask = pd.Series(True, index=frame.index)
+    if start is not None:
+        mask &= dates >= pd.Timestamp(start).normalize()
+    if end is not None:
+        mask &= dates < pd.Timestamp(end).normalize() + pd.Timedelta(days=1)
+    return frame[mask]
+
+
+def build_log_table(frame, keys, date_col='date') -> pd.DataFrame:
+    """
+    Oyuncu-maç logları tek kolonsal tabloda, (PLAYER_KEY, DATE) index'li ve
+    sıralı. Oyuncu başına dict listesi üretilmez; geçmiş player_log() ile
+    gerektiğinde dilimlenir.
+    """
+    cols = [c for c in LOG_COLUMNS[1:] if c in frame.columns]
+    logs = frame[cols].copy()
+    logs.insert(0, 'DATE', frame[date_col].to_numpy())
+    logs.insert(0, 'PLAYER_KEY', keys.to_numpy())
+    return logs.set_index(LOG_INDEX).sort_index()
+
+
+def player_log(logs: Optional[pd.DataFrame], key) -> pd.DataFrame:
+    """Tek oyuncunun maç logları (tarihe göre sıralı); tablo / oyuncu yoksa boş frame."""
+    if logs is None or logs.empty or key is None or key != key:
+        return pd.DataFrame(columns=LOG_COLUMNS)
+    try:
+        return logs.xs(int(key), level='PLAYER_KEY').reset_index()
+    except KeyError:
+        return pd.DataFrame(columns=LOG_COLUMNS)
+
+
+def _traded_label(teams):
+    teams = sorted(t for t in teams if t)
+    return f"({' → '.join(teams)})" if len(teams) > 1 else ""
+
+
+def aggregate_players(frame: pd.DataFrame,
+                      start=None, end=None,
+                      date_col: str = 'date',
+                      stats: Optional[List[str]] = None,
+                      min_game_minutes: Optional[float] = None,
+                      min_avg_minutes: float = 0,
+                      identity: bool = False,
+                      track_teams: bool = True,
+                      with_logs: bool = False) -> pd.DataFrame:
+    """
+    Game frame'i oyuncu başına toplayıp ortalamalarını döndürür.
+
+    Args:
+        frame: build_game_frame() çıktısı (oyuncu-maç satırları)
+        start, end: Tarih penceresi (dahil)
+        stats: Toplanıp ortalaması alınacak kolonlar (varsayılan SUM_STATS)
+        min_game_minutes: Bu dakikanın altındaki maç satırları sayılmaz (None: hepsi)
+        min_avg_minutes: Maç başı ortalama dakika alt sınırı
+        identity: True ise isim/takım oyuncu indeksinden (güncel roster) gelir
+        track_teams: Sezon içinde oynadığı takımları TRADED kolonuna yazar
+        with_logs: True ise (sonuç, log tablosu) döner; sonuçta log tablosuna
+            referans olan PLAYER_KEY kolonu bulunur (bkz. build_log_table)
+
+    Returns:
+        Oyuncu başına tek satır (athlete id'ye göre): PLAYER, PLAYER_ID, TEAM, GAMES, MIN_TOTAL,
+        MIN ve stat kolonları (maç başı ortalama), FG% / FT% / 3P%
+        (toplamlardan), last_game_date, TRADED
+    """
+    stats = list(stats) if stats is not None else list(SUM_STATS)
+    empty = (pd.DataFrame(), pd.DataFrame()) if with_logs else pd.DataFrame()
+    frame = filter_window(frame, start, end, date_col)
+    if frame.empty:
+        return empty
+
+    frame = frame[frame['PLAYER'].notna() & (frame['PLAYER'] != '')]
+    if min_game_minutes is not None:
+        frame = frame[frame['MIN'] > min_game_minutes]
+    if frame.empty:
+        return empty
+    # Birleştirilmiş maç frame'lerinde index tekrar edebilir
+    frame = frame.reset_index(drop=True)
+
+    # Gruplama ANAHTARI athlete id (int); ID'si olmayan nadir satırlar
+    # isimden bulunur, o da yoksa isim başına negatif geçici anahtar alır
+    if identity:
+        player_index.ensure_loaded()
+    ids = player_index.resolve_ids(frame['PLAYER_ID'] if 'PLAYER_ID' in frame.columns else None,
+                                   frame['PLAYER'])
+    if ids.isna().any():
+        codes, _ = pd.factorize(frame['PLAYER'])
+        ids = ids.fillna(pd.Series(-(codes + 1), index=frame.index).astype(float))
+    keys = ids.astype(np.int64).rename('_KEY')
+
+    stat_cols = [c for c in stats if c in frame.columns]
+    grouped = frame.groupby(keys, sort=False)
+
+    totals = grouped[stat_cols + ['MIN']].sum()
+    result = pd.DataFrame(index=totals.index)
+    result['GAMES'] = grouped.size()
+    result['MIN_TOTAL'] = totals['MIN'].astype(float)
+    result['MIN'] = result['MIN_TOTAL'] / result['GAMES']
+    for col in stat_cols:
+        result[col] = totals[col].astype(float) / result['GAMES']
+    for pct_col, (made, att) in PCT_COLUMNS.items():
+        if made in totals.columns and att in totals.columns:
+            attempts = totals[att].astype(float)
+            result[pct_col] = (totals[made] / attempts.where(attempts > 0) * 100).fillna(0).round(1)
+
+    # Son maçtaki isim / takım (tarihsiz satırlar en başa; hepsi tarihsizse son satır)
+    latest = frame.assign(_KEY=keys.to_numpy()) \
+        .sort_values(date_col, kind='stable', na_position='first') \
+        .drop_duplicates('_KEY', keep='last').set_index('_KEY').reindex(result.index)
+    result['last_game_date'] = latest[date_col]
+    result['PLAYER'] = latest['PLAYER']
+    result['TEAM'] = latest['TEAM'] if 'TEAM' in latest.columns else 'UNK'
+    result['PLAYER_ID'] = result.index.to_series()
+
+    if identity:
+        result = player_index.apply_identity(result)
+    else:
+        result['PLAYER_ID'] = player_index.id_column(result['PLAYER_ID'].astype(float))
+
+    if track_teams and 'TEAM' in frame.columns:
+        # Tekil (oyuncu, takım) çiftleri üzerinden - grup başına apply yok
+        pairs = pd.DataFrame({'_KEY': keys, 'TEAM': frame['TEAM']}).dropna().drop_duplicates()
+        multi = pairs[pairs.duplicated('_KEY', keep=False)]
+        traded = multi.groupby('_KEY', sort=False)['TEAM'].agg(_traded_label)
+        result['TRADED'] = traded.reindex(result.index).fillna("")
+
+    if with_logs:
+        result['PLAYER_KEY'] = result.index.to_numpy()
+
+    if min_avg_minutes:
+        result = result[result['MIN'] >= min_avg_minutes]
+
+    result = result[['PLAYER'] + [c for c in result.columns if c != 'PLAYER']]
+    result = result.reset_index(drop=True)
+    if with_logs:
+        return result, build_log_table(frame, keys, date_col)
+    return result
@@ -0,0 +1,140 @@
+from typing import Dict, Iterable, List
+
+import numpy as np
+import pandas as pd
+
+
+# =================================================================
+# TİPLİ BOXSCORE INGEST
+# =================================================================
+# ESPN boxscore satırları string karışık gelir ("3-7", "34:12", "--").
+# Tüm dönüşüm burada, maç (ya da maç grubu) başına TEK seferde ve
+# vektörel yapılır. Çıkan veride:
+# - sayısal statlar int16, MIN float32 (dakika, 34:12 -> 34.2)
+# - FG / 3PT / FT sadece gösterim için "made-att" string
+# Tüketiciler (tablolar, trade analyzer, trends) tekrar parse etmez.
+
+INT_STATS = [
+    "PTS", "REB", "AST", "STL", "BLK", "TO", "PF", "OREB", "DREB", "+/-",
+    "FGM", "FGA", "3Pts", "3PTA", "FTM", "FTA",
+]
+FLOAT_STATS = ["MIN"]
+TEXT_COLUMNS = ["PLAYER", "PLAYER_ID", "TEAM"]
+
+# gösterim kolonu -> (made, attempted)
+SPLIT_COLUMNS = {
+    "FG": ("FGM", "FGA"),
+    "3PT": ("3Pts", "3PTA"),
+    "FT": ("FTM", "FTA"),
+}
+# ESPN bazen 3PT yerine bu etiketleri kullanır
+SPLIT_ALIASES = {"3PT": ["3Pt", "3P"]}
+
+STAT_DTYPES = {**{c: np.int16 for c in INT_STATS}, **{c: np.float32 for c in FLOAT_STATS}}
+
+
+def parse_minutes_series(values: pd.Series) -> pd.Series:
+    """'34:12' / '34' / 34 / '--' / None -> float32 dakika (vektörel)."""
+    if pd.api.types.is_numeric_dtype(values):
+        return values.fillna(0).astype(np.float32)
+
+    text = values.astype("string").str.strip()
+    parts = text.str.split(":", n=1, expand=True)
+    minutes = pd.to_numeric(parts[0], errors="coerce")
+    if parts.shape[1] > 1:
+        seconds = pd.to_numeric(parts[1], errors="coerce").fillna(0)
+        minutes = minutes + seconds / 60
+    return minutes.fillna(0).round(1).astype(np.float32)
+
+
+def parse_split_series(values: pd.Series):
+    """'3-7' -> (3, 7) iki seri olarak (vektörel, hatalılar NaN)."""
+    parts = values.astype("string").str.extract(r"^\s*(\d+)\s*-\s*(\d+)")
+    return pd.to_numeric(parts[0], errors="coerce"), pd.to_numeric(parts[1], errors="coerce")
+
+
+def ingest_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Ham ya da zaten tipli boxscore DataFrame'ini tipli hale getirir.
+    Tekrar çağrılması güvenlidir (tipli veri olduğu gibi geçer).
+    """
+    if df.empty:
+        return df
+    df = df.copy()
+
+    for label, aliases in SPLIT_ALIASES.items():
+        if label not in df.columns:
+            for alias in aliases:
+                if alias in df.columns:
+                    df[label] = df[alias]
+                    break
+
+    # Made/attempted: eksik olanlar split string'den doldurulur (tipli veride regex çalışmaz)
+    for label, (made_col, att_col) in SPLIT_COLUMNS.items():
+        current = {}
+        for col in (made_col, att_col):
+            current[col] = pd.to_numeric(df[col], errors="coerce") if col in df.columns else pd.Series(np.nan, index=df.index)
+        if label in df.columns and (current[made_col].isna().any() or current[att_col].isna().any()):
+            made, att = parse_split_series(df[label])
+            current[made_col] = current[made_col].fillna(made)
+            current[att_col] = current[att_col].fillna(att)
+        df[made_col] = current[made_col]
+        df[att_col] = current[att_col]
+
+    for col in INT_STATS:
+        if col not in df.columns:
+            df[col] = 0
+        elif not pd.api.types.is_integer_dtype(df[col]):
+            df[col] = pd.to_numeric(df[col], errors="coerce")
+        df[col] = df[col].fillna(0).astype(np.int16)
+
+    df["MIN"] = parse_minutes_series(df["MIN"]) if "MIN" in df.columns else np.float32(0)
+
+    # Gösterim string'leri sayılardan tek tip üretilir
+    for label, (made_col, att_col) in SPLIT_COLUMNS.items():
+        df[label] = (df[made_col].astype(str) + "-" + df[att_col].astype(str)).astype(object)
+
+    for col in TEXT_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype("string").astype(object).where(df[col].notna(), None)
+
+    return df.drop(columns=[c for aliases in SPLIT_ALIASES.values() for c in aliases if c in df.columns])
+
+
+def ingest_players(players: Iterable[Dict]) -> pd.DataFrame:
+    """Bir maçın (veya birden fazla maçın) oyuncu dict'lerini tipli frame'e çevirir."""
+    players = list(players)
+    if not players:
+        return pd.DataFrame()
+    return ingest_frame(pd.DataFrame(players))
+
+
+def to_records(df: pd.DataFrame) -> List[Dict]:
+    """Tipli frame'i get_boxscore formatındaki dict listesine çevirir (sayılar native)."""
+    if df.empty:
+        return []
+    out = df.copy()
+    if "MIN" in out.columns:
+        # float32 -> native float'ta 34.2000007 gibi görünmesin
+        out["MIN"] = out["MIN"].astype(np.float64).round(1)
+    return out.to_dict("records")
+
+
+def games_frame(games: Iterable[Dict], date_col: str = "date") -> pd.DataFrame:
+    """
+    [{'date': d, 'players': [...]}, ...] -> tek tipli DataFrame (date kolonlu).
+    Oyuncu satırları zaten tipli olduğundan sadece dtype'lar sabitlenir.
+    """
+    rows = []
+    for game in games:
+        players = game.get("players") or []
+        extra = {date_col: game.get("date")}
+        if "game_id" in game:
+            extra["GAME_ID"] = str(game["game_id"])
+        for p in players:
+            row = dict(p)
+            row.update(extra)
+            rows.append(row)
+    if not rows:
+        return pd.DataFrame()
+    return ingest_frame(pd.DataFrame(rows))
@@ -0,0 +1,186 @@
+import asyncio
+import json
+import queue
+import threading
+import time
+from typing import Dict, Iterator, Optional, Tuple
+
+import aiohttp
+
+from services import espn_fixtures, http_client, resilience
+
+
+# =================================================================
+# ASYNCIO TOPLU İSTEK MOTORU
+# =================================================================
+# Sezon / ay backfill'lerinde binlerce boxscore isteği iç içe
+# ThreadPoolExecutor'lar yerine tek bir event loop üzerinden atılır.
+# - Process başına TEK event loop (arka plan thread'inde)
+# - Process genelinde TEK eşzamanlılık limiti (semaphore)
+# - Tek aiohttp ClientSession -> birkaç keep-alive soket
+# Sync Streamlit kodu iter_json() ile sonuçları geldikçe tüketir.
+
+MAX_CONCURRENCY = 16
+REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=20, connect=5, sock_read=10)
+
+_loop = None
+_loop_lock = threading.Lock()
+_session = None
+_semaphore = None
+
+
+def _run_loop(loop):
+    asyncio.set_event_loop(loop)
+    loop.run_forever()
+
+
+def get_loop() -> asyncio.AbstractEventLoop:
+    """Arka planda çalışan process-genel event loop'u döndürür."""
+    global _loop
+    if _loop is None:
+        with _loop_lock:
+            if _loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=_run_loop, args=(loop,), name="bulk-fetch-loop", daemon=True)
+                thread.start()
+                _loop = loop
+    return _loop
+
+
+def run(coro, timeout: Optional[float] = None):
+    """Sync koddan bir coroutine'i ortak loop'ta çalıştırıp sonucunu bekler."""
+    return asyncio.run_coroutine_threadsafe(coro, get_loop()).result(timeout)
+
+
+async def _get_session():
+    # Loop thread'inde çağrılır, lock gerekmez
+    global _session, _semaphore
+    if _session is None or _session.closed:
+        connector = aiohttp.TCPConnector(limit=MAX_CONCURRENCY, ttl_dns_cache=300)
+        _session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=REQUEST_TIMEOUT,
+            headers=http_client.DEFAULT_HEADERS,
+        )
+    if _semaphore is None:
+        _semaphore = asyncio.Semaphore(MAX_CONCURRENCY)
+    return _session, _semaphore
+
+
+async def fetch_bytes(url: str, params: Optional[Dict] = None,
+                      retries: int = http_client.DEFAULT_RETRIES,
+                      deadline: Optional[float] = None) -> Tuple[int, bytes]:
+    """
+    Tek bir GET isteği (semaphore ile sınırlı, jitter'lı retry).
+    Devre açıksa ya da deadline (epoch sn) geçtiyse istek atılmaz.
+    Returns: (status_code, body). Ağ hatasında status 0 döner.
+    """
+    endpoint = resilience.endpoint_of(url)
+    if not resilience.allow(endpoint):
+        return 0, b""
+    session, semaphore = await _get_session()
+    status, body = 0, b""
+    error = None
+
+    for attempt in range(retries + 1):
+        if attempt > 0:
+            await asyncio.sleep(http_client.backoff_delay(attempt - 1))
+        timeout = REQUEST_TIMEOUT
+        if deadline is not None:
+            left = deadline - time.time()
+            if left <= 0:
+                break
+            timeout = aiohttp.ClientTimeout(total=min(REQUEST_TIMEOUT.total, left),
+                                            connect=REQUEST_TIMEOUT.connect,
+                                            sock_read=REQUEST_TIMEOUT.sock_read)
+        try:
+            async with semaphore:
+                async with session.get(url, params=params, timeout=timeout) as resp:
+                    status = resp.status
+                    body = await resp.read()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            print(f"Bulk fetch error ({url}): {e}")
+            status, body, error = 0, b"", e
+            continue
+
+        if status in http_client.RETRY_STATUS and attempt < retries:
+            continue
+        break
+
+    if status and status not in http_client.RETRY_STATUS:
+        resilience.record_success(endpoint)
+        espn_fixtures.record(url, params, status, body)
+    elif status or error is not None:
+        resilience.record_failure(endpoint, error or status)
+    else:
+        resilience.release(endpoint)
+    return status, body
+
+
+def iter_bytes(requests_by_key: Dict, use_budget: bool = True) -> Iterator[Tuple[object, int, bytes]]:
+    """
+    {key: url} ya da {key: (url, params)} sözlüğündeki tüm istekleri
+    eşzamanlı başlatır ve TAMAMLANDIKÇA (key, status, body) üretir.
+    Çağıran thread'de sayfa bütçesi varsa, süre dolunca kalan istekler
+    beklenmez (status 0 ile döner). Eksik sonucun kabul edilemediği toplu
+    backfill'ler use_budget=False ile bütçeyi yok sayar.
+    """
+    if not requests_by_key:
+        return
+
+    loop = get_loop()
+    results = queue.Queue()
+    left = resilience.remaining() if use_budget else None
+    deadline = time.time() + max(0.0, left) if left is not None else None
+
+    async def _one(key, url, params):
+        try:
+            status, body = await fetch_bytes(url, params, deadline=deadline)
+        except Exception as e:
+            print(f"Bulk fetch error ({key}): {e}")
+            status, body = 0, b""
+        results.put((key, status, body))
+
+    futures = []
+    for key, target in requests_by_key.items():
+        url, params = target if isinstance(target, tuple) else (target, None)
+        futures.append(asyncio.run_coroutine_threadsafe(_one(key, url, params), loop))
+
+    pending = set(requests_by_key)
+    try:
+        while pending:
+            try:
+                wait = None if deadline is None else max(0.0, deadline - time.time()) + 0.5
+                key, status, body = results.get(timeout=wait)
+            except queue.Empty:
+                print(f"Bulk fetch: time budget exhausted, {len(pending)} requests skipped")
+                for key in list(pending):
+                    pending.discard(key)
+                    yield key, 0, b""
+                break
+            pending.discard(key)
+            yield key, status, body
+    finally:
+        # Tüketici erken çıkarsa kalan istekleri iptal et
+        for f in futures:
+            f.cancel()
+
+
+def iter_json(requests_by_key: Dict, use_budget: bool = True) -> Iterator[Tuple[object, Optional[dict]]]:
+    """
+    iter_bytes() ile aynı, ancak gövdeyi çağıran thread'de JSON'a çevirir
+    (parse işlemi event loop'u bloklamaz). Hatalı yanıtlarda data None olur.
+    """
+    for key, status, body in iter_bytes(requests_by_key, use_budget=use_budget):
+        data = None
+        if status == 200 and body:
+            try:
+                data = json.loads(body)
+            except ValueError:
+                data = None
+        yield key, data
+
+
+def fetch_all_json(requests_by_key: Dict) -> Dict:
+    """Tüm yanıtları bekleyip {key: data} döndürür."""
+    return dict(iter_json(requests_by_key))
@@ -0,0 +1,139 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Optional
+
+from services import resilience, single_flight
+
+
+# =================================================================
+# MAÇ DURUMUNA GÖRE CACHE POLİTİKASI
+# =================================================================
+# Scoreboard / boxscore sonuçları maçın durumuna göre saklanır:
+# - Başlamamış (pre): kısa TTL, tip-off'u kaçırmamak için
+# - Canlı (in): birkaç saniye + aynı anda gelen isteklerin birleştirilmesi
+# - Bitmiş (post): kalıcı (sonuç bir daha değişmez)
+# st.cache_data yerine process-genel bellek cache'i kullanılır; böylece
+# TTL değer çekildikten SONRA, dönen veriye göre belirlenir.
+# Cache sınırlı bir LRU'dur (MAX_ENTRIES): sınır aşılırsa en uzun süre
+# kullanılmayan (kalıcı olsa da) çıkarılır, süresi dolan giriş okunduğunda
+# atılır; final maçlar gerekirse SQLite deposundan geri gelir.
+
+STATE_SCHEDULED = "pre"
+STATE_LIVE = "in"
+STATE_FINAL = "post"
+
+STATE_TTLS = {
+    STATE_SCHEDULED: 60,
+    STATE_LIVE: 10,
+    STATE_FINAL: None,      # None = kalıcı
+}
+DEFAULT_TTL = 60
+COALESCE_WAIT = 30          # Takipçilerin lider isteği bekleme süresi (sn)
+MAX_ENTRIES = 1000          # Bellekte tutulan en fazla giriş (boxscore, tarih paketi ...)
+
+_lock = threading.Lock()
+_cache: "OrderedDict[Hashable, tuple]" = OrderedDict()     # key -> (value, state, expires_at | None)
+_stats = {
+    "hits": 0,
+    "misses": 0,
+    "evicted": 0,
+}
+
+
+def ttl_for_state(state: Optional[str]) -> Optional[float]:
+    return STATE_TTLS.get(state, DEFAULT_TTL)
+
+
+def _fresh(key: Hashable):
+    entry = _cache.get(key)
+    if entry is None:
+        return None
+    if entry[2] is None or entry[2] > time.time():
+        _cache.move_to_end(key)
+        return entry
+    del _cache[key]
+    return None
+
+
+def _store(key: Hashable, entry: tuple):
+    """_lock altında: girişi yazar, LRU fazlasını atar (O(1))."""
+    _cache[key] = entry
+    _cache.move_to_end(key)
+    while len(_cache) > MAX_ENTRIES:
+        _cache.popitem(last=False)
+        _stats["evicted"] += 1
+
+
+def get_or_fetch(key: Hashable, fetch: Callable, state_of: Callable):
+    """
+    Cache'te taze değer varsa onu, yoksa fetch() sonucunu döndürür.
+
+    Aynı key için eşzamanlı çağrılar single_flight ile birleştirilir: sadece
+    ilki fetch() yapar, diğerleri onun sonucunu bekler. TTL, state_of(değer)
+    ile bulunan duruma göre seçilir.
+    """
+    with _lock:
+        entry = _fresh(key)
+        if entry:
+            _stats["hits"] += 1
+            return entry[0]
+
+    def load():
+        # Lider beklerken başka bir uçuş cache'i doldurmuş olabilir
+        with _lock:
+            entry = _fresh(key)
+            if entry:
+                return entry[0]
+            _stats["misses"] += 1
+        value = fetch()
+        state = state_of(value)
+        ttl = ttl_for_state(state)
+        with _lock:
+            _store(key, (value, state, None if ttl is None else time.time() + ttl))
+        return value
+
+    return single_flight.do(key, load, wait=resilience.clip_wait(COALESCE_WAIT))
+
+
+def peek_state(key: Hashable) -> Optional[str]:
+    """Cache'teki değerin durumunu döndürür (yoksa None)."""
+    entry = _cache.get(key)
+    return entry[1] if entry else None
+
+
+def invalidate(key: Hashable):
+    with _lock:
+        _cache.pop(key, None)
+
+
+def get_stats() -> Dict:
+    flights = single_flight.get_stats()["endpoints"]
+    with _lock:
+        result = dict(_stats)
+        endpoints = {k[0] for k in _cache if isinstance(k, tuple)}
+        result["coalesced"] = sum(flights.get(str(e), {}).get("deduplicated", 0) for e in endpoints)
+        result["entries"] = len(_cache)
+        result["permanent"] = sum(1 for e in _cache.values() if e[2] is None)
+    return result
+
+
+# =================================================================
+# DURUM TESPİTİ
+# =================================================================
+
+def scoreboard_state(games) -> str:
+    """Günün maçlarından en 'canlı' durum: biri canlıysa live, hepsi bittiyse final."""
+    if not games:
+        return STATE_SCHEDULED
+    states = {g.get("state") for g in games}
+    if STATE_LIVE in states:
+        return STATE_LIVE
+    if states == {STATE_FINAL}:
+        return STATE_FINAL
+    return STATE_SCHEDULED
+
+
+def boxscore_state(result) -> str:
+    """(players, state) tuple'ından durum."""
+    return result[1]
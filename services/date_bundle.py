@@ -0,0 +1,82 @@
+from typing import Dict, Optional
+
+import pandas as pd
+
+from services import (boxscore_ingest, cache_policy, espn_api, game_excitement, resilience,
+                      schedule_index, team_ratings)
+
+
+# =================================================================
+# ANA SAYFA TARİH PAKETİ
+# =================================================================
+# Ana sayfanın bir tarih için ihtiyaç duyduğu her şey tek seferde:
+# - Final maçlar depodan, diğer boxscore'lar ortak asyncio motoruyla
+#   (bulk_fetch, sayfa bütçesiyle) aynı anda çekilir; ilk çizim en yavaş
+#   tek isteğin süresine yakındır
+# - Tipli günlük oyuncu frame'i ve heyecan puanları bir kez hesaplanır
+# - Paket maç durumuna göre cache'lenir (cache_policy); eksik paket
+#   (bütçe aşımı / stale veri) kısa süreli tutulur
+# Ana sayfa kartları ve render_tables("Today") aynı paketi kullanır.
+
+
+def _bundle_state(bundle) -> str:
+    if not bundle["complete"]:
+        return cache_policy.STATE_LIVE
+    return cache_policy.scoreboard_state(bundle["games"])
+
+
+def _build(resolved_date, game_ids) -> Dict:
+    page = resilience.current_page()
+    stale_before = set(page.stale) if page else set()
+
+    # Scoreboard çoğunlukla cache'ten gelir; boxscore'lar tek fan-out'ta
+    games = espn_api.get_scoreboard(resolved_date)
+    boxscores = {str(gid): [] for gid in game_ids}
+    for gid, players in espn_api.iter_boxscores(game_ids):
+        boxscores[gid] = players or []
+
+    frames = []
+    game_ratings = {}
+    for gid, players in boxscores.items():
+        if players:
+            frames.append(boxscore_ingest.ingest_players(players))
+            game_ratings[gid] = team_ratings.game_rating(players)
+    players_df = boxscore_ingest.ingest_frame(pd.concat(frames, ignore_index=True)) if frames else pd.DataFrame()
+
+    excitement = game_excitement.score_games(
+        games,
+        team_ratings=team_ratings.get_ratings(schedule_index.season_of(resolved_date)),
+        game_ratings=game_ratings
+    )
+
+    # Final maçın boxscore'u boşsa ya da bir kısmı stale geldiyse paket eksiktir
+    finals = {str(g["game_id"]) for g in games if g.get("state") == cache_policy.STATE_FINAL}
+    stale_now = set(page.stale) - stale_before if page else set()
+    complete = bool(games) and not stale_now and all(boxscores.get(gid) for gid in finals)
+
+    return {
+        "date": resolved_date,
+        "game_ids": list(game_ids),
+        "games": games,
+        "boxscores": boxscores,
+        "players_df": players_df,
+        "excitement": excitement,
+        "game_ratings": game_ratings,
+        "complete": complete,
+    }
+
+
+def get_date_bundle(date) -> Optional[Dict]:
+    """
+    date ya da öncesindeki son maç günü için paket:
+    {'date', 'game_ids', 'games', 'boxscores', 'players_df', 'excitement',
+     'game_ratings', 'complete'}. Maç yoksa None.
+    players_df kopyadır; diğer alanlar oturumlar arasında paylaşılır (değiştirmeyin).
+    """
+    resolved_date, game_ids = espn_api.get_last_available_game_date(date)
+    if not game_ids:
+        return None
+
+    key = ("date_bundle", resolved_date.strftime("%Y%m%d"), tuple(str(g) for g in game_ids))
+    bundle = cache_policy.get_or_fetch(key, lambda: _build(resolved_date, game_ids), _bundle_state)
+    return {**bundle, "players_df": bundle["players_df"].copy()}
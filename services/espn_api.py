@@ -1,4 +1,6 @@
 import requests
+import threading
+import time
 from datetime import datetime, timedelta
 import streamlit as st
 from functools import lru_cache
@@ -6,71 +8,114 @@ import concurrent.futures
 from typing import Dict, List, Optional, Union
 import pandas as pd
 
+from services import aggregation, bulk_fetch, cache_policy, espn_fixtures, game_excitement, game_store, http_client, player_index, resilience, schedule_index, season_snapshot, season_totals, summary_parse, team_ratings
+
 
 # =================================================================
 # NBA SCOREBOARD & BOXSCORE FONKSİYONLARI (MEVCUT - DEĞİŞMEDİ)
 # =================================================================
 
-SCOREBOARD_URL = "https://site.api.espn.com/apis/site/v2/sports/basketball/nba/scoreboard"
-SUMMARY_URL = "https://site.api.espn.com/apis/site/v2/sports/basketball/nba/summary"
-INJURIES_URL = "https://site.api.espn.com/apis/site/v2/sports/basketball/nba/injuries"
+# ESPN_API_OVERRIDE ortam değişkeni ile tüm host'lar yerel fixture sunucusuna yönlenir
+# (bkz. espn_fixture_server.py)
+SITE_API = espn_fixtures.api_base(espn_fixtures.SITE_API_HOST)
+WEB_API = espn_fixtures.api_base(espn_fixtures.WEB_API_HOST)
+FANTASY_API = espn_fixtures.api_base(espn_fixtures.FANTASY_API_HOST)
+FANTASY_WEB_API = espn_fixtures.api_base(espn_fixtures.FANTASY_WEB_HOST)
+
+NBA_SITE_API = f"{SITE_API}/apis/site/v2/sports/basketball/nba"
+SCOREBOARD_URL = f"{NBA_SITE_API}/scoreboard"
+SUMMARY_URL = f"{NBA_SITE_API}/summary"
+INJURIES_URL = f"{NBA_SITE_API}/injuries"
+TEAMS_URL = f"{NBA_SITE_API}/teams"
+BYATHLETE_URL = f"{WEB_API}/apis/common/v3/sports/basketball/nba/statistics/byathlete"
 
-@st.cache_data(ttl=86400) # 24 saat cache
 def get_nba_teams_dynamic():
     """
     ESPN API'den güncel NBA takımlarını ve ID'lerini dinamik olarak çeker.
+    ESPN'e ulaşılamazsa son başarılı liste döner (boş sonuç cache'lenmez).
     """
-    url = "https://site.api.espn.com/apis/site/v2/sports/basketball/nba/teams?limit=100"
-    try:
-        data = requests.get(url, timeout=10).json()
-        teams_map = {} # {id: abbreviation} örn: {'13': 'LAL'}
-        
-        # JSON yolu: sports -> leagues -> teams -> team
-        for sport in data.get('sports', []):
-            for league in sport.get('leagues', []):
-                for team_entry in league.get('teams', []):
-                    team = team_entry.get('team', {})
-                    t_id = team.get('id')
-                    t_abbr = team.get('abbreviation')
-                    t_name = team.get('displayName')
-                    
-                    if t_id and t_abbr:
-                        teams_map[t_id] = {
-                            'abbr': t_abbr,
-                            'name': t_name
-                        }
-        return teams_map
-    except Exception as e:
-        print(f"Takım listesi çekilemedi: {e}")
-        return {}
+    return resilience.call_with_fallback("nba_teams", _fetch_nba_teams, default={})
+
+@st.cache_data(ttl=86400) # 24 saat cache
+def _fetch_nba_teams():
+    url = f"{TEAMS_URL}?limit=100"
+    data = http_client.get_json(url)
+    teams_map = {} # {id: abbreviation} örn: {'13': 'LAL'}
+    
+    # JSON yolu: sports -> leagues -> teams -> team
+    for sport in data.get('sports', []):
+        for league in sport.get('leagues', []):
+            for team_entry in league.get('teams', []):
+                team = team_entry.get('team', {})
+                t_id = team.get('id')
+                t_abbr = team.get('abbreviation')
+                t_name = team.get('displayName')
+                
+                if t_id and t_abbr:
+                    teams_map[t_id] = {
+                        'abbr': t_abbr,
+                        'name': t_name
+                    }
+    return resilience.require(teams_map)
 
-@st.cache_data(ttl=3600)
 def get_game_ids(date):
+    # Önce sezon fikstür indeksi (bellekte dict lookup)
+    ids = schedule_index.get_game_ids(date)
+    if ids is not None:
+        return ids
+    return _game_ids_with_fallback(date)
+
+def _game_ids_with_fallback(date):
+    return resilience.call_with_fallback(
+        ("game_ids", date.strftime("%Y%m%d")), lambda: _fetch_game_ids(date), default=[]
+    )
+
+@st.cache_data(ttl=3600)
+def _fetch_game_ids(date):
+    # Hata exception olarak çıkar: st.cache_data hatalı sonucu cache'lemez
     date_str = date.strftime("%Y%m%d")
     url = f"{SCOREBOARD_URL}?dates={date_str}"
-    try:
-        data = requests.get(url, timeout=10).json()
-        return [e["id"] for e in data.get("events", [])]
-    except Exception as e:
-        print(f"Hata (get_game_ids): {e}")
-        return []
+    data = http_client.get_json(url, coalesce=True)
+    return [e["id"] for e in data.get("events", [])]
 
 def get_last_available_game_date(date):
+    if schedule_index.ensure_season(date):
+        # İndeks: sıralı gün listesinde tek arama, gün gün yoklama yok
+        last_day = schedule_index.get_last_game_day(date, max_days_back=7)
+        if last_day is None:
+            return None, []
+        day = date.date() if isinstance(date, datetime) else date
+        date -= day - datetime.strptime(last_day, "%Y-%m-%d").date()
+        return date, schedule_index.get_game_ids(date)
+
     for _ in range(7):
-        ids = get_game_ids(date)
+        ids = _game_ids_with_fallback(date)
         if ids:
             return date, ids
         date -= timedelta(days=1)
     return None, []
 
 def get_scoreboard(date):
-    """GÜNÜN MAÇLARI + SKOR + OT KONTROLÜ"""
+    """
+    GÜNÜN MAÇLARI + SKOR + OT KONTROLÜ
+    Maç durumuna göre cache'lenir: canlı gün birkaç saniye, bitmiş gün kalıcı.
+    ESPN hatasında son başarılı liste (stale) döner; hata cache'lenmez.
+    """
+    date_str = date.strftime("%Y%m%d")
+    return resilience.call_with_fallback(
+        ("scoreboard", date_str),
+        lambda: cache_policy.get_or_fetch(
+            ("scoreboard", date_str),
+            lambda: _fetch_scoreboard(date),
+            cache_policy.scoreboard_state
+        ),
+        default=[]
+    )
+
+def _fetch_scoreboard(date):
     date_str = date.strftime("%Y%m%d")
     url = f"{SCOREBOARD_URL}?dates={date_str}"
-    try:
-        data = requests.get(url, timeout=10).json()
-    except Exception:
-        return []
+    data = http_client.get_json(url, coalesce=True)
 
     games = []
     for event in data.get("events", []):
@@ -98,93 +143,92 @@ def get_scoreboard(date):
                 "away_score": away.get("score", "0"),
                 "home_logo": f"https://a.espncdn.com/i/teamlogos/nba/500/{home['team']['abbreviation']}.png",
                 "away_logo": f"https://a.espncdn.com/i/teamlogos/nba/500/{away['team']['abbreviation']}.png",
-                "status": status_desc
+                "status": status_desc,
+                "state": status_obj["type"].get("state", "")
             })
         except (KeyError, IndexError):
             continue
     return games
 
-@st.cache_data(ttl=86400)
 def get_cached_boxscore(game_id):
-    return get_boxscore(game_id)
+    """
+    Boxscore'u maç durumuna göre cache'ler: başlamamış maç kısa süre,
+    canlı maç birkaç saniye (eşzamanlı istekler birleştirilir), final kalıcı.
+    ESPN hatasında son başarılı boxscore (stale) döner.
+    """
+    key = ("boxscore", str(game_id))
+    players, _ = resilience.call_with_fallback(
+        key,
+        lambda: cache_policy.get_or_fetch(key, lambda: _load_boxscore(game_id), cache_policy.boxscore_state),
+        default=([], cache_policy.STATE_SCHEDULED)
+    )
+    return players
 
-def get_boxscore(game_id):
-    url = f"{SUMMARY_URL}?event={game_id}"
-    try:
-        data = requests.get(url, timeout=10).json()
-    except Exception:
-        return []
+def get_boxscore(game_id, game_date=None):
+    """
+    Maçın oyuncu istatistiklerini döndürür.
+    Final maçlar önce kalıcı depodan okunur; depoda yoksa ESPN'den çekilir
+    ve maç bitmişse depoya yazılır.
+    """
+    players, _ = resilience.call_with_fallback(
+        ("boxscore", str(game_id)),
+        lambda: _load_boxscore(game_id, game_date),
+        default=([], cache_policy.STATE_SCHEDULED)
+    )
+    return players
 
-    players = []
+def _load_boxscore(game_id, game_date=None):
+    """Returns: (players, state) - state cache_policy durumlarından biri"""
+    stored = game_store.get_final_boxscore(game_id)
+    if stored:
+        return stored, cache_policy.STATE_FINAL
 
-    if "boxscore" not in data or "players" not in data["boxscore"]:
-        return []
+    # Hata exception olarak çıkar (boş sonuç cache'lenmesin)
+    players, is_final, header_date = _fetch_summary(game_id)
 
-    for team in data["boxscore"]["players"]:
-        for group in team.get("statistics", []):
-            if "athletes" not in group:
-                continue
-            
-            labels = group["labels"]
+    if players and is_final:
+        game_store.save_final_boxscore(game_id, game_date or header_date, players)
+        return players, cache_policy.STATE_FINAL
+    if players:
+        return players, cache_policy.STATE_LIVE
+    return players, cache_policy.STATE_SCHEDULED
 
-            for athlete in group["athletes"]:
-                raw_stats = athlete["stats"]
-                stats = dict(zip(labels, raw_stats))
-                
-                stats["PLAYER"] = athlete["athlete"]["displayName"]
-                stats["TEAM"] = team["team"]["abbreviation"]
-                
-                stats["FGM"] = 0; stats["FGA"] = 0
-                stats["3Pts"] = 0; stats["3PTA"] = 0
-                stats["FTM"] = 0; stats["FTA"] = 0
-
-                if "FG" in stats:
-                    val = str(stats["FG"])
-                    if "-" in val:
-                        m, a = val.split("-")
-                        stats["FGM"] = int(m)
-                        stats["FGA"] = int(a)
-
-                t_val = None
-                if "3PT" in stats: t_val = str(stats["3PT"])
-                elif "3Pt" in stats: t_val = str(stats["3Pt"])
-                elif "3P" in stats: t_val = str(stats["3P"])
-                
-                if t_val and "-" in t_val:
-                    m, a = t_val.split("-")
-                    stats["3Pts"] = int(m)
-                    stats["3PTA"] = int(a)
-
-                if "FT" in stats:
-                    val = str(stats["FT"])
-                    if "-" in val:
-                        m, a = val.split("-")
-                        stats["FTM"] = int(m)
-                        stats["FTA"] = int(a)
-                
-                if "MIN" not in stats:
-                    stats["MIN"] = "--"
+def fetch_boxscore(game_id):
+    """
+    ESPN summary endpoint'inden boxscore'u çeker (depoya bakmaz).
+    Returns: (players, is_final, game_date)
+    """
+    try:
+        return _fetch_summary(game_id)
+    except Exception:
+        return [], False, None
+
+def _fetch_summary(game_id):
+    """
+    Summary'yi çeker; sadece header + boxscore (+ plays) alt ağaçları parse edilir.
+    Hata exception olarak çıkar. Returns: (players, is_final, game_date)
+    """
+    response = http_client.get(f"{SUMMARY_URL}?event={game_id}", coalesce=True)
+    response.raise_for_status()
+    return summary_parse.parse_game(game_id, response.content)
 
-                players.append(stats)
+# Summary parse aşaması services/summary_parse.py'de (process pool'da da çalışır)
+parse_summary = summary_parse.parse_summary
 
-    return players
+def get_injuries():
+    """TÜM TAKIM SAKATLIKLARI (ESPN hatasında son başarılı liste döner)"""
+    return resilience.call_with_fallback("injuries", _fetch_injuries, default=[])
 
 @st.cache_data(ttl=3600)
-def get_injuries():
-    """TÜM TAKIM SAKATLIKLARI"""
-    try:
-        response = requests.get(INJURIES_URL, timeout=10)
-        data = response.json()
-        
-        if "injuries" not in data:
-            print(f"'injuries' key bulunamadı. Mevcut keys: {list(data.keys())}")
-            return []
-            
-    except Exception as e:
-        print(f"Hata (get_injuries): {e}")
-        import traceback
-        traceback.print_exc()
-        return []
+def _fetch_injuries():
+    # Hatalar exception olarak çıkar: st.cache_data boş / hatalı sonucu cache'lemez
+    # Oturumlar arası eşzamanlı istekler tek istekte birleşir
+    response = http_client.get(INJURIES_URL, coalesce=True)
+    data = response.json()
+    
+    if "injuries" not in data:
+        print(f"'injuries' key bulunamadı. Mevcut keys: {list(data.keys())}")
+        raise resilience.EmptyResult()
 
     all_injuries = []
     
@@ -239,23 +283,33 @@ def get_injuries():
 # services/espn_api.py
 
 def get_nba_season_stats_official(season_year=2026):
+    """
+    Sezon liderleri tablosu. Kalıcı snapshot hemen döner, eskiyse arka planda
+    yenilenir (stale-while-revalidate). PTS_DELTA / GP_DELTA / RANK_DELTA:
+    önceki günün snapshot'ına göre hareket.
+    """
+    df = season_snapshot.get(season_year, lambda: _fetch_season_stats_official(season_year))
+    if df is None:
+        return pd.DataFrame(columns=OFFICIAL_STATS_COLUMNS)
+    return df
+
+# Beklenen sütunlar
+OFFICIAL_STATS_COLUMNS = [
+    "PLAYER", "TEAM", "GP", "MIN", "PTS", "REB", "AST", 
+    "STL", "BLK", "TO", "FGM", "FGA", "FTM", "FTA", 
+    "3Pts", "3PTA", "FG%", "FT%", "+/-"
+]
+
+def _fetch_season_stats_official(season_year):
     """
     FIXED VERSION (INDEX MAPPING):
     API artık 'names' göndermediği için, veriler doğrudan
     sıra numarasına (index) göre haritalanır.
     Referans: Luka Doncic JSON yapısı analiz edilmiştir.
     """
-    import pandas as pd
-    import requests
-    
-    # Beklenen sütunlar
-    REQUIRED_COLUMNS = [
-        "PLAYER", "TEAM", "GP", "MIN", "PTS", "REB", "AST", 
-        "STL", "BLK", "TO", "FGM", "FGA", "FTM", "FTA", 
-        "3Pts", "3PTA", "FG%", "FT%", "+/-"
-    ]
+    REQUIRED_COLUMNS = OFFICIAL_STATS_COLUMNS
     
-    base_url = "https://site.web.api.espn.com/apis/common/v3/sports/basketball/nba/statistics/byathlete"
+    base_url = BYATHLETE_URL
     
     headers = {
         "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
@@ -277,7 +331,7 @@ def get_nba_season_stats_official(season_year=2026):
                 "season": s
             }
             
-            response = requests.get(base_url, headers=headers, params=params, timeout=10)
+            response = http_client.get(base_url, headers=headers, params=params)
             data = response.json()
             athletes = data.get("athletes", [])
             
@@ -292,9 +346,8 @@ def get_nba_season_stats_official(season_year=2026):
 
     if not found_athletes:
         print("❌ No data found.")
-        # Boş DataFrame döndür (KeyError engellemek için sütunlarla)
-        df = pd.DataFrame(columns=REQUIRED_COLUMNS)
-        return df
+        # Boş sonuç: çağıran son başarılı tabloya ya da boş (sütunlu) DataFrame'e düşer
+        raise resilience.EmptyResult()
 
     # --- PARSING ENGINE (INDEX BASED) ---
     for ath_entry in found_athletes:
@@ -304,6 +357,7 @@ def get_nba_season_stats_official(season_year=2026):
             # 1. Oyuncu Bilgileri
             athlete = ath_entry.get('athlete', {})
             row['PLAYER'] = athlete.get('displayName', 'Unknown')
+            row['PLAYER_ID'] = athlete.get('id')
             row['TEAM'] = athlete.get('team', {}).get('abbreviation', 'FA')
             
             # 2. Kategorileri Ayır
@@ -368,206 +422,26 @@ def get_nba_season_stats_official(season_year=2026):
     return df.sort_values(by="PTS", ascending=False)
     # services/espn_api.py dosyasında ilgili yerleri bu kodla değiştirin
 
-# =================================================================
-# GÜNCELLENMİŞ GET_ACTIVE_PLAYERS_STATS VE YEREL AGGREGATE FONKSİYONU
-# =================================================================
-
-@st.cache_data(ttl=3600)
-def get_active_players_stats(days=None, season_stats=True):
-    """
-    Aktif oyuncuların istatistiklerini çeker.
-    
-    Args:
-        days: Kaç günlük veri alınacak (None ise sezon başından itibaren)
-        season_stats: True ise sezon başından, False ise son X gün
-    """
-    end_date = datetime.now()
-    
-    if season_stats or days is None:
-        # NBA 2024-25 sezonu başlangıcı: 22 Ekim 2024
-        # NBA 2025-26 sezonu başlangıcı: ~22 Ekim 2025 (tahmini)
-        current_year = end_date.year
-        current_month = end_date.month
-        
-        # Eğer Ekim öncesiyse, geçen sezonun verisini kullan
-        if current_month < 10:
-            season_start_year = current_year - 1
-        else:
-            season_start_year = current_year
-        
-        # NBA sezonları genelde Ekim'in son haftasında başlar
-        start_date = datetime(season_start_year, 10, 22)
-        
-        print(f"📊 Sezon istatistikleri: {start_date.strftime('%Y-%m-%d')} - {end_date.strftime('%Y-%m-%d')}")
-        print(f"📅 Toplam {(end_date - start_date).days} gün")
-    else:
-        # Son X gün
-        start_date = end_date - timedelta(days=days)
-        print(f"📊 Son {days} gün istatistikleri")
-    
-    # GÜNCEL ROSTER BİLGİSİNİ ÇEK
-    current_rosters = get_current_team_rosters()
-    
-    # İsim normalleştirme için yardımcı fonksiyon
-    def normalize_name(name):
-        """İsimleri karşılaştırma için normalize eder"""
-        if not name:
-            return ""
-        return name.replace(".", "").replace("'", "").replace("-", " ").lower().strip()
-    
-    # Normalize edilmiş roster dictionary oluştur
-    normalized_rosters = {}
-    for player_name, team in current_rosters.items():
-        norm_name = normalize_name(player_name)
-        normalized_rosters[norm_name] = {
-            'team': team,
-            'original_name': player_name
-        }
-    
-    games_data = get_historical_boxscores(start_date, end_date)
-    
-    player_stats = {}
-    
-    # Güvenli sayı çevirme fonksiyonu
-    def to_num(val):
-        try:
-            if val == '' or val is None or val == '--':
-                return 0.0
-            return float(val)
-        except (ValueError, TypeError):
-            return 0.0
-    
-    # Dakika parse fonksiyonu
-    def parse_minutes(min_str):
-        try:
-            if min_str == '' or min_str is None or min_str == '--':
-                return 0.0
-            if isinstance(min_str, (int, float)):
-                return float(min_str)
-            if isinstance(min_str, str):
-                if ':' in min_str:
-                    parts = min_str.split(':')
-                    return float(parts[0]) + float(parts[1]) / 60
-                else:
-                    return float(min_str)
-            return 0.0
-        except (ValueError, TypeError):
-            return 0.0
-
-    # Her maçtaki her oyuncu için istatistikleri topla
-    for game in games_data:
-        for p in game['players']:
-            name = p.get('PLAYER', '')
-            if not name:
-                continue
-            
-            # Dakikayı parse et - 0 ise atla
-            minutes_played = parse_minutes(p.get('MIN', 0))
-            if minutes_played == 0:
-                continue
-            
-            # Güncel takımı bul (normalize edilmiş isimle)
-            norm_name = normalize_name(name)
-            roster_info = normalized_rosters.get(norm_name)
-            
-            if roster_info:
-                current_team = roster_info['team']
-                display_name = roster_info['original_name']
-            else:
-                current_team = p.get('TEAM', 'UNK')
-                display_name = name
-            
-            if display_name not in player_stats:
-                player_stats[display_name] = {
-                    'GP': 0, 'PTS': 0, 'REB': 0, 'AST': 0, 
-                    'STL': 0, 'BLK': 0, 'TO': 0, 
-                    'FGM': 0, 'FGA': 0, 'FTM': 0, 'FTA': 0, 
-                    '3Pts': 0, '3PTA': 0,  # 3PTA eklendi
-                    'TEAM': current_team,
-                    'MIN': 0,
-                    'last_game_date': game['date']
-                }
-            
-            stats = player_stats[display_name]
-            stats['TEAM'] = current_team
-            stats['GP'] += 1
-            stats['MIN'] += minutes_played
-            
-            if game['date'] > stats['last_game_date']:
-                stats['last_game_date'] = game['date']
-            
-            # İstatistikleri topla
-            stats['PTS'] += to_num(p.get('PTS', 0))
-            stats['REB'] += to_num(p.get('REB', 0))
-            stats['AST'] += to_num(p.get('AST', 0))
-            stats['STL'] += to_num(p.get('STL', 0))
-            stats['BLK'] += to_num(p.get('BLK', 0))
-            stats['TO']  += to_num(p.get('TO', 0))
-            stats['FGM'] += to_num(p.get('FGM', 0))
-            stats['FGA'] += to_num(p.get('FGA', 0))
-            stats['FTM'] += to_num(p.get('FTM', 0))
-            stats['FTA'] += to_num(p.get('FTA', 0))
-            stats['3Pts'] += to_num(p.get('3Pts', 0))
-            stats['3PTA'] += to_num(p.get('3PTA', 0))
-
-    # Ortalamaları hesapla - Sadece maç başına 10+ dakika oynayanlar
-    final_list = []
-    for name, s in player_stats.items():
-        if s['GP'] == 0:
-            continue
-            
-        avg_minutes = s['MIN'] / s['GP']
-        
-        # MAÇBAŞI 10 DAKİKADAN AZ OYNAYANLAR HARİÇ
-        if avg_minutes < 10:
-            continue
-        
-        # Yüzdeleri hesapla
-        fg_pct = round((s['FGM'] / s['FGA'] * 100) if s['FGA'] > 0 else 0, 1)
-        ft_pct = round((s['FTM'] / s['FTA'] * 100) if s['FTA'] > 0 else 0, 1)
-        three_pct = round((s['3Pts'] / s['3PTA'] * 100) if s['3PTA'] > 0 else 0, 1)
-        
-        final_list.append({
-            'PLAYER': name,
-            'TEAM': s['TEAM'],
-            'GP': s['GP'],
-            'MIN': round(avg_minutes, 1),
-            'PTS': round(s['PTS'] / s['GP'], 1),
-            'REB': round(s['REB'] / s['GP'], 1),
-            'AST': round(s['AST'] / s['GP'], 1),
-            'STL': round(s['STL'] / s['GP'], 1),
-            'BLK': round(s['BLK'] / s['GP'], 1),
-            'TO': round(s['TO'] / s['GP'], 1),
-            'FGM': round(s['FGM'] / s['GP'], 1),
-            'FGA': round(s['FGA'] / s['GP'], 1),
-            'FTM': round(s['FTM'] / s['GP'], 1),
-            'FTA': round(s['FTA'] / s['GP'], 1),
-            '3Pts': round(s['3Pts'] / s['GP'], 1),
-            '3PM': round(s['3Pts'] / s['GP'], 1),  # Duplicate for compatibility
-            '3PTA': round(s['3PTA'] / s['GP'], 1),
-            'FG%': fg_pct,
-            'FT%': ft_pct,
-            '3P%': three_pct,
-        })
-    
-    print(f"✓ {len(final_list)} aktif oyuncu bulundu (10+ dakika ortalaması)")
-    
-    return pd.DataFrame(final_list).sort_values(by="PTS", ascending=False)
-@st.cache_data(ttl=86400)
 def get_current_team_rosters():
     """
     Tüm NBA takımlarının güncel rosterlerini çeker.
     Dinamik ID listesi kullanır.
-    Returns: Dict[player_name] = team_abbreviation
+    Returns: Dict[player_name] = {'team', 'id', 'headshot'}
+    ESPN'e ulaşılamazsa son başarılı roster haritası döner.
     """
+    return resilience.call_with_fallback("rosters", _fetch_team_rosters, default={})
+
+@st.cache_data(ttl=86400)
+def _fetch_team_rosters():
     # Önce takımları API'den al
     nba_teams = get_nba_teams_dynamic()
     
     if not nba_teams:
-        st.error("NBA takım listesi API'den çekilemedi.")
-        return {}
+        print("NBA takım listesi API'den çekilemedi.")
+        raise resilience.EmptyResult()
 
     player_team_map = {}
+    teams_loaded = 0
     
     print(f"Rosterlar taranıyor: {len(nba_teams)} takım bulundu.")
     
@@ -575,9 +449,9 @@ def get_current_team_rosters():
 
     def fetch_single_roster(team_id, team_info):
         t_abbr = team_info['abbr']
-        url = f"https://site.api.espn.com/apis/site/v2/sports/basketball/nba/teams/{team_id}/roster"
+        url = f"{TEAMS_URL}/{team_id}/roster"
         try:
-            resp = requests.get(url, timeout=5)
+            resp = http_client.get(url, timeout=(5, 5))
             if resp.status_code == 200:
                 data = resp.json()
                 athletes = data.get('athletes', [])
@@ -594,7 +468,8 @@ def get_current_team_rosters():
                         # Sadece takım ismini değil, sözlük döndürüyoruz
                         local_map[p_name] = {
                             'team': t_abbr,
-                            'id': p_id
+                            'id': p_id,
+                            'headshot': (ath.get('headshot') or {}).get('href')
                         }
                 return local_map
         except Exception:
@@ -612,6 +487,12 @@ def get_current_team_rosters():
             result = future.result()
             if result:
                 player_team_map.update(result)
+                teams_loaded += 1
+
+    # Takımların yarısından azı geldiyse eksik harita 24 saat cache'lenmesin
+    if teams_loaded < len(nba_teams) // 2:
+        print(f"Roster taraması eksik: {teams_loaded}/{len(nba_teams)} takım")
+        raise resilience.EmptyResult()
 
     print(f"✓ Toplam {len(player_team_map)} oyuncu haritalandı.")
     return player_team_map
@@ -633,14 +514,14 @@ def call_espn_api(league_id: int, views: list = None):
         views = ['mMatchupScore', 'mScoreboard', 'mSettings', 'mTeam', 'modular', 'mNav']
     
     # Season parametresi olmadan direkt league endpoint
-    base_url = f"https://lm-api-reads.fantasy.espn.com/apis/v3/games/fba/leagueHistory/{league_id}"
+    base_url = f"{FANTASY_API}/apis/v3/games/fba/leagueHistory/{league_id}"
     
     params = {'view': views}
     
     # Önce leagueHistory dene
     try:
         print(f"Trying leagueHistory: {base_url}")
-        response = requests.get(base_url, headers=HEADERS, params=params, timeout=10)
+        response = http_client.get(base_url, headers=HEADERS, params=params)
         
         if response.status_code == 200:
             data = response.json()
@@ -653,11 +534,11 @@ def call_espn_api(league_id: int, views: list = None):
         print(f"leagueHistory failed: {str(e)}")
     
     # Alternatif: Direkt league endpoint (bazı ligler için)
-    alt_url = f"https://fantasy.espn.com/apis/v3/games/fba/seasons/2026/segments/0/leagues/{league_id}"
+    alt_url = f"{FANTASY_WEB_API}/apis/v3/games/fba/seasons/2026/segments/0/leagues/{league_id}"
     
     try:
         print(f"Trying direct endpoint: {alt_url}")
-        response = requests.get(alt_url, headers=HEADERS, params=params, timeout=10)
+        response = http_client.get(alt_url, headers=HEADERS, params=params)
         
         if response.status_code == 401:
             raise PermissionError("Bu lig private. Sadece public ligler destekleniyor.")
@@ -669,9 +550,9 @@ def call_espn_api(league_id: int, views: list = None):
                 return data
         
         # 2024'ü de dene
-        alt_url_2024 = f"https://fantasy.espn.com/apis/v3/games/fba/seasons/2025/segments/0/leagues/{league_id}"
+        alt_url_2024 = f"{FANTASY_WEB_API}/apis/v3/games/fba/seasons/2025/segments/0/leagues/{league_id}"
         print(f"Trying 2024: {alt_url_2024}")
-        response = requests.get(alt_url_2024, headers=HEADERS, params=params, timeout=10)
+        response = http_client.get(alt_url_2024, headers=HEADERS, params=params)
         
         if response.status_code == 200:
             data = response.json()
@@ -813,10 +694,21 @@ def get_standings(league_id: int, season: int = None) -> List[Dict]:
 
 # services/espn_api.py dosyasında get_active_players_stats fonksiyonunu bununla değiştirin:
 
-@st.cache_data(ttl=3600)
 def get_active_players_stats(days=None, season_stats=True):
     """
     Aktif oyuncuların istatistiklerini çeker.
+    Veri alınamazsa son başarılı tablo döner (boş tablo cache'lenmez).
+    """
+    return resilience.call_with_fallback(
+        ("active_players", days, season_stats),
+        lambda: _active_players_stats(days, season_stats),
+        default=pd.DataFrame()
+    )
+
+@st.cache_data(ttl=3600)
+def _active_players_stats(days=None, season_stats=True):
+    """
+    Aktif oyuncuların istatistiklerini çeker.
     
     Args:
         days: Kaç günlük veri alınacak (None ise sezon başından itibaren)
@@ -846,167 +738,51 @@ def get_active_players_stats(days=None, season_stats=True):
         start_date = end_date - timedelta(days=days)
         print(f"📊 Son {days} gün istatistikleri")
     
-    # GÜNCEL ROSTER BİLGİSİNİ ÇEK
-    current_rosters = get_current_team_rosters()
-    
-    # İsim normalleştirme için yardımcı fonksiyon
-    def normalize_name(name):
-        """İsimleri karşılaştırma için normalize eder"""
-        if not name:
-            return ""
-        return name.replace(".", "").replace("'", "").replace("-", " ").lower().strip()
-    
-    # Normalize edilmiş roster dictionary oluştur
-    normalized_rosters = {}
-    for player_name, team in current_rosters.items():
-        norm_name = normalize_name(player_name)
-        normalized_rosters[norm_name] = {
-            'team': team,
-            'original_name': player_name
-        }
+    # GÜNCEL ROSTER BİLGİSİ: athlete id indeksi
+    player_index.ensure_loaded()
     
-    games_data = get_historical_boxscores(start_date, end_date)
-    
-    player_stats = {}
-    
-    # Güvenli sayı çevirme fonksiyonu
-    def to_num(val):
-        try:
-            if val == '' or val is None or val == '--':
-                return 0.0
-            return float(val)
-        except (ValueError, TypeError):
-            return 0.0
-    
-    # Dakika parse fonksiyonu
-    def parse_minutes(min_str):
-        try:
-            if min_str == '' or min_str is None or min_str == '--':
-                return 0.0
-            if isinstance(min_str, (int, float)):
-                return float(min_str)
-            if isinstance(min_str, str):
-                if ':' in min_str:
-                    parts = min_str.split(':')
-                    return float(parts[0]) + float(parts[1]) / 60
-                else:
-                    return float(min_str)
-            return 0.0
-        except (ValueError, TypeError):
-            return 0.0
-
-    # Her maçtaki her oyuncu için istatistikleri topla
-    for game in games_data:
-        for p in game['players']:
-            name = p.get('PLAYER', '')
-            if not name:
-                continue
-            
-            # Dakikayı parse et - 0 ise atla
-            minutes_played = parse_minutes(p.get('MIN', 0))
-            if minutes_played == 0:
-                continue
-            
-            # Güncel takımı bul (normalize edilmiş isimle)
-            norm_name = normalize_name(name)
-            roster_info = normalized_rosters.get(norm_name)
-            
-            if roster_info:
-                current_team = roster_info['team']
-                display_name = roster_info['original_name']
-            else:
-                current_team = p.get('TEAM', 'UNK')
-                display_name = name
-            
-            if display_name not in player_stats:
-                player_stats[display_name] = {
-                    'GP': 0, 'PTS': 0, 'REB': 0, 'AST': 0, 
-                    'STL': 0, 'BLK': 0, 'TO': 0, 
-                    'FGM': 0, 'FGA': 0, 'FTM': 0, 'FTA': 0, 
-                    '3Pts': 0, '3PTA': 0,
-                    'TEAM': current_team,
-                    'MIN': 0,
-                    'last_game_date': game['date']
-                }
-            
-            stats = player_stats[display_name]
-            stats['TEAM'] = current_team
-            stats['GP'] += 1
-            stats['MIN'] += minutes_played
-            
-            if game['date'] > stats['last_game_date']:
-                stats['last_game_date'] = game['date']
-            
-            # İstatistikleri topla
-            stats['PTS'] += to_num(p.get('PTS', 0))
-            stats['REB'] += to_num(p.get('REB', 0))
-            stats['AST'] += to_num(p.get('AST', 0))
-            stats['STL'] += to_num(p.get('STL', 0))
-            stats['BLK'] += to_num(p.get('BLK', 0))
-            stats['TO']  += to_num(p.get('TO', 0))
-            
-            # FG istatistikleri - get_boxscore'dan gelen değerleri kullan
-            stats['FGM'] += to_num(p.get('FGM', 0))
-            stats['FGA'] += to_num(p.get('FGA', 0))
-            stats['FTM'] += to_num(p.get('FTM', 0))
-            stats['FTA'] += to_num(p.get('FTA', 0))
-            stats['3Pts'] += to_num(p.get('3Pts', 0))
-            stats['3PTA'] += to_num(p.get('3PTA', 0))
-            
-            # Debug: İlk 3 oyuncu için değerleri yazdır
-            if stats['GP'] == 1 and len(player_stats) <= 3:
-                print(f"DEBUG {display_name}: FGM={p.get('FGM')}, FGA={p.get('FGA')}, FTM={p.get('FTM')}, FTA={p.get('FTA')}")
-
-    # Ortalamaları hesapla - Sadece maç başına 10+ dakika oynayanlar
-    final_list = []
-    for name, s in player_stats.items():
-        if s['GP'] == 0:
-            continue
-            
-        avg_minutes = s['MIN'] / s['GP']
+    if season_stats or days is None:
+        # Sezon: running total tablosu sadece watermark sonrası maçlarla güncellenir
+        season_totals.refresh(start_date, end_date)
+        df = season_totals.get_season_averages(start_date)
+        if df.empty:
+            raise resilience.EmptyResult()
         
-        # MAÇBAŞI 10 DAKİKADAN AZ OYNAYANLAR HARİÇ
-        if avg_minutes < 10:
-            continue
+        # Güncel takım / isim athlete id üzerinden indeksten
+        df = player_index.apply_identity(df)
+    else:
+        games_data = get_historical_boxscores(start_date, end_date)
+        game_frame = aggregation.build_game_frame(games_data)
         
-        # Yüzdeleri hesapla
-        fg_pct = round((s['FGM'] / s['FGA'] * 100) if s['FGA'] > 0 else 0, 1)
-        ft_pct = round((s['FTM'] / s['FTA'] * 100) if s['FTA'] > 0 else 0, 1)
-        three_pct = round((s['3Pts'] / s['3PTA'] * 100) if s['3PTA'] > 0 else 0, 1)
+        # 0 dakikalık maçlar sayılmaz, MAÇBAŞI 10 DAKİKADAN AZ OYNAYANLAR HARİÇ
+        df = aggregation.aggregate_players(
+            game_frame,
+            stats=[key for key, _ in season_totals.TOTAL_COLUMNS],
+            min_game_minutes=0,
+            min_avg_minutes=season_totals.MIN_AVG_MINUTES,
+            identity=True,
+            track_teams=False
+        )
+        if df.empty:
+            raise resilience.EmptyResult()
         
-        final_list.append({
-            'PLAYER': name,
-            'TEAM': s['TEAM'],
-            'GP': s['GP'],
-            'MIN': round(avg_minutes, 1),
-            'PTS': round(s['PTS'] / s['GP'], 1),
-            'REB': round(s['REB'] / s['GP'], 1),
-            'AST': round(s['AST'] / s['GP'], 1),
-            'STL': round(s['STL'] / s['GP'], 1),
-            'BLK': round(s['BLK'] / s['GP'], 1),
-            'TO': round(s['TO'] / s['GP'], 1),
-            'FGM': round(s['FGM'] / s['GP'], 1),
-            'FGA': round(s['FGA'] / s['GP'], 1),
-            'FTM': round(s['FTM'] / s['GP'], 1),
-            'FTA': round(s['FTA'] / s['GP'], 1),
-            '3Pts': round(s['3Pts'] / s['GP'], 1),
-            '3PM': round(s['3Pts'] / s['GP'], 1),  # Duplicate for compatibility
-            '3PTA': round(s['3PTA'] / s['GP'], 1),
-            'FG%': fg_pct,
-            'FT%': ft_pct,
-            '3P%': three_pct,
-        })
+        df = df.rename(columns={'GAMES': 'GP'})
+        avg_cols = ['MIN'] + [key for key, _ in season_totals.TOTAL_COLUMNS]
+        df[avg_cols] = df[avg_cols].round(1)
+        df['3PM'] = df['3Pts']  # Duplicate for compatibility
+        df = df[season_totals.AVERAGE_COLUMNS]
     
-    print(f"✓ {len(final_list)} aktif oyuncu bulundu (10+ dakika ortalaması)")
+    print(f"✓ {len(df)} aktif oyuncu bulundu (10+ dakika ortalaması)")
     
-    return pd.DataFrame(final_list).sort_values(by="PTS", ascending=False)
+    return df.sort_values(by="PTS", ascending=False)
 
 
 
 def calculate_game_score(home_score, away_score, status_desc, 
                         home_offensive_rating=None, away_offensive_rating=None,
                         home_defensive_rating=None, away_defensive_rating=None,
-                        lead_changes=None, home_team_stats=None, away_team_stats=None):
+                        lead_changes=None, home_team_stats=None, away_team_stats=None,
+                        late_margin=None, game_offensive_rating=None):
     """
     Maçın heyecan düzeyini 10 üzerinden hesaplar.
     
@@ -1017,11 +793,14 @@ def calculate_game_score(home_score, away_score, status_desc,
         home_defensive_rating, away_defensive_rating: Takım sezon ortalaması defensive rating
         lead_changes: Maçtaki liderlik değişim sayısı
         home_team_stats, away_team_stats: Takım sezon istatistikleri (dict: {'offensive_rating': x, 'defensive_rating': y})
+        late_margin: Son 5 dakika + uzatmalardaki en büyük fark (play-by-play'den)
+        game_offensive_rating: Maçtaki gerçek ortalama ORtg (boxscore possession'larından)
     
     Kriterler:
         - Skor farkı (40%)
         - Tempo/Toplam skor (15%)
         - Liderlik değişimleri (25%)
+        - Son dakikalar farkı (bonus)
         - Offensive/Defensive performans (15%)
         - Uzatma bonusu (5%)
     """
@@ -1103,6 +882,15 @@ def calculate_game_score(home_score, away_score, status_desc,
             score += 0.5       # Ortalama
         else:
             score -= 0.5       # Tek taraflı oyun
+
+    # Son dakikalar: fark hiç açılmadıysa kritik bitiş
+    if late_margin is not None:
+        if late_margin <= 3:
+            score += 1.0
+        elif late_margin <= 5:
+            score += 0.5
+        elif late_margin > 15:
+            score -= 0.5
     
     # ============================================
     # 5. OFFENSIVE/DEFENSIVE PERFORMANS (%15 Etki)
@@ -1113,11 +901,13 @@ def calculate_game_score(home_score, away_score, status_desc,
     
     # Offensive Rating kontrolü
     if home_offensive_rating and away_offensive_rating:
-        # Maçtaki ortalama offensive rating (basitleştirilmiş hesaplama)
-        # Gerçek ORtg = 100 * (Sayılar / Possessions) ama biz yaklaşık hesap yapalım
-        # Ortalama 48 dakika için ~100 possession varsayalım
-        estimated_possessions = (total_points / 2.2)  # Yaklaşık
-        avg_ortg_in_game = (total_points / estimated_possessions) * 100
+        # Maçtaki ortalama offensive rating: boxscore'dan biliniyorsa gerçek değer,
+        # yoksa toplam skordan yaklaşık hesap
+        if game_offensive_rating:
+            avg_ortg_in_game = game_offensive_rating
+        else:
+            estimated_possessions = (total_points / 2.2)  # Yaklaşık
+            avg_ortg_in_game = (total_points / estimated_possessions) * 100
         avg_season_ortg = (home_offensive_rating + away_offensive_rating) / 2
         
         if avg_ortg_in_game > avg_season_ortg + 5:
@@ -1142,7 +932,7 @@ def calculate_game_score(home_score, away_score, status_desc,
     # ============================================
     # 6. UZATMA FAKTÖRÜ (%5 Bonus)
     # ============================================
-    if "OT" in status_desc:
+    if status_desc and "OT" in status_desc:
         ot_count = status_desc.count("OT")
         if ot_count >= 2:
             score += 2.5      # Çift/üçlü uzatma - efsane
@@ -1203,6 +993,44 @@ def get_score_color(score):
     elif score >= 5.0: return "#f97316" # Turuncu (Eh)
     return "#ef4444" # Kırmızı (Sıkıcı)
 
+def get_rewatch_games(end_date, days=7, limit=5):
+    """
+    Son `days` günün bitmiş maçlarını heyecan puanına göre sıralar.
+    Fikstür indeksi + kayıtlı play-by-play akışı ve takım rating'leri
+    kullanılır, ek istek atılmaz.
+    Returns: DataFrame (game_id, game_date, home/away_team, skorlar, akış, excitement)
+    """
+    if not schedule_index.ensure_season(end_date):
+        return pd.DataFrame()
+    games = []
+    for offset in range(days):
+        games.extend(schedule_index.get_games(end_date - timedelta(days=offset)) or [])
+    return game_excitement.rank_games(
+        games, limit=limit,
+        team_ratings=team_ratings.get_ratings(schedule_index.season_of(end_date)),
+        game_ratings=team_ratings.get_game_ratings(g["game_id"] for g in games)
+    )
+
+# Depo sezonun bitmiş maçlarının en az bu oranını kapsıyorsa gerçek maç logları kullanılır
+SEASON_LOG_COVERAGE = 0.9
+
+def get_season_game_logs(start_date, end_date, min_coverage=SEASON_LOG_COVERAGE):
+    """
+    Aralıktaki bitmiş maçların gerçek oyuncu-maç logları (kalıcı depodan, istek atmaz).
+    Depo fikstürdeki final maçların min_coverage oranını kapsamıyorsa None
+    (çağıran sezon toplamlarıyla çalışır).
+    """
+    game_ids = schedule_index.final_game_ids(start_date, end_date)
+    if not game_ids:
+        return None
+    stored = game_store.get_final_game_ids(game_ids)
+    coverage = len(stored) / len(game_ids)
+    if coverage < min_coverage:
+        print(f"Season logs: store covers {coverage:.0%} of {len(game_ids)} final games, using season totals")
+        return None
+    logs = game_store.load_game_logs(stored)
+    return logs if not logs.empty else None
+
 # KULLANIM ÖRNEKLERİ:
 
 # Sezon başından itibaren (varsayılan):
@@ -1214,13 +1042,56 @@ def get_score_color(score):
 # Son 30 gün:
 # df = get_active_players_stats(days=30, season_stats=False)
 
-def get_historical_boxscores(start_date, end_date):
+def _scoreboard_ids(data):
+    return [e["id"] for e in (data or {}).get("events", []) if "id" in e]
+
+# get_game_ids ile aynı süre: tarih -> (zaman, ids)
+GAME_IDS_TTL = 3600
+_game_ids_memo = {}
+_game_ids_lock = threading.Lock()
+
+def resolve_game_dates(date_list, failed_dates=None):
     """
-    Belirtilen tarih aralığındaki TÜM maçların boxscore'larını çeker.
-    Performans için Threading kullanır.
+    Tarih listesindeki tüm günlerin game ID'lerini döndürür. Sezon indeksi
+    yüklenemeyen günler tek event loop üzerinden tek tek çekilir (1 saat memo).
+    failed_dates listesi verilirse scoreboard'u alınamayan günler buna eklenir.
+    Returns: {date: [game_ids]} (maç olmayan günler dahil edilmez)
+    """
+    # Sezon fikstür indeksi: aralık istekleriyle yüklenmiş, gün başına istek yok
+    date_game_map, date_list = schedule_index.lookup_game_ids(date_list)
+
+    now = time.time()
+    requests_by_date = {}
+    with _game_ids_lock:
+        for d in date_list:
+            key = d.strftime('%Y%m%d')
+            cached = _game_ids_memo.get(key)
+            if cached and now - cached[0] < GAME_IDS_TTL:
+                if cached[1]:
+                    date_game_map[d] = cached[1]
+            else:
+                requests_by_date[d] = f"{SCOREBOARD_URL}?dates={key}"
+
+    for d, data in bulk_fetch.iter_json(requests_by_date, use_budget=False):
+        if data is None:
+            if failed_dates is not None:
+                failed_dates.append(d)
+            continue  # Hatalı yanıt cache'lenmez
+        ids = _scoreboard_ids(data)
+        with _game_ids_lock:
+            _game_ids_memo[d.strftime('%Y%m%d')] = (time.time(), ids)
+        if ids:
+            date_game_map[d] = ids
+    return date_game_map
+
+def iter_historical_boxscores(start_date, end_date, empty_games=None):
+    """
+    Belirtilen tarih aralığındaki maçların boxscore'larını GELDİKÇE üretir.
+    Final maçlar depodan okunur, eksik/canlı maçlar asyncio motoruyla çekilir.
+    empty_games listesi verilirse başarıyla çekilip oyuncu satırı çıkmayan
+    maçlar (ertelenen / iptal / başlamamış) oraya (game_id, is_final) olarak eklenir.
+    Yields: {"date": date, "game_id": id, "is_final": bool, "players": [...]}
     """
-    all_game_data = []
-    
     # Tarih listesi oluştur
     date_list = []
     curr = start_date
@@ -1231,53 +1102,103 @@ def get_historical_boxscores(start_date, end_date):
     print(f"Fetching data from {start_date} to {end_date} ({len(date_list)} days)")
 
     # 1. Adım: Tüm günlerin Game ID'lerini topla
-    # Threading ile çok daha hızlı
-    date_game_map = {} # {date: [game_ids]}
-    
-    def fetch_ids_for_date(d):
-        return d, get_game_ids(d)
+    date_game_map = resolve_game_dates(date_list)
 
-    with concurrent.futures.ThreadPoolExecutor(max_workers=10) as executor:
-        future_to_date = {executor.submit(fetch_ids_for_date, d): d for d in date_list}
-        for future in concurrent.futures.as_completed(future_to_date):
-            d, ids = future.result()
-            if ids:
-                date_game_map[d] = ids
-
-    # 2. Adım: Tüm Game ID'ler için Boxscore çek
-    all_game_ids = []
     game_id_to_date = {}
-    
     for d, ids in date_game_map.items():
         for gid in ids:
-            all_game_ids.append(gid)
             game_id_to_date[gid] = d
-            
-    # Boxscore'ları paralel çek
-    results = []
-    def fetch_box_with_date(gid):
-        return game_id_to_date[gid], get_boxscore(gid)
-
-    # İlerleme çubuğu (Streamlit context'inde ise)
-    total_games = len(all_game_ids)
-    if total_games == 0:
-        return []
 
-    # UI kilitlenmesin diye progress bar opsiyonel
-    # (Burada basitçe çekiyoruz)
-    
-    with concurrent.futures.ThreadPoolExecutor(max_workers=20) as executor:
-        future_to_game = {executor.submit(fetch_box_with_date, gid): gid for gid in all_game_ids}
-        
-        for future in concurrent.futures.as_completed(future_to_game):
-            try:
-                g_date, players = future.result()
-                if players:
-                    results.append({
-                        "date": g_date,
-                        "players": players
-                    })
-            except Exception as e:
-                print(f"Error fetching historical game: {e}")
+    if not game_id_to_date:
+        return
+
+    # 2. Adım: Final maçlar kalıcı depodan tek sorguda okunur
+    stored = game_store.load_final_boxscores(game_id_to_date.keys())
+    for gid, players in stored.items():
+        if players:
+            yield {"date": game_id_to_date[gid], "game_id": gid, "is_final": True, "players": players}
+
+    missing_ids = [gid for gid in game_id_to_date if str(gid) not in stored]
+    print(f"Store: {len(stored)} games from disk, {len(missing_ids)} to fetch")
+
+    # 3. Adım: Eksik/canlı maçlar - tek loop, sınırlı eşzamanlılık, geldikçe yield
+    requests_by_game = {gid: f"{SUMMARY_URL}?event={gid}" for gid in missing_ids}
+    # Toplama eksik maçla yapılmasın: sayfa bütçesi uygulanmaz (devre kesici uygulanır)
+    def downloaded():
+        for gid, status, body in bulk_fetch.iter_bytes(requests_by_game, use_budget=False):
+            if status != 200 or not body:
+                print(f"Error fetching historical game: {gid}")
+                continue
+            yield gid, body
+
+    # Parse: sadece gerekli alt ağaçlar, opsiyonel process pool
+    for gid, parsed in summary_parse.iter_parsed(downloaded()):
+        if parsed is None:
+            continue
+        players, is_final, _ = parsed
+        if not players and empty_games is not None:
+            empty_games.append((str(gid), is_final))
+
+        g_date = game_id_to_date[gid]
+        if players and is_final:
+            game_store.save_final_boxscore(gid, g_date, players)
+        if players:
+            yield {"date": g_date, "game_id": gid, "is_final": is_final, "players": players}
+
+def iter_boxscores(game_ids):
+    """
+    Verilen maçların boxscore'larını GELDİKÇE üretir: (game_id, players).
+    Final maçlar depodan okunur, diğerleri asyncio motoruyla (çağıranın
+    sayfa bütçesiyle) çekilir ve boxscore cache'ine yazılır. İsteği başarısız
+    olan maç get_cached_boxscore ile tekrar denenir (stale fallback dahil).
+    """
+    ids = [str(gid) for gid in game_ids]
+    stored = game_store.load_final_boxscores(ids)
+    for gid in ids:
+        if stored.get(gid):
+            yield gid, stored[gid]
+
+    requests_by_game = {gid: f"{SUMMARY_URL}?event={gid}" for gid in ids if not stored.get(gid)}
+    failed = []
+
+    def downloaded():
+        for gid, status, body in bulk_fetch.iter_bytes(requests_by_game):
+            if status != 200 or not body:
+                failed.append(gid)
+                continue
+            yield gid, body
+
+    for gid, parsed in summary_parse.iter_parsed(downloaded()):
+        if parsed is None:
+            failed.append(gid)
+            continue
+        players, is_final, header_date = parsed
+        if players and is_final:
+            game_store.save_final_boxscore(gid, header_date, players)
+            state = cache_policy.STATE_FINAL
+        else:
+            state = cache_policy.STATE_LIVE if players else cache_policy.STATE_SCHEDULED
+        key = ("boxscore", gid)
+        resilience.remember(key, (players, state))
+        cache_policy.get_or_fetch(key, lambda: (players, state), cache_policy.boxscore_state)
+        yield gid, players
+
+    for gid in failed:
+        yield gid, get_cached_boxscore(gid)
+
+def get_historical_boxscores(start_date, end_date):
+    """
+    Belirtilen tarih aralığındaki TÜM maçların boxscore'larını çeker.
+    iter_historical_boxscores() sonuçlarını liste olarak döndürür.
+    """
+    results = list(iter_historical_boxscores(start_date, end_date))
+
+    pool = http_client.get_pool_stats()
+    for host, info in pool["hosts"].items():
+        print(f"HTTP pool {host}: {info['requests']} requests over {info['connections_opened']} connections (reuse {info['reuse_ratio']:.0%})")
+    parse = summary_parse.get_stats()
+    if parse["games"]:
+        print(f"Summary parse ({parse['decoder']}, {parse['processes']} processes): {parse['games']} games, "
+              f"avg {parse['avg_kb']} KB / {parse['avg_parse_ms']} ms per game")
                 
-    return results
\ No newline at end of file
+    return results
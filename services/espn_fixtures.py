@@ -0,0 +1,118 @@
+import hashlib
+import json
+import os
+import threading
+from typing import Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+
+# =================================================================
+# ESPN FIXTURE KAYIT / OVERRIDE
+# =================================================================
+# - ESPN_API_OVERRIDE=http://127.0.0.1:8765 : tüm ESPN API host'ları
+#   yerel fixture sunucusuna yönlenir (http://127.0.0.1:8765/<host>/<path>)
+# - ESPN_RECORD_DIR=fixtures/espn : http_client / bulk_fetch üzerinden
+#   gelen başarılı ESPN yanıtları bu klasöre fixture olarak yazılır
+# Sunucu ve kayıt betiği: espn_fixture_server.py
+
+ESPN_API_OVERRIDE = os.environ.get("ESPN_API_OVERRIDE", "").rstrip("/")
+RECORD_DIR = os.environ.get("ESPN_RECORD_DIR", "")
+
+SITE_API_HOST = "site.api.espn.com"
+WEB_API_HOST = "site.web.api.espn.com"
+FANTASY_API_HOST = "lm-api-reads.fantasy.espn.com"
+FANTASY_WEB_HOST = "fantasy.espn.com"
+
+_write_lock = threading.Lock()
+_recorded = 0
+
+
+def api_base(host: str) -> str:
+    """Host için kök URL (override varsa yerel sunucu)."""
+    if ESPN_API_OVERRIDE:
+        return f"{ESPN_API_OVERRIDE}/{host}"
+    return f"https://{host}"
+
+
+# =================================================================
+# FIXTURE ANAHTARI
+# =================================================================
+
+def _query_pairs(query: str, params: Optional[Dict]):
+    pairs = parse_qsl(query, keep_blank_values=True)
+    for key, value in (params or {}).items():
+        if isinstance(value, (list, tuple)):
+            pairs.extend((key, str(v)) for v in value)
+        else:
+            pairs.append((key, str(value)))
+    return sorted((str(k), str(v)) for k, v in pairs)
+
+
+def fixture_key(host: str, path: str, query: str = "", params: Optional[Dict] = None) -> str:
+    """host + path + sıralı query -> fixture dosyasının göreli yolu."""
+    pairs = _query_pairs(query, params)
+    digest = hashlib.sha1(urlencode(pairs).encode("utf-8")).hexdigest()[:16]
+    clean_path = path.strip("/") or "_root"
+    return os.path.join(host, clean_path, f"{digest}.json")
+
+
+def split_url(url: str):
+    """URL -> (host, path, query). Override URL'lerinde ilk path parçası host'tur."""
+    parts = urlsplit(url)
+    host, path = parts.netloc, parts.path
+    if ESPN_API_OVERRIDE and url.startswith(ESPN_API_OVERRIDE):
+        host, _, path = path.lstrip("/").partition("/")
+        path = "/" + path
+    return host, path, parts.query
+
+
+# =================================================================
+# KAYIT
+# =================================================================
+
+def save(directory: str, host: str, path: str, query: str, params: Optional[Dict],
+         status: int, body: bytes) -> str:
+    relative = fixture_key(host, path, query, params)
+    target = os.path.join(directory, relative)
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    record = {
+        "host": host,
+        "path": path,
+        "query": _query_pairs(query, params),
+        "status": status,
+        "body": body.decode("utf-8", errors="replace"),
+    }
+    tmp = f"{target}.{threading.get_ident()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(record, f, ensure_ascii=False)
+    os.replace(tmp, target)
+    return relative
+
+
+def load(directory: str, host: str, path: str, query: str = "", params: Optional[Dict] = None) -> Optional[Dict]:
+    target = os.path.join(directory, fixture_key(host, path, query, params))
+    try:
+        with open(target, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def record(url: str, params: Optional[Dict], status: int, body: bytes):
+    """ESPN_RECORD_DIR açıksa başarılı ESPN yanıtını fixture olarak yazar."""
+    global _recorded
+    if not RECORD_DIR or status != 200 or not body:
+        return
+    host, path, query = split_url(url)
+    if not host.endswith("espn.com"):
+        return
+    try:
+        with _write_lock:
+            save(RECORD_DIR, host, path, query, params, status, body)
+            _recorded += 1
+    except OSError as e:
+        print(f"Fixture record error ({url}): {e}")
+
+
+def recorded_count() -> int:
+    return _recorded
@@ -0,0 +1,323 @@
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from services import game_store
+
+
+# =================================================================
+# MAÇ HEYECAN ENDEKSİ (play-by-play akışı + toplu skor)
+# =================================================================
+# Summary yanıtındaki "plays" listesi boxscore ile aynı parse'ta işlenir:
+# - lead_changes: liderlik değişimi (beraberlikten geçen değişimler dahil)
+# - ties: skor eşitliği sayısı
+# - largest_lead: maç içindeki en büyük fark (mutlak)
+# - late_margin: son 5 dakika + uzatmalarda görülen en büyük fark
+# - overtimes: uzatma sayısı (fikstür girişlerinde "Final/OT" bilgisi yok)
+# Final maçların akışı SQLite'a (game_flow) yazılır, canlılar bellekte tutulur.
+# score_frame(): calculate_game_score'un vektörel karşılığı (tarih aralığı
+# sıralaması için, ek istek yok)
+
+LATE_SECONDS = 300          # "Son dakikalar" penceresi (4. çeyrek)
+REGULATION_PERIODS = 4
+
+FLOW_FIELDS = ["lead_changes", "ties", "largest_lead", "late_margin", "overtimes"]
+
+_lock = threading.Lock()
+_schema_ready = False
+_live_flows: Dict[str, Dict] = {}       # bitmemiş maçlar: game_id -> akış
+
+
+# =================================================================
+# PLAY-BY-PLAY -> AKIŞ
+# =================================================================
+
+def _clock_seconds(value) -> float:
+    """'5:32' / '45.3' -> saniye."""
+    try:
+        text = str(value)
+        if ":" in text:
+            minutes, seconds = text.split(":", 1)
+            return int(minutes) * 60 + float(seconds)
+        return float(text)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def flow_from_plays(plays) -> Optional[Dict]:
+    """
+    Play listesinden skor akışını çıkarır.
+    Returns: {'lead_changes', 'ties', 'largest_lead', 'late_margin', 'overtimes'} ya da plays yoksa None
+    """
+    if not plays:
+        return None
+
+    home, away, periods, clocks = [], [], [], []
+    for play in plays:
+        try:
+            h = play["homeScore"]
+            a = play["awayScore"]
+        except (KeyError, TypeError):
+            continue
+        home.append(h)
+        away.append(a)
+        periods.append((play.get("period") or {}).get("number", 0))
+        clocks.append((play.get("clock") or {}).get("displayValue"))
+
+    if not home:
+        return None
+
+    margin = np.asarray(home, dtype=np.int64) - np.asarray(away, dtype=np.int64)
+    sign = np.sign(margin)
+
+    # Liderlik değişimi: sıfır olmayan işaretler arasındaki geçişler
+    leader = sign[sign != 0]
+    lead_changes = int(np.count_nonzero(leader[1:] != leader[:-1])) if len(leader) > 1 else 0
+
+    # Beraberlik: sıfır olmayan farktan sıfıra geçiş
+    previous = np.concatenate(([0], sign[:-1]))
+    ties = int(np.count_nonzero((sign == 0) & (previous != 0)))
+
+    abs_margin = np.abs(margin)
+    period = np.asarray(periods, dtype=np.int64)
+    seconds = np.array([_clock_seconds(c) for c in clocks], dtype=float)
+    late = (period > REGULATION_PERIODS) | ((period == REGULATION_PERIODS) & (seconds <= LATE_SECONDS))
+    late_margin = int(abs_margin[late].max()) if late.any() else int(abs_margin[-1])
+
+    return {
+        "lead_changes": lead_changes,
+        "ties": ties,
+        "largest_lead": int(abs_margin.max()),
+        "late_margin": late_margin,
+        "overtimes": max(int(period.max()) - REGULATION_PERIODS, 0),
+    }
+
+
+# =================================================================
+# AKIŞ DEPOSU
+# =================================================================
+
+def _get_connection():
+    global _schema_ready
+    conn = game_store.get_connection()
+    if not _schema_ready:
+        with _lock:
+            if not _schema_ready:
+                conn.executescript("""
+                    CREATE TABLE IF NOT EXISTS game_flow (
+                        game_id TEXT PRIMARY KEY,
+                        lead_changes INTEGER,
+                        ties INTEGER,
+                        largest_lead INTEGER,
+                        late_margin INTEGER,
+                        overtimes INTEGER,
+                        updated_at REAL
+                    );
+                """)
+                conn.commit()
+                _schema_ready = True
+    return conn
+
+
+def record_flow(game_id, flow: Optional[Dict], is_final: bool):
+    """Parse sonrası çağrılır: final maç depoya, canlı maç belleğe."""
+    if not flow:
+        return
+    game_id = str(game_id)
+    if not is_final:
+        with _lock:
+            _live_flows[game_id] = flow
+        return
+
+    try:
+        conn = _get_connection()
+        with _lock:
+            conn.execute(
+                f"INSERT OR REPLACE INTO game_flow (game_id, {', '.join(FLOW_FIELDS)}, updated_at) "
+                f"VALUES ({', '.join('?' * (len(FLOW_FIELDS) + 2))})",
+                (game_id, *(flow[f] for f in FLOW_FIELDS), time.time())
+            )
+            conn.commit()
+            _live_flows.pop(game_id, None)
+    except sqlite3.Error as e:
+        print(f"Flow store write error ({game_id}): {e}")
+
+
+def get_flows(game_ids: Iterable) -> Dict[str, Dict]:
+    """Bilinen maç akışları: {game_id: akış}. Akışı olmayan maçlar dönmez."""
+    ids = [str(g) for g in game_ids]
+    result = {}
+    with _lock:
+        for gid in ids:
+            if gid in _live_flows:
+                result[gid] = dict(_live_flows[gid])
+
+    missing = [gid for gid in ids if gid not in result]
+    if not missing:
+        return result
+    try:
+        conn = _get_connection()
+        for i in range(0, len(missing), 500):
+            chunk = missing[i:i + 500]
+            placeholders = ",".join("?" * len(chunk))
+            rows = conn.execute(
+                f"SELECT game_id, {', '.join(FLOW_FIELDS)} FROM game_flow WHERE game_id IN ({placeholders})",
+                chunk
+            ).fetchall()
+            for row in rows:
+                result[row[0]] = dict(zip(FLOW_FIELDS, row[1:]))
+    except sqlite3.Error as e:
+        print(f"Flow store read error: {e}")
+    return result
+
+
+# =================================================================
+# TOPLU (VEKTÖREL) SKOR
+# =================================================================
+
+def score_frame(df: pd.DataFrame) -> pd.Series:
+    """
+    calculate_game_score'un vektörel hali. Kolonlar: home_score, away_score,
+    status; opsiyonel: lead_changes, late_margin, overtimes, game_offensive_rating,
+    home/away_offensive_rating, home/away_defensive_rating.
+    Başlamamış maçlar NaN döner.
+    """
+    if df.empty:
+        return pd.Series(dtype=float, index=df.index)
+
+    def col(name):
+        if name in df:
+            return pd.to_numeric(df[name], errors="coerce").to_numpy(dtype=float)
+        return np.full(len(df), np.nan)
+
+    h = col("home_score")
+    a = col("away_score")
+    diff = np.abs(h - a)
+    total = h + a
+
+    score = np.full(len(df), 5.0)
+
+    # Fark faktörü
+    score += np.select(
+        [diff == 0, diff <= 3, diff <= 6, diff <= 10, diff <= 15, diff <= 20, diff <= 30],
+        [4.0, 3.5, 3.0, 2.0, 0.8, -0.5, -2.0],
+        default=-3.5
+    )
+
+    # Tempo
+    score += np.select(
+        [total > 260, total > 245, total > 230, total > 215, total < 200],
+        [1.5, 1.2, 0.8, 0.3, -0.8],
+        default=0.0
+    )
+
+    # Liderlik değişimleri (bilinmiyorsa etkisiz)
+    lead_changes = col("lead_changes")
+    score += np.select(
+        [np.isnan(lead_changes), lead_changes >= 20, lead_changes >= 15, lead_changes >= 10,
+         lead_changes >= 6, lead_changes >= 3],
+        [0.0, 2.5, 2.0, 1.5, 1.0, 0.5],
+        default=-0.5
+    )
+
+    # Son dakikalar farkı (bilinmiyorsa etkisiz)
+    late_margin = col("late_margin")
+    score += np.select(
+        [np.isnan(late_margin), late_margin <= 3, late_margin <= 5, late_margin > 15],
+        [0.0, 1.0, 0.5, -0.5],
+        default=0.0
+    )
+
+    # Offensive / defensive performans
+    home_ortg, away_ortg = col("home_offensive_rating"), col("away_offensive_rating")
+    with np.errstate(divide="ignore", invalid="ignore"):
+        estimated_ortg = total / (total / 2.2) * 100
+    actual_ortg = col("game_offensive_rating")
+    game_ortg = np.where(np.nan_to_num(actual_ortg) != 0, actual_ortg, estimated_ortg)
+    season_ortg = (home_ortg + away_ortg) / 2
+    has_ortg = (np.nan_to_num(home_ortg) != 0) & (np.nan_to_num(away_ortg) != 0)
+    performance = np.where(has_ortg, np.select(
+        [game_ortg > season_ortg + 5, game_ortg > season_ortg + 2, game_ortg < season_ortg - 5],
+        [1.0, 0.5, -0.8],
+        default=0.0
+    ), 0.0)
+
+    home_drtg, away_drtg = col("home_defensive_rating"), col("away_defensive_rating")
+    season_drtg = (home_drtg + away_drtg) / 2
+    has_drtg = (np.nan_to_num(home_drtg) != 0) & (np.nan_to_num(away_drtg) != 0)
+    performance = performance + np.where(has_drtg, np.select(
+        [(total < 210) & (season_drtg > 115), (total < 200) & (season_drtg > 113)],
+        [0.8, 0.5],
+        default=0.0
+    ), 0.0)
+    score += performance
+
+    # Uzatma
+    status = df["status"].fillna("").astype(str) if "status" in df else pd.Series("", index=df.index)
+    ot_count = np.fmax(status.str.count("OT").to_numpy(dtype=float), np.nan_to_num(col("overtimes")))
+    score += np.select([ot_count >= 2, ot_count == 1], [2.5, 1.5], default=0.0)
+
+    score = np.clip(score, 1.0, 10.0).round(1)
+    score[np.isnan(h) | np.isnan(a)] = np.nan
+    return pd.Series(score, index=df.index)
+
+
+def games_frame(games: List[Dict], team_ratings: Optional[Dict[str, Dict]] = None,
+                game_ratings: Optional[Dict[str, float]] = None) -> pd.DataFrame:
+    """
+    Scoreboard / fikstür girişlerini akış ve (varsa) takım rating'leriyle
+    birleştirip 'excitement' kolonu ekler.
+    team_ratings: {takım kısaltması: {'offensive_rating', 'defensive_rating'}}
+    game_ratings: {game_id: maçtaki ortalama ORtg}
+    """
+    if not games:
+        return pd.DataFrame()
+
+    df = pd.DataFrame(games)
+    df["game_id"] = df["game_id"].astype(str)
+
+    flows = get_flows(df["game_id"])
+    flow_df = pd.DataFrame.from_dict(flows, orient="index", columns=FLOW_FIELDS)
+    df = df.join(flow_df, on="game_id")
+
+    if team_ratings:
+        for side in ("home", "away"):
+            teams = df[f"{side}_team"]
+            for metric in ("offensive_rating", "defensive_rating"):
+                df[f"{side}_{metric}"] = teams.map(lambda t: (team_ratings.get(t) or {}).get(metric))
+
+    if game_ratings:
+        df["game_offensive_rating"] = df["game_id"].map(game_ratings)
+
+    df["excitement"] = score_frame(df)
+    return df
+
+
+def score_games(games: List[Dict], team_ratings: Optional[Dict[str, Dict]] = None,
+                game_ratings: Optional[Dict[str, float]] = None) -> Dict[str, float]:
+    """Günün maçları için {game_id: heyecan puanı} (başlamamış maçlar hariç)."""
+    df = games_frame(games, team_ratings, game_ratings)
+    if df.empty:
+        return {}
+    scored = df.dropna(subset=["excitement"])
+    return dict(zip(scored["game_id"], scored["excitement"]))
+
+
+def rank_games(games: List[Dict], limit: int = 10,
+               team_ratings: Optional[Dict[str, Dict]] = None,
+               game_ratings: Optional[Dict[str, float]] = None) -> pd.DataFrame:
+    """
+    Bitmiş maçları heyecan puanına göre sıralar ("tekrar izlenecek en iyi maçlar").
+    Eşitlikte liderlik değişimi fazla olan öne geçer.
+    """
+    df = games_frame([g for g in games if g.get("is_final", True)], team_ratings, game_ratings)
+    if df.empty:
+        return df
+    df = df.dropna(subset=["excitement"])
+    return (df.sort_values(["excitement", "lead_changes"], ascending=False, na_position="last")
+              .head(limit)
+              .reset_index(drop=True))
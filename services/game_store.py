@@ -0,0 +1,277 @@
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+import pandas as pd
+
+from services import boxscore_ingest
+
+
+# =================================================================
+# KALICI OYUNCU-MAÇ DEPOSU (SQLite)
+# =================================================================
+# Final olmuş maçların boxscore satırları diske bir kez yazılır ve
+# bir daha ESPN'den çekilmez. Canlı / başlamamış maçlar depoya girmez.
+
+STORE_PATH = os.environ.get(
+    "HOOPLIFE_STORE_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "hooplife_store.sqlite3")
+)
+
+# (boxscore key, sql column, sql type)
+PLAYER_GAME_COLUMNS = [
+    ("PLAYER", "player", "TEXT"),
+    ("TEAM", "team", "TEXT"),
+    ("MIN", "min", "TEXT"),
+    ("FG", "fg", "TEXT"),
+    ("3PT", "fg3", "TEXT"),
+    ("FT", "ft", "TEXT"),
+    ("OREB", "oreb", "INTEGER"),
+    ("DREB", "dreb", "INTEGER"),
+    ("REB", "reb", "INTEGER"),
+    ("AST", "ast", "INTEGER"),
+    ("STL", "stl", "INTEGER"),
+    ("BLK", "blk", "INTEGER"),
+    ("TO", "tov", "INTEGER"),
+    ("PF", "pf", "INTEGER"),
+    ("+/-", "plus_minus", "INTEGER"),
+    ("PTS", "pts", "INTEGER"),
+    ("FGM", "fgm", "INTEGER"),
+    ("FGA", "fga", "INTEGER"),
+    ("3Pts", "fg3m", "INTEGER"),
+    ("3PTA", "fg3a", "INTEGER"),
+    ("FTM", "ftm", "INTEGER"),
+    ("FTA", "fta", "INTEGER"),
+]
+
+_local = threading.local()
+_write_lock = threading.Lock()
+_schema_ready = False
+
+
+def _to_int(val):
+    try:
+        if val is None or val == "" or val == "--":
+            return None
+        return int(float(val))
+    except (ValueError, TypeError):
+        return None
+
+
+def get_connection():
+    """Thread başına tek SQLite bağlantısı döndürür (ilk çağrıda şemayı kurar)."""
+    global _schema_ready
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        os.makedirs(os.path.dirname(STORE_PATH), exist_ok=True)
+        conn = sqlite3.connect(STORE_PATH, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        _local.conn = conn
+
+    if not _schema_ready:
+        with _write_lock:
+            if not _schema_ready:
+                _create_schema(conn)
+                _schema_ready = True
+    return conn
+
+
+def _create_schema(conn):
+    stat_cols = ",\n".join(f"    {col} {sql_type}" for _, col, sql_type in PLAYER_GAME_COLUMNS)
+    conn.executescript(f"""
+        CREATE TABLE IF NOT EXISTS games (
+            game_id TEXT PRIMARY KEY,
+            game_date TEXT,
+            is_final INTEGER NOT NULL DEFAULT 0,
+            fetched_at REAL
+        );
+
+        CREATE TABLE IF NOT EXISTS player_games (
+            game_id TEXT NOT NULL,
+            athlete_id TEXT NOT NULL,
+            game_date TEXT,
+{stat_cols},
+            PRIMARY KEY (game_id, athlete_id)
+        );
+
+        CREATE INDEX IF NOT EXISTS idx_player_games_date ON player_games (game_date);
+    """)
+    conn.commit()
+
+
+def _row_to_player(row):
+    """SQLite satırını get_boxscore ile aynı formattaki dict'e çevirir."""
+    player = {}
+    for (key, _, _), val in zip(PLAYER_GAME_COLUMNS, row[1:]):
+        if val is not None:
+            player[key] = val
+    player["PLAYER_ID"] = row[0]
+    return player
+
+
+# =================================================================
+# OKUMA
+# =================================================================
+
+def get_final_game_ids(game_ids: Iterable) -> set:
+    """Verilen ID'lerden depoda final olarak kayıtlı olanları döndürür."""
+    ids = [str(g) for g in game_ids]
+    if not ids:
+        return set()
+    try:
+        conn = get_connection()
+        found = set()
+        # SQLite parametre limiti için parça parça sorgula
+        for i in range(0, len(ids), 500):
+            chunk = ids[i:i + 500]
+            placeholders = ",".join("?" * len(chunk))
+            rows = conn.execute(
+                f"SELECT game_id FROM games WHERE is_final = 1 AND game_id IN ({placeholders})",
+                chunk
+            ).fetchall()
+            found.update(r[0] for r in rows)
+        return found
+    except sqlite3.Error as e:
+        print(f"Store read error (get_final_game_ids): {e}")
+        return set()
+
+
+def load_final_boxscores(game_ids: Iterable) -> Dict[str, List[Dict]]:
+    """
+    Depodaki final maçların oyuncu satırlarını tek seferde okur.
+    Returns: {game_id: [player_dict, ...]} (sadece depoda olan maçlar)
+    """
+    final_ids = sorted(get_final_game_ids(game_ids))
+    if not final_ids:
+        return {}
+
+    select_cols = ", ".join(col for _, col, _ in PLAYER_GAME_COLUMNS)
+    result = {gid: [] for gid in final_ids}
+    try:
+        conn = get_connection()
+        for i in range(0, len(final_ids), 500):
+            chunk = final_ids[i:i + 500]
+            placeholders = ",".join("?" * len(chunk))
+            rows = conn.execute(
+                f"SELECT game_id, athlete_id, {select_cols} FROM player_games "
+                f"WHERE game_id IN ({placeholders}) ORDER BY rowid",
+                chunk
+            ).fetchall()
+            for row in rows:
+                result[row[0]].append(_row_to_player(row[1:]))
+    except sqlite3.Error as e:
+        print(f"Store read error (load_final_boxscores): {e}")
+        return {}
+
+    # Eski kayıtlarda MIN "34:12" gibi string olabilir - hepsi tek seferde tiplenir
+    flat = []
+    for gid, players in result.items():
+        for p in players:
+            p["_GAME_ID"] = gid
+            flat.append(p)
+    typed = boxscore_ingest.to_records(boxscore_ingest.ingest_players(flat))
+    result = {gid: [] for gid in final_ids}
+    for p in typed:
+        result[p.pop("_GAME_ID")].append(p)
+    return result
+
+
+def load_game_logs(game_ids: Iterable) -> pd.DataFrame:
+    """
+    Depodaki final maçların oyuncu satırları tek, tipli frame olarak
+    (boxscore kolonları + PLAYER_ID, GAME_ID, DATE). Depoda olmayan maçlar atlanır.
+    """
+    ids = [str(g) for g in game_ids]
+    select_cols = ", ".join(f'p.{col} AS "{key}"' for key, col, _ in PLAYER_GAME_COLUMNS)
+    frames = []
+    try:
+        conn = get_connection()
+        for i in range(0, len(ids), 500):
+            chunk = ids[i:i + 500]
+            placeholders = ",".join("?" * len(chunk))
+            frames.append(pd.read_sql_query(
+                f"SELECT p.game_id AS GAME_ID, p.athlete_id AS PLAYER_ID, g.game_date AS DATE, {select_cols} "
+                f"FROM player_games p JOIN games g ON g.game_id = p.game_id "
+                f"WHERE g.is_final = 1 AND p.game_id IN ({placeholders})",
+                conn, params=chunk
+            ))
+    except (sqlite3.Error, pd.errors.DatabaseError) as e:
+        print(f"Store read error (load_game_logs): {e}")
+        return pd.DataFrame()
+
+    if not frames:
+        return pd.DataFrame()
+    df = pd.concat(frames, ignore_index=True)
+    if df.empty:
+        return df
+    df = boxscore_ingest.ingest_frame(df)
+    df["DATE"] = pd.to_datetime(df["DATE"], errors="coerce")
+    return df
+
+
+def get_final_boxscore(game_id) -> Optional[List[Dict]]:
+    """Tek maç için depodaki satırları döndürür, maç depoda yoksa None."""
+    stored = load_final_boxscores([game_id])
+    return stored.get(str(game_id))
+
+
+# =================================================================
+# YAZMA
+# =================================================================
+
+def save_final_boxscore(game_id, game_date, players: List[Dict]) -> bool:
+    """
+    Final olmuş bir maçın oyuncu satırlarını depoya yazar.
+    Aynı maç tekrar yazılırsa eski satırların üzerine yazılır.
+    """
+    if not players:
+        return False
+
+    game_id = str(game_id)
+    date_str = game_date.strftime("%Y-%m-%d") if hasattr(game_date, "strftime") else (game_date or None)
+
+    rows = []
+    for p in players:
+        athlete_id = p.get("PLAYER_ID") or p.get("PLAYER")
+        if not athlete_id:
+            continue
+        values = []
+        for key, _, sql_type in PLAYER_GAME_COLUMNS:
+            val = p.get(key)
+            if sql_type == "INTEGER":
+                val = _to_int(val)
+            elif val is not None:
+                val = str(val)
+            values.append(val)
+        rows.append((game_id, str(athlete_id), date_str, *values))
+
+    if not rows:
+        return False
+
+    col_names = ", ".join(col for _, col, _ in PLAYER_GAME_COLUMNS)
+    placeholders = ", ".join("?" * (3 + len(PLAYER_GAME_COLUMNS)))
+    try:
+        conn = get_connection()
+        with _write_lock:
+            conn.execute("DELETE FROM player_games WHERE game_id = ?", (game_id,))
+            conn.executemany(
+                f"INSERT OR REPLACE INTO player_games (game_id, athlete_id, game_date, {col_names}) "
+                f"VALUES ({placeholders})",
+                rows
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO games (game_id, game_date, is_final, fetched_at) VALUES (?, ?, 1, ?)",
+                (game_id, date_str, time.time())
+            )
+            conn.commit()
+        return True
+    except sqlite3.Error as e:
+        print(f"Store write error ({game_id}): {e}")
+        try:
+            conn.rollback()
+        except sqlite3.Error:
+            pass
+        return False
@@ -0,0 +1,220 @@
+import random
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from services import espn_fixtures, resilience, single_flight
+
+
+# =================================================================
+# ORTAK HTTP İSTEMCİSİ (KEEP-ALIVE + CONNECTION POOL)
+# =================================================================
+# Tüm ESPN / Yahoo / RSS istekleri bu modülden geçer. Tek bir
+# requests.Session kullanıldığı için paralel isteklerde TCP/TLS
+# bağlantıları host başına havuzda tutulur ve tekrar kullanılır.
+
+# Havuz boyutu en büyük executor'a göre (boxscore/trends: 20-30 worker)
+POOL_CONNECTIONS = 16   # Farklı host sayısı için ayrılan havuz
+POOL_MAXSIZE = 32       # Host başına açık tutulan bağlantı
+
+DEFAULT_TIMEOUT = (5, 10)   # (connect, read) saniye
+DEFAULT_RETRIES = 2
+BACKOFF_BASE = 0.4          # saniye, her denemede 2 katına çıkar
+BACKOFF_MAX = 4.0
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
+    "Accept": "application/json, application/xml;q=0.9, */*;q=0.8",
+    "Accept-Encoding": "gzip, deflate",
+    "Connection": "keep-alive",
+}
+
+_session = None
+_session_lock = threading.Lock()
+
+_stats_lock = threading.Lock()
+_stats = {
+    "requests": 0,
+    "retries": 0,
+    "failures": 0,
+    "bytes": 0,
+}
+
+
+def _build_adapter():
+    # Retry mantığı get() içinde (jitter'lı backoff) - adapter tekrar denemez
+    return HTTPAdapter(
+        pool_connections=POOL_CONNECTIONS,
+        pool_maxsize=POOL_MAXSIZE,
+        max_retries=0,
+        pool_block=False,
+    )
+
+
+def mount_pools(session: requests.Session) -> requests.Session:
+    """Verilen session'a (örn. OAuth2Session) ortak havuz ayarlarını uygular."""
+    adapter = _build_adapter()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_session() -> requests.Session:
+    """Process genelinde paylaşılan Session'ı döndürür (lazy init)."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                session.headers.update(DEFAULT_HEADERS)
+                mount_pools(session)
+                _session = session
+    return _session
+
+
+def backoff_delay(attempt):
+    """Full-jitter exponential backoff."""
+    delay = min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt))
+    return random.uniform(delay / 2, delay)
+
+
+def _count(key, amount=1):
+    with _stats_lock:
+        _stats[key] += amount
+
+
+def get(url: str, params: Optional[Dict] = None, headers: Optional[Dict] = None,
+        timeout=DEFAULT_TIMEOUT, retries: int = DEFAULT_RETRIES,
+        session: Optional[requests.Session] = None,
+        coalesce: bool = False) -> requests.Response:
+    """
+    Havuzlu GET isteği.
+
+    Bağlantı hataları, timeout ve 429/5xx yanıtlarında jitter'lı backoff ile
+    tekrar dener. Denemeler biterse son yanıtı döndürür ya da son hatayı fırlatır.
+
+    coalesce=True: aynı URL + parametrelerle eşzamanlı gelen çağrılar (farklı
+    oturumlardan da olsa) tek istekte birleştirilir, yanıt paylaşılır.
+    """
+    if coalesce:
+        key = single_flight.make_key(url, params, headers)
+        return single_flight.do(key, lambda: get(url, params=params, headers=headers, timeout=timeout,
+                                                 retries=retries, session=session),
+                                wait=resilience.clip_wait(single_flight.DEFAULT_WAIT))
+
+    session = session or get_session()
+    endpoint = resilience.endpoint_of(url)
+    # Devre açıksa istek atılmaz; timeout'lar sayfa bütçesine kırpılır
+    resilience.check(endpoint)
+    last_exc = None
+    response = None
+
+    for attempt in range(retries + 1):
+        if attempt > 0:
+            delay = backoff_delay(attempt - 1)
+            left = resilience.remaining()
+            if left is not None and left <= delay:
+                break
+            _count("retries")
+            time.sleep(delay)
+
+        try:
+            request_timeout = resilience.clip_timeout(timeout)
+        except resilience.DeadlineExceeded as e:
+            last_exc = e
+            break
+
+        _count("requests")
+        try:
+            response = session.get(url, params=params, headers=headers, timeout=request_timeout)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            last_exc = e
+            response = None
+            continue
+
+        _count("bytes", len(response.content or b""))
+        if response.status_code in RETRY_STATUS and attempt < retries:
+            continue
+        break
+
+    if response is not None and response.status_code not in RETRY_STATUS:
+        resilience.record_success(endpoint)
+        espn_fixtures.record(url, params, response.status_code, response.content)
+        return response
+
+    _count("failures")
+    if response is None and (last_exc is None or isinstance(last_exc, resilience.DeadlineExceeded)):
+        # Bütçe bitti: ESPN'in hatası sayılmaz
+        resilience.release(endpoint)
+    else:
+        resilience.record_failure(endpoint, last_exc or response.status_code)
+    if response is not None:
+        return response
+    if last_exc is None:
+        last_exc = resilience.DeadlineExceeded("Page time budget exhausted")
+    raise last_exc
+
+
+def get_json(url: str, params: Optional[Dict] = None, headers: Optional[Dict] = None,
+             timeout=DEFAULT_TIMEOUT, retries: int = DEFAULT_RETRIES, coalesce: bool = False):
+    """GET + JSON parse. Hata durumunda exception fırlatır."""
+    response = get(url, params=params, headers=headers, timeout=timeout, retries=retries, coalesce=coalesce)
+    return response.json()
+
+
+# =================================================================
+# HAVUZ İSTATİSTİKLERİ
+# =================================================================
+
+def get_pool_stats() -> Dict:
+    """
+    Bağlantı tekrar kullanımını izlemek için havuz istatistikleri.
+
+    Returns:
+        {
+            'requests': ..., 'retries': ..., 'failures': ..., 'bytes': ...,
+            'hosts': {host: {'connections_opened': n, 'requests': m, 'reuse_ratio': r}}
+        }
+    """
+    with _stats_lock:
+        result = dict(_stats)
+
+    hosts = {}
+    session = _session
+    if session is not None:
+        seen = set()
+        for adapter in session.adapters.values():
+            if id(adapter) in seen:
+                continue
+            seen.add(id(adapter))
+            manager = getattr(adapter, "poolmanager", None)
+            if manager is None:
+                continue
+            for key in list(manager.pools.keys()):
+                pool = manager.pools.get(key)
+                if pool is None:
+                    continue
+                host = getattr(pool, "host", None) or urlparse(str(key)).netloc
+                opened = getattr(pool, "num_connections", 0)
+                served = getattr(pool, "num_requests", 0)
+                entry = hosts.setdefault(host, {"connections_opened": 0, "requests": 0})
+                entry["connections_opened"] += opened
+                entry["requests"] += served
+
+    for entry in hosts.values():
+        served = entry["requests"]
+        entry["reuse_ratio"] = round(1 - entry["connections_opened"] / served, 3) if served else 0.0
+
+    result["hosts"] = hosts
+    return result
+
+
+def reset_pool_stats():
+    with _stats_lock:
+        for key in _stats:
+            _stats[key] = 0
@@ -0,0 +1,356 @@
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Mapping, Optional
+
+import numpy as np
+import pandas as pd
+
+from services import (aggregation, cache_policy, espn_api, player_form, player_index, resilience, schedule_index,
+                      scoring, single_flight)
+
+
+# =================================================================
+# PERİYOT SNAPSHOT'LARI (TODAY / WEEK / MONTH / SEASON, PROCESS GENELİ)
+# =================================================================
+# render_tables'ın periyot tablosu (fetch + aggregation + roster eşleme +
+# format) her oturumda yeniden hesaplanmasın:
+# - Her periyodun ağırlıktan bağımsız temel tablosu veri yenilendiğinde
+#   bir kez kurulur ve tüm oturumlarla salt-okunur paylaşılır
+# - Aynı anda gelen oturumlar tek kurulumu bekler (single_flight)
+# - Kullanıcıya özel fantezi puanı, tablonun kopyası üzerinde hesaplanır;
+#   stat matrisi (scores) de snapshot'ta hazır durur, ağırlık değişince
+#   sadece çarpım tekrarlanır (fetch / aggregation / format yok)
+# - Takipçi BUILD_WAIT'i aşarsa kurulumu tekrarlamaz: önceki snapshot ya da
+#   boş "kuruluyor" snapshot'ı (building=True, cache'lenmez) döner
+# Snapshot: {'table', 'scores', 'mvp_df', 'logs', 'form', 'version', 'built_at', 'expires_at'}
+# - table: oyuncu başına satır (gösterime hazır), scores: scoring.ScoreBlock
+#   (yuvarlanmamış değerlerden), mvp_df: MVP/LVP girdisi,
+#   logs: (PLAYER_KEY, DATE) maç log tablosu (Week / Month, depo sezonu
+#   kapsıyorsa Season), yoksa None
+# - form: logs'tan son 5 / 10 / 15 maç formu (player_form), yoksa None
+# Paylaşılan frame'ler DEĞİŞTİRİLMEZ; değişiklik için .copy() alın.
+
+SEASON_YEAR = 2026                      # 2025-26 sezonu (byathlete endpoint'i)
+SEASON_START = datetime(2025, 10, 22)
+SEASON_TTL = 300                        # Sezon tablosu snapshot'ı (alt katman kendi cache'inde)
+BUILD_WAIT = 60                         # Takipçi oturumların kurulumu bekleme süresi (sn)
+TOP_K = 10                              # Top / Lowest tablolarının satır sayısı
+VIEWS_MAX = 64                          # Saklanan (periyot, veri, ağırlık) görünüm sayısı
+
+_lock = threading.Lock()
+_snapshots: Dict[str, Dict] = {}        # periyot -> snapshot (yeni versiyon eskisinin yerine geçer)
+_stats = {"hits": 0, "builds": 0, "build_waits": 0, "view_hits": 0, "view_builds": 0}
+_views: "OrderedDict[tuple, Dict]" = OrderedDict()     # LRU: sıralı görünümler
+
+
+# =================================================================
+# FORMAT
+# =================================================================
+
+def _format_shooting(df: pd.DataFrame):
+    def fmt(col):
+        return df[col].astype(float).map('{:.1f}'.format)
+
+    df['FG'] = fmt('FGM') + '/' + fmt('FGA')
+    df['3PT'] = fmt('3Pts') + '/' + fmt('3PTA')
+    df['FT'] = fmt('FTM') + '/' + fmt('FTA')
+
+
+def display_table(table: pd.DataFrame, period: str) -> pd.DataFrame:
+    """Ağırlıktan bağımsız gösterim formatı: tamsayı / 1 ondalık statlar, GP -> GAMES."""
+    if table.empty:
+        return table
+    table = table.copy()
+    if "+/-" in table.columns:
+        table["+/-"] = pd.to_numeric(table["+/-"], errors='coerce').fillna(0)
+
+    for col in ["PTS", "REB", "AST", "STL", "BLK", "TO", "+/-"]:
+        if col in table.columns:
+            if period == "Today":
+                table[col] = table[col].fillna(0).astype(int)
+            else:
+                table[col] = table[col].astype(float).round(1)
+
+    if period != "Today" and "GP" in table.columns:
+        table = table.rename(columns={"GP": "GAMES"})
+    return table
+
+
+# =================================================================
+# KURULUM
+# =================================================================
+
+def _build_season() -> Dict:
+    season_df = espn_api.get_nba_season_stats_official(season_year=SEASON_YEAR)
+    if season_df.empty:
+        return {"table": pd.DataFrame(), "mvp_df": pd.DataFrame(), "logs": None, "state": cache_policy.STATE_LIVE}
+
+    # Numeric copy + display string
+    season_df["MIN_INT"] = season_df["MIN"]
+    season_df["MIN"] = season_df["MIN"].map('{:.1f}'.format)
+
+    if "+/-" not in season_df.columns:
+        season_df["+/-"] = 0.0
+
+    _format_shooting(season_df)
+
+    # Current team / name from the athlete id index (no name matching)
+    try:
+        player_index.ensure_loaded()
+        season_df = player_index.apply_identity(season_df)
+        print(f"✓ {len(season_df)} player team and ID info updated")
+    except Exception as e:
+        print(f"⚠️ Error in roster matching: {e}")
+        if 'TEAM' not in season_df.columns:
+            season_df['TEAM'] = 'UNK'
+        season_df['PLAYER_ID'] = None
+
+    # DATE column for MVP/LVP
+    season_df["DATE"] = SEASON_START
+
+    # MVP/LVP: gerçek maç logları (depo sezonu kapsıyorsa), yoksa sezon toplamları
+    season_logs = espn_api.get_season_game_logs(SEASON_START.date(), datetime.now().date())
+
+    # Aynı loglardan modalın maç logu / formu (anahtar athlete id)
+    logs = None
+    if season_logs is not None and not season_logs.empty:
+        keys = pd.to_numeric(season_logs["PLAYER_ID"], errors="coerce")
+        known = keys.notna()
+        logs = aggregation.build_log_table(season_logs[known], keys[known].astype(np.int64), date_col="DATE")
+        season_df["PLAYER_KEY"] = pd.to_numeric(season_df["PLAYER_ID"], errors="coerce")
+
+    return {
+        "table": season_df,
+        "mvp_df": season_logs if season_logs is not None else season_df,
+        "logs": logs,
+        "state": None,
+    }
+
+
+def _build_today(today_df: pd.DataFrame) -> Dict:
+    table = today_df.copy()
+    table["DATE"] = datetime.now().date()
+
+    if "MIN_INT" not in table.columns:
+        table["MIN_INT"] = table["MIN"]
+        table["MIN"] = table["MIN"].round().astype(int).astype(str)
+
+    # ID fallback from the prebuilt index (per unique name)
+    if "PLAYER_ID" not in table.columns:
+        try:
+            player_index.ensure_loaded()
+            table["PLAYER_ID"] = player_index.id_column(player_index.resolve_ids(None, table["PLAYER"]))
+        except Exception:
+            table["PLAYER_ID"] = None
+
+    return {"table": table, "mvp_df": table, "logs": None, "state": None}
+
+
+def _build_range(start_date, end_date) -> Dict:
+    page = resilience.current_page()
+    stale_before = set(page.stale) if page else set()
+
+    historical_data = espn_api.get_historical_boxscores(start_date, end_date)
+    if not historical_data:
+        return {"table": pd.DataFrame(), "mvp_df": pd.DataFrame(), "logs": None, "state": cache_policy.STATE_LIVE}
+
+    # Columnar game frame + shared groupby engine keyed on athlete id
+    game_frame = aggregation.build_game_frame(historical_data)
+    table, logs = aggregation.aggregate_players(
+        game_frame,
+        min_game_minutes=0,
+        identity=True,
+        track_teams=True,
+        with_logs=True
+    )
+
+    if not table.empty:
+        table['MIN_INT'] = table['MIN']
+        table['MIN'] = table['MIN'].astype(int).astype(str)
+        _format_shooting(table)
+        print(f"✓ Period snapshot {start_date} - {end_date}: {len(table)} players, "
+              f"{table['PLAYER_ID'].notna().sum()} with IDs, {len(logs)} game logs")
+
+    # Bugünün maçları sürüyorsa (ya da bir kısmı stale geldiyse) snapshot kısa ömürlü
+    stale_now = set(page.stale) - stale_before if page else set()
+    todays_games = schedule_index.get_games(end_date) or []
+    if stale_now:
+        state = cache_policy.STATE_LIVE
+    elif todays_games:
+        state = cache_policy.scoreboard_state(todays_games)
+    else:
+        state = cache_policy.STATE_FINAL
+
+    return {
+        "table": table,
+        "mvp_df": logs.reset_index() if not logs.empty else pd.DataFrame(),
+        "logs": logs if not logs.empty else None,
+        "state": state,
+    }
+
+
+# =================================================================
+# SNAPSHOT YÖNETİMİ
+# =================================================================
+
+def _today_version(today_df: pd.DataFrame):
+    try:
+        return len(today_df), int(pd.util.hash_pandas_object(today_df, index=False).sum())
+    except TypeError:
+        return len(today_df), id(today_df)
+
+
+def _fresh(period: str, version) -> Optional[Dict]:
+    snapshot = _snapshots.get(period)
+    if snapshot is None or snapshot["version"] != version:
+        return None
+    if snapshot["expires_at"] is not None and snapshot["expires_at"] <= time.time():
+        return None
+    return snapshot
+
+
+def _get(period: str, version, build, default_ttl: Optional[float]) -> Dict:
+    with _lock:
+        snapshot = _fresh(period, version)
+        if snapshot:
+            _stats["hits"] += 1
+            return snapshot
+
+    def load():
+        with _lock:
+            snapshot = _fresh(period, version)
+            if snapshot:
+                return snapshot
+        snapshot = build()
+        state = snapshot.pop("state")
+        # Puan matrisi yuvarlanmamış değerlerden, tablo gösterim formatında
+        snapshot["scores"] = scoring.prepare(snapshot["table"])
+        snapshot["table"] = display_table(snapshot["table"], period)
+        snapshot["form"] = player_form.build_form(snapshot["logs"])
+        ttl = cache_policy.ttl_for_state(state) if state else default_ttl
+        now = time.time()
+        snapshot.update(version=version, built_at=now, expires_at=None if ttl is None else now + ttl)
+        with _lock:
+            _snapshots[period] = snapshot
+            _stats["builds"] += 1
+        return snapshot
+
+    def still_building():
+        # Takipçi kurulumu kendisi tekrarlamaz: periyodun önceki snapshot'ı,
+        # yoksa cache'lenmeyen boş "kuruluyor" snapshot'ı
+        with _lock:
+            _stats["build_waits"] += 1
+            previous = _snapshots.get(period)
+        return previous if previous is not None else _placeholder(building=True)
+
+    # Bekleme sayfa bütçesiyle kırpılmaz: bütçesi biten oturum da kurulumu tekrarlamaz
+    return single_flight.do(("period_snapshot", period, version), load,
+                            wait=BUILD_WAIT, on_timeout=still_building)
+
+
+def _placeholder(building: bool = False) -> Dict:
+    """Versiyonsuz boş snapshot (cache'lenmez)."""
+    return {"table": pd.DataFrame(), "scores": scoring.prepare(pd.DataFrame()), "mvp_df": pd.DataFrame(),
+            "logs": None, "form": None, "version": None, "built_at": None, "building": building}
+
+
+def get_snapshot(period: str, today_df: Optional[pd.DataFrame] = None, date_range=None) -> Dict:
+    """
+    Periyodun paylaşılan snapshot'ı.
+    Today: today_df (günün tipli oyuncu frame'i) içeriğine göre versiyonlanır.
+    This Week / This Month: date_range=(start, end); bugünün maç durumuna göre TTL.
+    Season: SEASON_TTL.
+    """
+    if period == "Today":
+        if today_df is None or today_df.empty:
+            return _placeholder()
+        return _get(period, _today_version(today_df), lambda: _build_today(today_df), None)
+    if period == "Season":
+        return _get(period, SEASON_YEAR, _build_season, SEASON_TTL)
+    start_date, end_date = date_range
+    return _get(period, (start_date, end_date), lambda: _build_range(start_date, end_date),
+                cache_policy.DEFAULT_TTL)
+
+
+# =================================================================
+# PUANLI / SIRALI GÖRÜNÜMLER
+# =================================================================
+# Aynı periyot + veri versiyonu + ağırlıklar için puanlı tablo, Top / Lowest
+# seçimi ve tam liste sırası bir kez hesaplanır (aynı ağırlıklı kullanıcılar
+# paylaşır). Top-k argpartition ile, tam sıra sadece tam liste için.
+
+def _top_k(values: np.ndarray, k: int, largest: bool) -> np.ndarray:
+    """values içinde en büyük / küçük k elemanın pozisyonları, sıralı (nlargest semantiği)."""
+    if len(values) == 0:
+        return np.array([], dtype=np.int64)
+    keyed = -values if largest else values
+    k = min(k, len(values))
+    part = np.argpartition(keyed, k - 1)[:k] if k < len(values) else np.arange(len(values))
+    return part[np.argsort(keyed[part], kind="stable")]
+
+
+def scored_views(period: str, snapshot: Dict, weights: Mapping, profiles: Optional[Mapping] = None,
+                 low_min_minutes: float = 20, k: int = TOP_K) -> Dict:
+    """
+    Snapshot tablosunun kullanıcı ağırlıklarıyla puanlanmış görünümleri:
+    {'table': puanlı tablo, 'top': ilk k, 'low': dakika filtreli son k,
+     'order': USER_SCORE'a göre azalan pozisyonlar (tam liste sayfaları için)}
+    Dönen frame'ler paylaşılır, değiştirilmez.
+    """
+    profiles = {"USER_SCORE": weights, **(profiles or {})}
+    # Versiyonsuz (boş) snapshot cache'lenmez
+    key = None
+    if snapshot.get("built_at") is not None:
+        key = (period, snapshot["version"], snapshot["built_at"], scoring.profiles_key(profiles),
+               low_min_minutes, k)
+    with _lock:
+        views = _views.get(key) if key is not None else None
+        if views is not None:
+            _views.move_to_end(key)
+            _stats["view_hits"] += 1
+            return views
+
+    scores = scoring.score_prepared(snapshot["scores"], profiles).round(2)
+    table = snapshot["table"].assign(**scores)
+    values = scores["USER_SCORE"].to_numpy() if len(scores.columns) else np.zeros(len(table))
+
+    # Lowest: yeterli dakika oynayanlar (azsa 5 dakikaya gevşer)
+    low_pool = np.arange(len(table))
+    if "MIN_INT" in table.columns:
+        minutes = pd.to_numeric(table["MIN_INT"], errors="coerce").fillna(0).to_numpy()
+        low_pool = np.flatnonzero(minutes >= low_min_minutes)
+        if len(low_pool) < 5:
+            low_pool = np.flatnonzero(minutes >= 5)
+
+    views = {
+        "table": table,
+        "top": table.iloc[_top_k(values, k, largest=True)],
+        "low": table.iloc[low_pool[_top_k(values[low_pool], k, largest=False)]],
+        "order": np.argsort(-values, kind="stable"),
+    }
+    if key is None:
+        return views
+    with _lock:
+        _views[key] = views
+        _stats["view_builds"] += 1
+        while len(_views) > VIEWS_MAX:
+            _views.popitem(last=False)
+    return views
+
+
+def page_of(views: Dict, page: int, page_size: int) -> pd.DataFrame:
+    """Tam listenin tek sayfası (sadece görünen satırlar), '#' sıra kolonuyla."""
+    start = max(page - 1, 0) * page_size
+    positions = views["order"][start:start + page_size]
+    rows = views["table"].iloc[positions].reset_index(drop=True)
+    rows.insert(0, "#", np.arange(start + 1, start + 1 + len(rows)))
+    return rows
+
+
+def get_stats() -> Dict:
+    with _lock:
+        result = dict(_stats)
+        result["periods"] = {p: round(time.time() - s["built_at"], 1) for p, s in _snapshots.items()}
+    return result
@@ -0,0 +1,123 @@
+from typing import Dict, Mapping, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from services import scoring
+
+
+# =================================================================
+# OYUNCU FORMU (SON 5 / 10 / 15 MAÇ, ÖNCEDEN HESAPLI)
+# =================================================================
+# Player Insights modalı formu tek satırlık ortalamadan değil maç
+# loglarından okur. Log tablosu değiştiğinde (periyot snapshot'ı
+# kurulurken) tüm oyuncular için bir kez, groupby ile hesaplanır:
+# - rolling: her maç satırında son N maçın hareketli ortalaması (grafik)
+# - mean / std / slope: oyuncu başına son N maçın ortalaması, standart
+#   sapması ve eğimi (maç başı değişim, en küçük kareler)
+# Modal sadece PLAYER_KEY ile dilim alır (player_form()). Fantezi puanı
+# stat'ların doğrusal birleşimi olduğundan ortalama / eğim / hareketli
+# ortalama hazır stat değerlerinden tek çarpımla bulunur.
+# Form frame'leri paylaşılır, DEĞİŞTİRİLMEZ.
+
+FORM_WINDOWS = (5, 10, 15)
+FORM_STATS = ['MIN', 'PTS', 'REB', 'AST', 'STL', 'BLK', 'TO',
+              'FGM', 'FGA', '3Pts', '3PTA', 'FTM', 'FTA', '+/-']
+
+
+def build_form(logs: Optional[pd.DataFrame], windows: Sequence[int] = FORM_WINDOWS) -> Optional[Dict]:
+    """
+    (PLAYER_KEY, DATE) log tablosu (aggregation.build_log_table) -> form tabloları:
+    {'windows', 'rolling': {N: logs ile aynı index'li hareketli ortalamalar},
+     'mean' / 'std' / 'slope': (PLAYER_KEY, WINDOW) index'li stat kolonları,
+     'games': (PLAYER_KEY, WINDOW) -> penceredeki maç sayısı}. Log yoksa None.
+    """
+    if logs is None or logs.empty:
+        return None
+
+    stats = [c for c in FORM_STATS if c in logs.columns]
+    values = pd.DataFrame(scoring.stat_matrix(logs, stats), index=logs.index, columns=stats)
+    keys = logs.index.get_level_values('PLAYER_KEY')
+    grouped = values.groupby(keys, sort=False)
+
+    # Hareketli ortalama: grup içi kümülatif toplam - N maç önceki toplam (log tablosu oyuncu/tarih sıralı)
+    cumulative = grouped.cumsum()
+    position = grouped.cumcount().to_numpy() + 1
+    rolling = {}
+    for window in windows:
+        before = cumulative.groupby(keys, sort=False).shift(window, fill_value=0.0)
+        rolling[window] = (cumulative - before).div(np.minimum(position, window), axis=0)
+
+    # Son N maç özeti: sondan sıra < N olan satırlar üzerinde tek groupby
+    from_end = grouped.cumcount(ascending=False).to_numpy()
+    frames = {"mean": [], "std": [], "slope": [], "games": []}
+    for window in windows:
+        mask = from_end < window
+        tail = values[mask]
+        tail_keys = keys[mask]
+        x = pd.Series(-from_end[mask].astype(float), index=tail.index)     # en son maç 0, öncekiler negatif
+        by_player = tail.groupby(tail_keys, sort=False)
+        n = by_player.size().astype(float)
+        sum_x = x.groupby(tail_keys, sort=False).sum()
+        sum_xx = (x * x).groupby(tail_keys, sort=False).sum()
+        sum_xy = tail.mul(x, axis=0).groupby(tail_keys, sort=False).sum()
+        denom = (n * sum_xx - sum_x ** 2).where(lambda d: d > 0)
+        slope = sum_xy.mul(n, axis=0).sub(by_player.sum().mul(sum_x, axis=0)).div(denom, axis=0).fillna(0.0)
+
+        frames["mean"].append(by_player.mean())
+        frames["std"].append(by_player.std().fillna(0.0))
+        frames["slope"].append(slope)
+        frames["games"].append(n.astype(int))
+
+    form = {"windows": tuple(windows), "rolling": rolling}
+    for name, parts in frames.items():
+        form[name] = pd.concat(parts, keys=list(windows), names=['WINDOW', 'PLAYER_KEY']) \
+            .swaplevel().sort_index()
+    return form
+
+
+def player_form(form: Optional[Dict], key, weights: Mapping,
+                logs: Optional[pd.DataFrame] = None) -> Optional[Dict]:
+    """
+    Tek oyuncunun formu (ağırlıklarla fantezi puanı dahil):
+    {'summary': pencere başına GAMES, FP, FP_STD, FP_TREND ve stat ortalamaları,
+     'chart': maç başı FP ve hareketli ortalamaları (DATE index'li)}.
+    FP_STD için oyuncunun son maç logları (logs) verilirse kullanılır.
+    Form / oyuncu yoksa None.
+    """
+    if form is None or key is None or key != key:
+        return None
+    key = int(key)
+    try:
+        mean = form["mean"].xs(key, level='PLAYER_KEY')
+    except KeyError:
+        return None
+
+    summary = pd.DataFrame(index=mean.index)
+    summary["GAMES"] = form["games"].xs(key, level='PLAYER_KEY')
+    summary["FP"] = scoring.score_frame(mean, weights)
+    summary["FP_TREND"] = scoring.score_frame(form["slope"].xs(key, level='PLAYER_KEY'), weights)
+    summary["FP_STD"] = 0.0
+
+    chart = pd.DataFrame()
+    history = None
+    if logs is not None:
+        try:
+            history = logs.xs(key, level='PLAYER_KEY')
+        except KeyError:
+            history = None
+    if history is not None and not history.empty:
+        # Varyans doğrusal değil: son maçların puanından (en fazla max(pencere) satır)
+        points = scoring.score_frame(history.iloc[-max(form["windows"]):], weights).to_numpy()
+        summary["FP_STD"] = [
+            float(np.std(points[-window:], ddof=1)) if min(window, len(points)) > 1 else 0.0
+            for window in summary.index
+        ]
+        chart = pd.DataFrame({"FP": scoring.score_frame(history, weights)})
+        for window, frame in form["rolling"].items():
+            chart[f"L{window}"] = scoring.score_frame(frame.xs(key, level='PLAYER_KEY'), weights)
+
+    for stat in ("MIN", "PTS", "REB", "AST"):
+        if stat in mean.columns:
+            summary[stat] = mean[stat]
+    return {"summary": summary, "chart": chart}
@@ -0,0 +1,157 @@
+import threading
+import time
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+
+# =================================================================
+# OYUNCU KİMLİK İNDEKSİ (ESPN athlete id)
+# =================================================================
+# Oyuncular isimle değil ESPN athlete id ile eşleştirilir.
+# - athlete id -> {'name', 'team', 'headshot'} (güncel roster'lardan)
+# - normalize isim -> athlete id: sadece ID'si olmayan satırlar için,
+#   indeks kurulurken BİR kez hesaplanır
+# Boxscore ve roster verisi ID'yi zaten taşıdığından satır başına isim
+# normalizasyonu / merge gerekmez.
+
+INDEX_TTL = 3600            # Roster'lar st.cache_data'da 24 saat; indeks saatlik yenilenir
+HEADSHOT_URL = "https://a.espncdn.com/i/headshots/nba/players/full/{}.png"
+
+_lock = threading.Lock()
+_by_id: Dict[int, Dict] = {}
+_id_by_name: Dict[str, int] = {}
+_built_at = 0.0
+
+
+def normalize_name(name):
+    """İsimleri karşılaştırma için normalize eder."""
+    if not name:
+        return ""
+    return name.replace(".", "").replace("'", "").replace("-", " ").lower().strip()
+
+
+def to_id(value) -> Optional[int]:
+    """'3945274' / 3945274 / 3945274.0 -> 3945274, geçersizse None."""
+    try:
+        athlete_id = int(value)
+    except (TypeError, ValueError):
+        return None
+    return athlete_id if athlete_id > 0 else None
+
+
+def headshot_url(athlete_id) -> Optional[str]:
+    athlete_id = to_id(athlete_id)
+    if athlete_id is None:
+        return None
+    info = _by_id.get(athlete_id)
+    return (info and info.get("headshot")) or HEADSHOT_URL.format(athlete_id)
+
+
+# =================================================================
+# İNDEKS KURULUMU
+# =================================================================
+
+def build(rosters: Optional[Dict]):
+    """get_current_team_rosters() çıktısından ({isim: {'team','id','headshot'}}) indeksi kurar."""
+    global _built_at
+    by_id, id_by_name = {}, {}
+    for name, info in (rosters or {}).items():
+        if not isinstance(info, dict):
+            continue
+        athlete_id = to_id(info.get("id"))
+        if athlete_id is None:
+            continue
+        by_id[athlete_id] = {
+            "name": name,
+            "team": info.get("team"),
+            "headshot": info.get("headshot") or HEADSHOT_URL.format(athlete_id),
+        }
+        id_by_name[normalize_name(name)] = athlete_id
+
+    with _lock:
+        _by_id.clear()
+        _by_id.update(by_id)
+        _id_by_name.clear()
+        _id_by_name.update(id_by_name)
+        _built_at = time.time()
+    print(f"Player index: {len(by_id)} players")
+
+
+def ensure_loaded() -> bool:
+    """İndeks yoksa / eskimişse güncel roster'lardan kurar."""
+    if _by_id and time.time() - _built_at < INDEX_TTL:
+        return True
+    from services.espn_api import get_current_team_rosters
+
+    try:
+        rosters = get_current_team_rosters()
+    except Exception as e:
+        print(f"Player index: roster fetch failed: {e}")
+        return bool(_by_id)
+    if rosters:
+        build(rosters)
+    return bool(_by_id)
+
+
+def get_player(athlete_id) -> Optional[Dict]:
+    athlete_id = to_id(athlete_id)
+    return _by_id.get(athlete_id) if athlete_id is not None else None
+
+
+def id_for_name(name) -> Optional[int]:
+    return _id_by_name.get(normalize_name(name))
+
+
+# =================================================================
+# VEKTÖREL EŞLEŞTİRME
+# =================================================================
+
+def resolve_ids(ids: Optional[pd.Series], names: pd.Series) -> pd.Series:
+    """
+    Satır başına int64 athlete id serisi (bulunamayan -> NaN).
+    ID kolonu varsa doğrudan kullanılır; ID'si olmayan satırlar için isim
+    fallback'i satır başına değil, tekil isim başına yapılır.
+    """
+    if ids is None:
+        resolved = pd.Series(np.nan, index=names.index)
+    else:
+        resolved = pd.to_numeric(ids, errors="coerce")
+        resolved = resolved.where(resolved > 0)
+
+    missing = resolved.isna() & names.notna()
+    if missing.any() and _id_by_name:
+        fallback = {n: _id_by_name.get(normalize_name(n)) for n in names[missing].unique()}
+        resolved = resolved.fillna(names.map(fallback).astype(float))
+    return resolved
+
+
+def id_column(ids: pd.Series) -> pd.Series:
+    """Sayısal ID serisini gösterim kolonuna çevirir (python int / None, object dtype)."""
+    values = [int(v) if v == v and v > 0 else None for v in ids.to_numpy()]
+    return pd.Series(values, index=ids.index, dtype=object)
+
+
+def apply_identity(df: pd.DataFrame, id_col: str = "PLAYER_ID") -> pd.DataFrame:
+    """
+    Oyuncu başına frame'de PLAYER / TEAM / PLAYER_ID'yi indeksten günceller.
+    İndekste olmayan oyuncular olduğu gibi kalır.
+    """
+    if df.empty:
+        return df
+    ids = resolve_ids(df[id_col] if id_col in df.columns else None, df["PLAYER"])
+    df = df.copy()
+    df[id_col] = id_column(ids)
+    if not _by_id:
+        return df
+
+    known = {i: _by_id[i] for i in ids.dropna().astype(np.int64).unique() if i in _by_id}
+    names = ids.map({i: info["name"] for i, info in known.items()})
+    teams = ids.map({i: info["team"] for i, info in known.items()})
+    df["PLAYER"] = names.where(names.notna(), df["PLAYER"])
+    if "TEAM" in df.columns:
+        df["TEAM"] = teams.where(teams.notna(), df["TEAM"])
+    else:
+        df["TEAM"] = teams
+    return df
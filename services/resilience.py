@@ -0,0 +1,248 @@
+import re
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Callable, Dict, Hashable, Optional
+from urllib.parse import urlsplit
+
+import requests
+
+
+# =================================================================
+# CIRCUIT BREAKER + SAYFA SÜRE BÜTÇESİ + ESKİ VERİ FALLBACK'İ
+# =================================================================
+# ESPN yavaşladığında her istek timeout'unu sonuna kadar beklemesin:
+# - Endpoint başına circuit breaker: art arda hatalardan sonra devre
+#   açılır, OPEN_SECONDS boyunca istek atılmaz, sonra tek deneme (half-open)
+# - Sayfa başına süre bütçesi: page_budget() içindeki tüm istekler
+#   toplamda bu süreyi aşamaz (timeout'lar kalan süreye kırpılır)
+# - Hata / açık devre durumunda son başarılı değer "stale" olarak döner;
+#   boş / hatalı sonuç hiçbir cache'e yazılmaz
+
+FAILURE_THRESHOLD = 5       # Devreyi açan art arda hata sayısı
+OPEN_SECONDS = 30           # Açık devrenin yeniden denemeye kadar bekleme süresi
+LAST_GOOD_MAX = 2048        # Saklanan son başarılı değer sayısı
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+
+class ServiceUnavailable(requests.exceptions.RequestException):
+    """İstek hiç atılmadı (devre açık ya da süre bütçesi bitti)."""
+
+
+class CircuitOpenError(ServiceUnavailable):
+    pass
+
+
+class DeadlineExceeded(ServiceUnavailable):
+    pass
+
+
+class EmptyResult(Exception):
+    """Cache'lenmemesi gereken boş sonuç (st.cache_data exception'ları cache'lemez)."""
+
+
+_lock = threading.Lock()
+_breakers: Dict[str, Dict] = {}
+_last_good: "OrderedDict[Hashable, tuple]" = OrderedDict()    # key -> (value, saved_at)
+_local = threading.local()
+
+
+# =================================================================
+# CIRCUIT BREAKER
+# =================================================================
+
+def endpoint_of(url: str) -> str:
+    """URL -> breaker adı. Sayısal path parçaları birleşir (teams/13/roster -> teams/*/roster)."""
+    parts = urlsplit(url)
+    path = re.sub(r"/\d+(?=/|$)", "/*", parts.path)
+    return f"{parts.netloc}{path}"
+
+
+def _breaker(endpoint: str) -> Dict:
+    return _breakers.setdefault(endpoint, {
+        "state": STATE_CLOSED,
+        "failures": 0,
+        "opened_at": 0.0,
+        "probing": False,
+        "last_error": None,
+    })
+
+
+def allow(endpoint: str) -> bool:
+    """İstek atılabilir mi? Açık devrede süre dolduysa tek bir deneme isteğine izin verir."""
+    with _lock:
+        b = _breaker(endpoint)
+        if b["state"] == STATE_CLOSED:
+            return True
+        if b["state"] == STATE_OPEN and time.time() - b["opened_at"] >= OPEN_SECONDS:
+            b["state"] = STATE_HALF_OPEN
+            b["probing"] = False
+        if b["state"] == STATE_HALF_OPEN and not b["probing"]:
+            b["probing"] = True
+            return True
+        return False
+
+
+def check(endpoint: str):
+    if not allow(endpoint):
+        raise CircuitOpenError(f"Circuit open: {endpoint}")
+
+
+def record_success(endpoint: str):
+    with _lock:
+        b = _breaker(endpoint)
+        b.update(state=STATE_CLOSED, failures=0, probing=False)
+
+
+def record_failure(endpoint: str, error=None):
+    with _lock:
+        b = _breaker(endpoint)
+        b["failures"] += 1
+        b["probing"] = False
+        b["last_error"] = str(error) if error else None
+        if b["state"] == STATE_HALF_OPEN or b["failures"] >= FAILURE_THRESHOLD:
+            if b["state"] != STATE_OPEN:
+                print(f"Circuit opened: {endpoint} ({b['failures']} failures)")
+            b["state"] = STATE_OPEN
+            b["opened_at"] = time.time()
+
+
+def release(endpoint: str):
+    """Sonuçsuz biten (örn. bütçe aşımı) deneme isteğinin kilidini bırakır."""
+    with _lock:
+        _breaker(endpoint)["probing"] = False
+
+
+def get_breakers() -> Dict[str, Dict]:
+    with _lock:
+        return {name: {k: v for k, v in b.items() if k != "probing"} for name, b in _breakers.items()}
+
+
+def open_endpoints():
+    with _lock:
+        return sorted(name for name, b in _breakers.items() if b["state"] != STATE_CLOSED)
+
+
+# =================================================================
+# SAYFA SÜRE BÜTÇESİ (thread başına)
+# =================================================================
+
+class PageStatus:
+    """Bir sayfa çiziminde eski veriyle cevaplanan key'ler: {key: saved_at}."""
+
+    def __init__(self, deadline: float):
+        self.deadline = deadline
+        self.stale: Dict[Hashable, float] = {}
+
+
+@contextmanager
+def page_budget(seconds: float):
+    """Bu blok içindeki (aynı thread) istekler toplam `seconds` süreyi aşamaz."""
+    previous = getattr(_local, "page", None)
+    page = PageStatus(time.time() + seconds)
+    if previous is not None:
+        page.deadline = min(page.deadline, previous.deadline)
+    _local.page = page
+    try:
+        yield page
+    finally:
+        _local.page = previous
+
+
+def current_page() -> Optional[PageStatus]:
+    return getattr(_local, "page", None)
+
+
+@contextmanager
+def use_page(page: Optional[PageStatus]):
+    """Başka bir thread'in sayfa bütçesini (ve stale kaydını) bu thread'e taşır."""
+    previous = getattr(_local, "page", None)
+    _local.page = page
+    try:
+        yield page
+    finally:
+        _local.page = previous
+
+
+def remaining() -> Optional[float]:
+    """Aktif bütçeden kalan süre (bütçe yoksa None)."""
+    page = getattr(_local, "page", None)
+    if page is None:
+        return None
+    return page.deadline - time.time()
+
+
+def clip_wait(seconds: float) -> float:
+    """Bekleme süresini (örn. single-flight takipçisi) kalan bütçeye kırpar."""
+    left = remaining()
+    return seconds if left is None else max(0.0, min(seconds, left))
+
+
+def clip_timeout(timeout):
+    """Timeout'u (tek sayı ya da (connect, read)) kalan bütçeye kırpar."""
+    left = remaining()
+    if left is None:
+        return timeout
+    if left <= 0:
+        raise DeadlineExceeded("Page time budget exhausted")
+    if isinstance(timeout, tuple):
+        return tuple(min(t, left) if t is not None else left for t in timeout)
+    return min(timeout, left) if timeout is not None else left
+
+
+# =================================================================
+# SON BAŞARILI DEĞER (STALE FALLBACK)
+# =================================================================
+
+def _snapshot(value):
+    # Stale değer servis edilirken kopyalanır: çağıranın eklediği kolonlar saklanan değere yansımasın
+    if hasattr(value, "copy") and not isinstance(value, (str, bytes)):
+        return value.copy()
+    return value
+
+
+def remember(key: Hashable, value):
+    """Referansı saklar (kopya yok: sıcak yolda çoğu değer zaten cache isabeti)."""
+    with _lock:
+        _last_good[key] = (value, time.time())
+        _last_good.move_to_end(key)
+        while len(_last_good) > LAST_GOOD_MAX:
+            _last_good.popitem(last=False)
+
+
+def last_good(key: Hashable) -> Optional[tuple]:
+    with _lock:
+        return _last_good.get(key)
+
+
+def require(value):
+    """Boş sonucu EmptyResult'a çevirir (cache'li fonksiyonların içinde kullanılır)."""
+    if value is None or (hasattr(value, "empty") and value.empty) or (not hasattr(value, "empty") and not value):
+        raise EmptyResult()
+    return value
+
+
+def call_with_fallback(key: Hashable, fetch: Callable, default=None):
+    """
+    fetch() başarılıysa sonucu saklayıp döndürür. Hata / açık devre / bütçe
+    aşımında son başarılı değeri (stale) döndürür, o da yoksa default.
+    """
+    try:
+        value = fetch()
+    except Exception as e:
+        if not isinstance(e, (ServiceUnavailable, EmptyResult)):
+            print(f"Fetch failed ({key}): {e}")
+        entry = last_good(key)
+        if entry is None:
+            return default
+        page = getattr(_local, "page", None)
+        if page is not None:
+            page.stale[key] = entry[1]
+        return _snapshot(entry[0])
+
+    remember(key, value)
+    return value
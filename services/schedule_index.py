@@ -0,0 +1,378 @@
+import bisect
+import sqlite3
+import threading
+import time
+from datetime import date as date_cls, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from services import bulk_fetch, game_store, single_flight
+
+
+# =================================================================
+# SEZON FİKSTÜR İNDEKSİ
+# =================================================================
+# Gün gün scoreboard yoklamak yerine sezonun tüm tarih -> maç
+# eşlemesi birkaç aralık isteğiyle (dates=YYYYMMDD-YYYYMMDD) çekilir,
+# SQLite'a yazılır ve bellekte {gün: [maç]} olarak tutulur.
+# - Tarih -> maç listesi: dict lookup
+# - "Maç olan son gün": sıralı gün listesinde bisect
+# - Sadece bugünün (ve bitmemiş dünün) girişleri sık yenilenir
+
+SEASON_TTL = 86400          # Tüm sezon günde bir yenilenir
+LIVE_DAY_TTL = 300          # Bugünün girişleri 5 dakikada bir
+RANGE_CHUNK_DAYS = 31       # Aralık isteği başına gün sayısı
+RANGE_LIMIT = 1000          # ESPN scoreboard limit parametresi
+LOAD_WAIT = 60              # Eşzamanlı oturumların sezon yüklemesini bekleme süresi (sn)
+
+_lock = threading.Lock()
+_schema_ready = False
+
+_games_by_day: Dict[str, List[Dict]] = {}
+_game_days: List[str] = []              # sıralı, maç olan günler
+_season_loaded_at: Dict[int, float] = {}
+_day_refreshed_at: Dict[str, float] = {}
+
+
+# =================================================================
+# YARDIMCI
+# =================================================================
+
+def _day_str(d) -> str:
+    return d.strftime("%Y-%m-%d") if hasattr(d, "strftime") else str(d)[:10]
+
+
+def season_of(d) -> int:
+    """Tarihin ait olduğu sezonun başlangıç yılı (Ağustos sonrası yeni sezon)."""
+    return d.year if d.month >= 8 else d.year - 1
+
+
+def season_bounds(season: int) -> Tuple[date_cls, date_cls]:
+    """Sezon aralığı: 1 Ekim - 30 Haziran (preseason + playoff dahil)."""
+    return date_cls(season, 10, 1), date_cls(season + 1, 6, 30)
+
+
+def game_day(raw) -> Optional[date_cls]:
+    """ESPN'in UTC maç zamanını ("2025-01-11T00:30Z") ABD doğu saatine göre maç gününe çevirir."""
+    try:
+        utc = datetime.strptime((raw or "")[:16], "%Y-%m-%dT%H:%M")
+    except ValueError:
+        return None
+    # Akşam maçları UTC'de ertesi güne düşer
+    return (utc - timedelta(hours=5)).date()
+
+
+def _event_day(event) -> Optional[str]:
+    day = game_day(event.get("date"))
+    return day.strftime("%Y-%m-%d") if day else None
+
+
+def _parse_event(event) -> Optional[Dict]:
+    try:
+        comp = event["competitions"][0]
+        home = next(c for c in comp["competitors"] if c["homeAway"] == "home")
+        away = next(c for c in comp["competitors"] if c["homeAway"] == "away")
+        status_type = comp["status"]["type"]
+    except (KeyError, IndexError, StopIteration, TypeError):
+        return None
+
+    day = _event_day(event)
+    if not day or "id" not in event:
+        return None
+
+    return {
+        "game_id": str(event["id"]),
+        "game_date": day,
+        "state": status_type.get("state", ""),
+        "is_final": bool(status_type.get("completed")) or status_type.get("state") == "post",
+        "status": status_type.get("description", ""),
+        "home_team": home["team"]["abbreviation"],
+        "away_team": away["team"]["abbreviation"],
+        "home_score": home.get("score", "0"),
+        "away_score": away.get("score", "0"),
+    }
+
+
+# =================================================================
+# KALICI DEPO
+# =================================================================
+
+SCHEDULE_FIELDS = ["game_id", "game_date", "state", "is_final", "status",
+                   "home_team", "away_team", "home_score", "away_score"]
+
+
+def _get_connection():
+    global _schema_ready
+    conn = game_store.get_connection()
+    if not _schema_ready:
+        with _lock:
+            if not _schema_ready:
+                conn.executescript("""
+                    CREATE TABLE IF NOT EXISTS schedule (
+                        game_id TEXT PRIMARY KEY,
+                        season INTEGER NOT NULL,
+                        game_date TEXT NOT NULL,
+                        state TEXT,
+                        is_final INTEGER NOT NULL DEFAULT 0,
+                        status TEXT,
+                        home_team TEXT,
+                        away_team TEXT,
+                        home_score TEXT,
+                        away_score TEXT,
+                        updated_at REAL
+                    );
+
+                    CREATE INDEX IF NOT EXISTS idx_schedule_date ON schedule (game_date);
+
+                    CREATE TABLE IF NOT EXISTS schedule_seasons (
+                        season INTEGER PRIMARY KEY,
+                        loaded_at REAL
+                    );
+                """)
+                conn.commit()
+                _schema_ready = True
+    return conn
+
+
+def _save_entries(season: int, entries: List[Dict], replace_days: Iterable[str] = (), full_season=False):
+    """Girişleri yazar; replace_days içindeki günlerin eski kayıtları silinir."""
+    now = time.time()
+    rows = [(e["game_id"], season, *[e[f] for f in SCHEDULE_FIELDS[1:]], now) for e in entries]
+    try:
+        conn = _get_connection()
+        with _lock:
+            if full_season:
+                conn.execute("DELETE FROM schedule WHERE season = ?", (season,))
+            for day in replace_days:
+                conn.execute("DELETE FROM schedule WHERE game_date = ?", (day,))
+            conn.executemany(
+                f"INSERT OR REPLACE INTO schedule (game_id, season, {', '.join(SCHEDULE_FIELDS[1:])}, updated_at) "
+                f"VALUES ({', '.join('?' * (len(SCHEDULE_FIELDS) + 2))})",
+                rows
+            )
+            if full_season:
+                conn.execute("INSERT OR REPLACE INTO schedule_seasons (season, loaded_at) VALUES (?, ?)", (season, now))
+            conn.commit()
+    except sqlite3.Error as e:
+        print(f"Schedule write error: {e}")
+
+
+def _load_stored_season(season: int) -> Optional[Tuple[float, List[Dict]]]:
+    try:
+        conn = _get_connection()
+        meta = conn.execute("SELECT loaded_at FROM schedule_seasons WHERE season = ?", (season,)).fetchone()
+        if not meta:
+            return None
+        rows = conn.execute(
+            f"SELECT {', '.join(SCHEDULE_FIELDS)} FROM schedule WHERE season = ?", (season,)
+        ).fetchall()
+    except sqlite3.Error as e:
+        print(f"Schedule read error: {e}")
+        return None
+    entries = []
+    for row in rows:
+        entry = dict(zip(SCHEDULE_FIELDS, row))
+        entry["is_final"] = bool(entry["is_final"])
+        entries.append(entry)
+    return meta[0], entries
+
+
+# =================================================================
+# ESPN ARALIK İSTEKLERİ
+# =================================================================
+
+def _scoreboard_url():
+    from services.espn_api import SCOREBOARD_URL
+    return SCOREBOARD_URL
+
+
+def _fetch_range(start: date_cls, end: date_cls) -> Optional[List[Dict]]:
+    """[start, end] aralığını RANGE_CHUNK_DAYS'lik parçalarla çeker. Hata -> None."""
+    url = _scoreboard_url()
+    requests_by_chunk = {}
+    chunk_start = start
+    while chunk_start <= end:
+        chunk_end = min(end, chunk_start + timedelta(days=RANGE_CHUNK_DAYS - 1))
+        key = (chunk_start, chunk_end)
+        requests_by_chunk[key] = (url, {
+            "dates": f"{chunk_start.strftime('%Y%m%d')}-{chunk_end.strftime('%Y%m%d')}",
+            "limit": RANGE_LIMIT,
+        })
+        chunk_start = chunk_end + timedelta(days=1)
+
+    entries = []
+    for key, data in bulk_fetch.fetch_all_json(requests_by_chunk).items():
+        if data is None:
+            print(f"Schedule range fetch failed: {key[0]} - {key[1]}")
+            return None
+        for event in data.get("events", []):
+            entry = _parse_event(event)
+            if entry:
+                entries.append(entry)
+    return entries
+
+
+def _fetch_day(day: str) -> Optional[List[Dict]]:
+    data = bulk_fetch.fetch_all_json({day: (_scoreboard_url(), {"dates": day.replace("-", "")})}).get(day)
+    if data is None:
+        return None
+    entries = [_parse_event(e) for e in data.get("events", [])]
+    return [e for e in entries if e and e["game_date"] == day]
+
+
+# =================================================================
+# BELLEK İNDEKSİ
+# =================================================================
+
+def _rebuild_index_locked(season: int, entries: List[Dict]):
+    start, end = season_bounds(season)
+    start_s, end_s = _day_str(start), _day_str(end)
+    for day in [d for d in _games_by_day if start_s <= d <= end_s]:
+        del _games_by_day[day]
+    for entry in entries:
+        _games_by_day.setdefault(entry["game_date"], []).append(entry)
+    _game_days[:] = sorted(_games_by_day)
+
+
+def _replace_day_locked(day: str, entries: List[Dict]):
+    if entries:
+        _games_by_day[day] = entries
+    else:
+        _games_by_day.pop(day, None)
+    _game_days[:] = sorted(_games_by_day)
+
+
+def _season_fresh(season: int) -> bool:
+    loaded_at = _season_loaded_at.get(season)
+    return bool(loaded_at) and time.time() - loaded_at < SEASON_TTL
+
+
+def ensure_season(d) -> bool:
+    """
+    Tarihin sezonu bellekte yoksa / eskimişse depodan ya da ESPN'den yükler.
+    Eşzamanlı oturumlar tek yüklemeyi bekler (single_flight); bekleme aşılırsa
+    yükleme tekrarlanmaz, eldeki indeks kullanılır.
+    """
+    season = season_of(d)
+    if _season_fresh(season):
+        return True
+    return single_flight.do(("schedule_season", season), lambda: _load_season(season),
+                            wait=LOAD_WAIT, on_timeout=lambda: season in _season_loaded_at)
+
+
+def _load_season(season: int) -> bool:
+    # Lider beklerken başka bir uçuş sezonu yüklemiş olabilir
+    if _season_fresh(season):
+        return True
+    now = time.time()
+    stored = _load_stored_season(season)
+    if stored and now - stored[0] < SEASON_TTL:
+        with _lock:
+            _rebuild_index_locked(season, stored[1])
+            _season_loaded_at[season] = stored[0]
+        return True
+
+    start, end = season_bounds(season)
+    entries = _fetch_range(start, end)
+    if entries is None:
+        # ESPN'e ulaşılamadı: eski kayıt varsa onunla devam
+        if stored:
+            with _lock:
+                _rebuild_index_locked(season, stored[1])
+                _season_loaded_at[season] = now - SEASON_TTL + LIVE_DAY_TTL
+            return True
+        return False
+
+    print(f"Schedule index: season {season}-{season + 1} loaded ({len(entries)} games)")
+    _save_entries(season, entries, full_season=True)
+    with _lock:
+        _rebuild_index_locked(season, entries)
+        _season_loaded_at[season] = now
+    return True
+
+
+def _is_live_day(day: str) -> bool:
+    """Bugün ve bitmemiş maçı olan dün sık yenilenir."""
+    today = datetime.now().strftime("%Y-%m-%d")
+    yesterday = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
+    if day == today:
+        return True
+    if day == yesterday:
+        return any(not e["is_final"] for e in _games_by_day.get(day, []))
+    return False
+
+
+def _refresh_live_day(day: str):
+    now = time.time()
+    if now - _day_refreshed_at.get(day, 0) < LIVE_DAY_TTL:
+        return
+    _day_refreshed_at[day] = now
+    entries = _fetch_day(day)
+    if entries is None:
+        return
+    season = season_of(datetime.strptime(day, "%Y-%m-%d"))
+    _save_entries(season, entries, replace_days=[day])
+    with _lock:
+        _replace_day_locked(day, entries)
+
+
+# =================================================================
+# SORGULAR
+# =================================================================
+
+def get_games(d) -> Optional[List[Dict]]:
+    """Günün maç girişleri. Sezon yüklenemezse None (çağıran fallback yapar)."""
+    if not ensure_season(d):
+        return None
+    day = _day_str(d)
+    if _is_live_day(day):
+        _refresh_live_day(day)
+    return list(_games_by_day.get(day, []))
+
+
+def get_game_ids(d) -> Optional[List[str]]:
+    games = get_games(d)
+    if games is None:
+        return None
+    return [g["game_id"] for g in games]
+
+
+def lookup_game_ids(date_list) -> Tuple[Dict, List]:
+    """
+    Tarih listesi için {tarih: [game_id]} döndürür (maç olmayan günler hariç).
+    İkinci değer, sezonu yüklenemeyen (fallback gereken) tarihlerdir.
+    """
+    found, missing = {}, []
+    for d in date_list:
+        ids = get_game_ids(d)
+        if ids is None:
+            missing.append(d)
+        elif ids:
+            found[d] = ids
+    return found, missing
+
+
+def get_last_game_day(d, max_days_back: int = 7) -> Optional[str]:
+    """d dahil geriye doğru maç olan son gün ('YYYY-MM-DD'), yoksa None."""
+    if not ensure_season(d):
+        return None
+    day = _day_str(d)
+    if _is_live_day(day):
+        _refresh_live_day(day)
+    with _lock:
+        idx = bisect.bisect_right(_game_days, day) - 1
+        if idx < 0:
+            return None
+        last = _game_days[idx]
+    if (datetime.strptime(day, "%Y-%m-%d") - datetime.strptime(last, "%Y-%m-%d")).days >= max_days_back:
+        return None
+    return last
+
+
+def final_game_ids(start, end) -> Optional[List[str]]:
+    """[start, end] aralığındaki bitmiş maçların ID'leri. Sezon yüklenemezse None."""
+    if not ensure_season(end):
+        return None
+    lo, hi = _day_str(start), _day_str(end)
+    with _lock:
+        days = _game_days[bisect.bisect_left(_game_days, lo):bisect.bisect_right(_game_days, hi)]
+        return [e["game_id"] for day in days for e in _games_by_day.get(day, []) if e["is_final"]]
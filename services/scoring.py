@@ -1,18 +1,164 @@
+import json
+from functools import lru_cache
+from typing import Dict, Mapping, NamedTuple, Optional, Tuple
+
+import numpy as np
 import pandas as pd
 
-def calculate_scores(df, w):
-    df["USER_SCORE"] = (
-        df["PTS"] * w["PTS"] +
-        df["REB"] * w["REB"] +
-        df["AST"] * w["AST"] +
-        df["STL"] * w["STL"] +
-        df["BLK"] * w["BLK"] +
-        df["FGA"] * w["FGA"] +
-        df["FGM"] * w["FGM"] +
-        df["FTA"] * w["FTA"] +
-        df["FTM"] * w["FTM"] +
-        df["3Pts"] * w["3Pts"] +
-        df["TO"]  * w["TO"] 
-    )
 
+# =================================================================
+# FANTEZİ PUAN MOTORU (VEKTÖREL)
+# =================================================================
+# Ağırlık sözlüğü bir kez vektöre çevrilir, frame tek matris çarpımıyla
+# puanlanır (satır başına apply / iterrows yok):
+# - weight_vector(): {stat: ağırlık} -> (stat sırası, vektör), hash ile cache'li
+# - score_frame(): oyuncular x stat @ stat -> Series
+# - score_profiles(): oyuncular x stat @ stat x profil -> profil başına kolon
+#   (sidebar ağırlıkları + kullanıcının kayıtlı ayarları aynı çarpımda)
+# - prepare() / score_prepared(): stat matrisi veri versiyonu başına bir kez
+#   kurulur; ağırlık değişince sadece çarpım tekrarlanır
+# Eksik stat kolonu 0, sayıya çevrilemeyen değer 0 sayılır.
+
+# Kayıtlı ayarlar küçük harfli key'lerle tutulur ({"pts": 1, "to": -1, ...})
+STAT_ALIASES = {
+    "pts": "PTS", "reb": "REB", "ast": "AST", "stl": "STL", "blk": "BLK",
+    "to": "TO", "tov": "TO", "fga": "FGA", "fgm": "FGM", "fta": "FTA",
+    "ftm": "FTM", "3pts": "3Pts", "3pm": "3Pts", "3pta": "3PTA",
+}
+
+
+def _key(weights: Mapping) -> Tuple[Tuple[str, float], ...]:
+    """Ağırlık sözlüğünün hashlenebilir, sıradan bağımsız hali (0 ağırlıklar atılır)."""
+    items = []
+    for stat, weight in weights.items():
+        try:
+            weight = float(weight)
+        except (TypeError, ValueError):
+            continue
+        if weight != 0:
+            items.append((str(stat), weight))
+    return tuple(sorted(items))
+
+
+def profiles_key(profiles: Mapping[str, Mapping]) -> tuple:
+    """{kolon: ağırlıklar} için hashlenebilir key (cache'li görünümler için)."""
+    return tuple((name, _key(weights)) for name, weights in profiles.items())
+
+
+@lru_cache(maxsize=256)
+def _vector(key: Tuple[Tuple[str, float], ...]) -> Tuple[Tuple[str, ...], np.ndarray]:
+    stats = tuple(stat for stat, _ in key)
+    vector = np.array([weight for _, weight in key], dtype=float)
+    vector.setflags(write=False)
+    return stats, vector
+
+
+def weight_vector(weights: Mapping) -> Tuple[Tuple[str, ...], np.ndarray]:
+    """{stat: ağırlık} -> (stat sırası, ağırlık vektörü). Aynı ağırlıklar tekrar kurulmaz."""
+    return _vector(_key(weights))
+
+
+@lru_cache(maxsize=64)
+def _profile_matrix(keys: Tuple[Tuple[Tuple[str, float], ...], ...]) -> Tuple[Tuple[str, ...], np.ndarray]:
+    stats = tuple(sorted({stat for key in keys for stat, _ in key}))
+    index = {stat: i for i, stat in enumerate(stats)}
+    matrix = np.zeros((len(stats), len(keys)), dtype=float)
+    for j, key in enumerate(keys):
+        for stat, weight in key:
+            matrix[index[stat], j] = weight
+    matrix.setflags(write=False)
+    return stats, matrix
+
+
+def stat_matrix(df: pd.DataFrame, stats) -> np.ndarray:
+    """df'in stat kolonları (verilen sırayla) float matris olarak; eksik / bozuk değer 0."""
+    matrix = np.zeros((len(df), len(stats)), dtype=float)
+    for i, stat in enumerate(stats):
+        if stat in df.columns:
+            matrix[:, i] = pd.to_numeric(df[stat], errors="coerce").to_numpy(dtype=float)
+    return np.nan_to_num(matrix, nan=0.0, posinf=0.0, neginf=0.0)
+
+
+class ScoreBlock(NamedTuple):
+    """Bir tablonun sayısal stat kolonları, puanlamaya hazır (NaN -> 0)."""
+    columns: Dict[str, int]
+    matrix: np.ndarray
+    index: pd.Index
+
+
+def prepare(df: pd.DataFrame) -> ScoreBlock:
+    """df'in sayıya çevrilebilen tüm kolonları tek matriste (ağırlıktan bağımsız, bir kez)."""
+    stats = []
+    for col in df.columns:
+        if pd.api.types.is_numeric_dtype(df[col]) and not pd.api.types.is_bool_dtype(df[col]):
+            stats.append(col)
+        elif df[col].dtype == object and pd.to_numeric(df[col], errors="coerce").notna().any():
+            stats.append(col)
+    matrix = stat_matrix(df, stats)
+    matrix.setflags(write=False)
+    return ScoreBlock({stat: i for i, stat in enumerate(stats)}, matrix, df.index)
+
+
+def score_prepared(block: ScoreBlock, profiles: Mapping[str, Mapping]) -> pd.DataFrame:
+    """score_profiles'ın hazır matrisli hali: sadece (oyuncular x stat) @ (stat x profil)."""
+    names = list(profiles)
+    stats, weights = _profile_matrix(tuple(_key(profiles[name]) for name in names))
+    keep = [i for i, stat in enumerate(stats) if stat in block.columns]
+    if not names or not keep or not len(block.index):
+        return pd.DataFrame(0.0, index=block.index, columns=names)
+    columns = [block.columns[stats[i]] for i in keep]
+    return pd.DataFrame(block.matrix[:, columns] @ weights[keep], index=block.index, columns=names)
+
+
+def score_frame(df: pd.DataFrame, weights: Mapping) -> pd.Series:
+    """Tek ağırlık profiliyle fantezi puanı (df ile aynı index)."""
+    stats, vector = weight_vector(weights)
+    if df.empty or not stats:
+        return pd.Series(0.0, index=df.index, dtype=float)
+    return pd.Series(stat_matrix(df, stats) @ vector, index=df.index)
+
+
+def score_profiles(df: pd.DataFrame, profiles: Mapping[str, Mapping]) -> pd.DataFrame:
+    """
+    Birden çok profili tek çarpımda puanlar.
+    profiles: {kolon adı: ağırlıklar} -> aynı adlarla kolonları olan DataFrame
+    """
+    names = list(profiles)
+    if not names:
+        return pd.DataFrame(index=df.index)
+    stats, matrix = _profile_matrix(tuple(_key(profiles[name]) for name in names))
+    if df.empty or not stats:
+        return pd.DataFrame(0.0, index=df.index, columns=names)
+    return pd.DataFrame(stat_matrix(df, stats) @ matrix, index=df.index, columns=names)
+
+
+def normalize_weights(weights: Mapping) -> Dict[str, float]:
+    """Kayıtlı ayarlardaki key'leri tablo kolon adlarına çevirir ("pts" -> "PTS")."""
+    result = {}
+    for stat, weight in weights.items():
+        name = STAT_ALIASES.get(str(stat).lower(), str(stat))
+        try:
+            result[name] = result.get(name, 0.0) + float(weight)
+        except (TypeError, ValueError):
+            continue
+    return result
+
+
+def saved_weights(prefs: Optional[Dict]) -> Optional[Dict[str, float]]:
+    """user_preferences satırındaki default_weights (JSON ya da dict) -> ağırlıklar. Yoksa None."""
+    raw = (prefs or {}).get("default_weights")
+    if not raw:
+        return None
+    if isinstance(raw, str):
+        try:
+            raw = json.loads(raw)
+        except ValueError:
+            return None
+    if not isinstance(raw, dict):
+        return None
+    return normalize_weights(raw) or None
+
+
+def calculate_scores(df, w):
+    df["USER_SCORE"] = score_frame(df, w)
     return df.sort_values("USER_SCORE", ascending=False)
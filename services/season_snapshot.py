@@ -0,0 +1,219 @@
+import sqlite3
+import threading
+import time
+from datetime import date
+from io import StringIO
+from typing import Callable, Dict, Optional
+
+import pandas as pd
+
+from services import game_store, resilience, single_flight
+
+
+# =================================================================
+# SEZON LİDERLERİ SNAPSHOT'I (STALE-WHILE-REVALIDATE)
+# =================================================================
+# byathlete endpoint'i ~1000 oyuncu döndürür; her "Season" tıklamasında
+# indirilip parse edilmesin:
+# - Son tablo SQLite'a yazılır (gün başına bir snapshot) ve bellekte tutulur
+# - Snapshot her zaman hemen döner; SNAPSHOT_TTL'i geçtiyse arka planda
+#   tek bir thread yeniler (sayfa beklemez)
+# - Hiç snapshot yoksa ilk fetch tek uçuştur (single_flight); eşzamanlı
+#   oturumlar aynı sonucu bekler
+# - Önceki günün snapshot'ıyla fark (PTS_DELTA, GP_DELTA, RANK_DELTA)
+#   yenileme anında bir kez hesaplanır
+
+SNAPSHOT_TTL = 3 * 3600     # Bu süreden eski snapshot arka planda yenilenir
+RETRY_SECONDS = 300         # Başarısız yenilemeden sonra bekleme
+COLD_WAIT = 60              # Snapshot yokken ilk fetch'i bekleme süresi (sn)
+KEEP_DAYS = 7               # Saklanan günlük snapshot sayısı
+
+MOVEMENT_COLUMNS = ["PTS_DELTA", "GP_DELTA", "RANK_DELTA"]
+
+_lock = threading.Lock()
+_schema_ready = False
+_snapshots: Dict[int, Dict] = {}        # sezon -> {'df', 'fetched_at'}
+_refreshing: Dict[int, bool] = {}
+_last_attempt: Dict[int, float] = {}
+
+
+def _get_connection():
+    global _schema_ready
+    conn = game_store.get_connection()
+    if not _schema_ready:
+        with _lock:
+            if not _schema_ready:
+                conn.executescript("""
+                    CREATE TABLE IF NOT EXISTS season_snapshots (
+                        season INTEGER NOT NULL,
+                        day TEXT NOT NULL,
+                        fetched_at REAL,
+                        payload TEXT,
+                        PRIMARY KEY (season, day)
+                    );
+                """)
+                conn.commit()
+                _schema_ready = True
+    return conn
+
+
+# =================================================================
+# KALICI DEPO
+# =================================================================
+
+def _decode(payload: str) -> pd.DataFrame:
+    # dtype=False: PLAYER_ID string kalsın
+    return pd.read_json(StringIO(payload), orient="split", dtype=False)
+
+
+def _save(season: int, df: pd.DataFrame, fetched_at: float):
+    raw = df.drop(columns=[c for c in MOVEMENT_COLUMNS if c in df.columns])
+    try:
+        conn = _get_connection()
+        with _lock:
+            conn.execute(
+                "INSERT OR REPLACE INTO season_snapshots (season, day, fetched_at, payload) VALUES (?, ?, ?, ?)",
+                (season, date.fromtimestamp(fetched_at).isoformat(), fetched_at, raw.to_json(orient="split", index=False))
+            )
+            conn.execute(
+                "DELETE FROM season_snapshots WHERE season = ? AND day NOT IN "
+                "(SELECT day FROM season_snapshots WHERE season = ? ORDER BY day DESC LIMIT ?)",
+                (season, season, KEEP_DAYS)
+            )
+            conn.commit()
+    except sqlite3.Error as e:
+        print(f"Season snapshot write error: {e}")
+
+
+def _load_latest(season: int) -> Optional[Dict]:
+    try:
+        row = _get_connection().execute(
+            "SELECT fetched_at, payload FROM season_snapshots WHERE season = ? ORDER BY day DESC LIMIT 1",
+            (season,)
+        ).fetchone()
+    except sqlite3.Error as e:
+        print(f"Season snapshot read error: {e}")
+        return None
+    if row is None:
+        return None
+    return {"df": _decode(row[1]), "fetched_at": row[0]}
+
+
+def _load_previous(season: int, before_day: str) -> Optional[pd.DataFrame]:
+    """before_day'den önceki son günün snapshot'ı (fark için)."""
+    try:
+        row = _get_connection().execute(
+            "SELECT payload FROM season_snapshots WHERE season = ? AND day < ? ORDER BY day DESC LIMIT 1",
+            (season, before_day)
+        ).fetchone()
+    except sqlite3.Error as e:
+        print(f"Season snapshot read error: {e}")
+        return None
+    return _decode(row[0]) if row else None
+
+
+# =================================================================
+# FARK (GÜNLÜK HAREKET)
+# =================================================================
+
+def with_movement(current: pd.DataFrame, previous: Optional[pd.DataFrame]) -> pd.DataFrame:
+    """
+    PTS_DELTA: sayı ortalaması değişimi, GP_DELTA: oynanan maç farkı,
+    RANK_DELTA: sayı sıralamasındaki yükseliş (+ yukarı). Önceki yoksa 0.
+    """
+    df = current.copy()
+    if previous is None or previous.empty or "PLAYER_ID" not in df or "PLAYER_ID" not in previous:
+        for col in MOVEMENT_COLUMNS:
+            df[col] = 0
+        return df
+
+    def ranked(frame):
+        frame = frame.dropna(subset=["PLAYER_ID"]).drop_duplicates("PLAYER_ID")
+        return frame.set_index(frame["PLAYER_ID"].astype(str))[["PTS", "GP"]].assign(
+            RANK=frame["PTS"].rank(method="min", ascending=False).to_numpy()
+        )
+
+    now, before = ranked(df), ranked(previous)
+    keys = df["PLAYER_ID"].astype(str)
+    prev = before.reindex(keys)
+    cur = now.reindex(keys)
+    df["PTS_DELTA"] = (cur["PTS"] - prev["PTS"]).round(1).fillna(0).to_numpy()
+    df["GP_DELTA"] = (cur["GP"] - prev["GP"]).fillna(0).astype(int).to_numpy()
+    df["RANK_DELTA"] = (prev["RANK"] - cur["RANK"]).fillna(0).astype(int).to_numpy()
+    return df
+
+
+# =================================================================
+# YENİLEME
+# =================================================================
+
+def _refresh(season: int, fetch: Callable[[], pd.DataFrame]) -> Optional[Dict]:
+    """fetch() çağırır, snapshot'ı kaydeder ve belleğe alır. Hata exception olarak çıkar."""
+    with _lock:
+        _last_attempt[season] = time.time()
+    df = fetch()
+    fetched_at = time.time()
+    _save(season, df, fetched_at)
+    previous = _load_previous(season, date.fromtimestamp(fetched_at).isoformat())
+    entry = {"df": with_movement(df, previous), "fetched_at": fetched_at}
+    with _lock:
+        _snapshots[season] = entry
+    return entry
+
+
+def _refresh_in_background(season: int, fetch: Callable[[], pd.DataFrame]):
+    # Deneme zamanı kontrolü ve işareti tek adımda: aynı anda tek revalidation
+    with _lock:
+        now = time.time()
+        if _refreshing.get(season) or now - _last_attempt.get(season, 0) < RETRY_SECONDS:
+            return
+        _refreshing[season] = True
+        _last_attempt[season] = now
+
+    def run():
+        try:
+            _refresh(season, fetch)
+            print(f"✓ Season {season} leaders snapshot refreshed")
+        except Exception as e:
+            print(f"Season snapshot refresh failed ({season}): {e}")
+        finally:
+            with _lock:
+                _refreshing[season] = False
+
+    threading.Thread(target=run, name=f"season-snapshot-{season}", daemon=True).start()
+
+
+def get(season: int, fetch: Callable[[], pd.DataFrame]) -> Optional[pd.DataFrame]:
+    """
+    Sezon tablosu (hareket kolonlarıyla). Snapshot varsa hemen döner, eskiyse
+    arka planda yenilenir. Hiç snapshot yoksa fetch() beklenir; o da
+    başarısızsa None.
+    """
+    with _lock:
+        entry = _snapshots.get(season)
+    if entry is None:
+        entry = _load_latest(season)
+        if entry is not None:
+            fetched_day = date.fromtimestamp(entry["fetched_at"]).isoformat()
+            entry["df"] = with_movement(entry["df"], _load_previous(season, fetched_day))
+            with _lock:
+                _snapshots.setdefault(season, entry)
+
+    if entry is None:
+        try:
+            entry = single_flight.do(("season_snapshot", season), lambda: _refresh(season, fetch),
+                                     wait=resilience.clip_wait(COLD_WAIT))
+        except Exception as e:
+            print(f"Season snapshot fetch failed ({season}): {e}")
+            return None
+    elif time.time() - entry["fetched_at"] >= SNAPSHOT_TTL:
+        _refresh_in_background(season, fetch)
+
+    return entry["df"].copy()
+
+
+def get_age(season: int) -> Optional[float]:
+    """Bellekteki snapshot'ın yaşı (saniye)."""
+    with _lock:
+        entry = _snapshots.get(season)
+    return None if entry is None else time.time() - entry["fetched_at"]
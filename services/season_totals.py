@@ -0,0 +1,308 @@
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Optional
+
+import pandas as pd
+
+from services import game_store, resilience, schedule_index, single_flight
+
+
+# =================================================================
+# ARTIMLI SEZON TOPLAMLARI (SQLite)
+# =================================================================
+# Sezon ortalamaları her cache süresinde tüm sezonu yeniden toplamak
+# yerine oyuncu başına "running total" tablosundan okunur.
+# - season_totals: oyuncu başına GP, MIN, PTS ... 3PTA, last_game_date
+# - season_applied_games: toplama eklenmiş final maçlar (çift sayım olmaz);
+#   oyuncusu olmayan final / ertelenen / iptal maçlar da toplamsız işaretlenir
+# - season_watermarks: bu tarihe kadar tüm maçlar final + eklenmiş
+# refresh() sadece watermark sonrası günleri çeker (normalde dün + bugün).
+
+# (boxscore key, sql column)
+TOTAL_COLUMNS = [
+    ("PTS", "pts"),
+    ("REB", "reb"),
+    ("AST", "ast"),
+    ("STL", "stl"),
+    ("BLK", "blk"),
+    ("TO", "tov"),
+    ("FGM", "fgm"),
+    ("FGA", "fga"),
+    ("FTM", "ftm"),
+    ("FTA", "fta"),
+    ("3Pts", "fg3m"),
+    ("3PTA", "fg3a"),
+]
+
+MIN_AVG_MINUTES = 10
+REFRESH_WAIT = 60           # Eşzamanlı refresh'in lideri bekleme süresi (sn)
+VOID_STATUSES = ("postponed", "canceled", "cancelled")     # Hiç oynanmayacak maçlar
+
+# get_active_players_stats çıktı kolonları
+AVERAGE_COLUMNS = ["PLAYER", "PLAYER_ID", "TEAM", "GP", "MIN", "PTS", "REB", "AST", "STL", "BLK", "TO",
+                   "FGM", "FGA", "FTM", "FTA", "3Pts", "3PM", "3PTA", "FG%", "FT%", "3P%"]
+
+_write_lock = threading.Lock()
+_schema_ready = False
+
+
+def _get_connection():
+    global _schema_ready
+    conn = game_store.get_connection()
+    if not _schema_ready:
+        with _write_lock:
+            if not _schema_ready:
+                _create_schema(conn)
+                _schema_ready = True
+    return conn
+
+
+def _create_schema(conn):
+    stat_cols = ",\n".join(f"    {col} REAL NOT NULL DEFAULT 0" for _, col in TOTAL_COLUMNS)
+    conn.executescript(f"""
+        CREATE TABLE IF NOT EXISTS season_totals (
+            season TEXT NOT NULL,
+            athlete_id TEXT NOT NULL,
+            player TEXT,
+            team TEXT,
+            gp INTEGER NOT NULL DEFAULT 0,
+            min REAL NOT NULL DEFAULT 0,
+{stat_cols},
+            last_game_date TEXT,
+            PRIMARY KEY (season, athlete_id)
+        );
+
+        CREATE TABLE IF NOT EXISTS season_applied_games (
+            season TEXT NOT NULL,
+            game_id TEXT NOT NULL,
+            PRIMARY KEY (season, game_id)
+        );
+
+        CREATE TABLE IF NOT EXISTS season_watermarks (
+            season TEXT PRIMARY KEY,
+            watermark TEXT,
+            updated_at REAL
+        );
+    """)
+    conn.commit()
+
+
+def _day_str(d):
+    return d.strftime("%Y-%m-%d") if hasattr(d, "strftime") else str(d)[:10]
+
+
+# =================================================================
+# WATERMARK
+# =================================================================
+
+def get_watermark(season_start) -> Optional[datetime]:
+    """Sezon için son tamamlanmış günü döndürür (henüz yoksa None)."""
+    try:
+        row = _get_connection().execute(
+            "SELECT watermark FROM season_watermarks WHERE season = ?", (_day_str(season_start),)
+        ).fetchone()
+    except sqlite3.Error as e:
+        print(f"Season totals read error (watermark): {e}")
+        return None
+    if not row or not row[0]:
+        return None
+    return datetime.strptime(row[0], "%Y-%m-%d")
+
+
+def _applied_game_ids(conn, season):
+    rows = conn.execute("SELECT game_id FROM season_applied_games WHERE season = ?", (season,)).fetchall()
+    return {r[0] for r in rows}
+
+
+# =================================================================
+# GÜNCELLEME
+# =================================================================
+
+def _game_rows(season, game):
+    """Bir maçın oyuncu satırlarını UPSERT parametrelerine çevirir."""
+    g_date = _day_str(game["date"])
+    rows = []
+    for p in game["players"]:
+        name = p.get("PLAYER", "")
+        if not name:
+            continue
+        minutes = p.get("MIN", 0.0)  # ingest'te float dakika
+        if minutes == 0:
+            continue
+        athlete_id = str(p.get("PLAYER_ID") or name)
+        values = [p.get(key, 0) for key, _ in TOTAL_COLUMNS]
+        rows.append((season, athlete_id, name, p.get("TEAM", "UNK"), minutes, *values, g_date))
+    return rows
+
+
+def refresh(season_start, end_date) -> int:
+    """
+    Watermark'tan sonraki günlerin final maçlarını toplamlara ekler.
+    Canlı / başlamamış maçlar eklenmez; final olduklarında sonraki refresh'te girer.
+    Aynı sezon / bitiş günü için eşzamanlı çağrılar tek refresh'i paylaşır.
+    Returns: eklenen maç sayısı
+    """
+    key = ("season_totals_refresh", _day_str(season_start), _day_str(end_date))
+    return single_flight.do(key, lambda: _refresh(season_start, end_date),
+                            wait=resilience.clip_wait(REFRESH_WAIT))
+
+
+def _refresh(season_start, end_date) -> int:
+    from services.espn_api import iter_historical_boxscores, resolve_game_dates
+
+    season = _day_str(season_start)
+    watermark = get_watermark(season_start)
+    start = watermark + timedelta(days=1) if watermark else season_start
+    if _day_str(start) > _day_str(end_date):
+        return 0
+
+    try:
+        conn = _get_connection()
+        applied = _applied_game_ids(conn, season)
+    except sqlite3.Error as e:
+        print(f"Season totals read error: {e}")
+        return 0
+
+    # Gün -> maç listesi (bulk fetch memo'sundan, iter_historical_boxscores tekrar istemez)
+    date_list = []
+    curr = start
+    while _day_str(curr) <= _day_str(end_date):
+        date_list.append(curr)
+        curr += timedelta(days=1)
+    failed_dates = []
+    date_game_map = resolve_game_dates(date_list, failed_dates=failed_dates)
+
+    new_games = {}      # game_id -> UPSERT satırları (boş liste: toplamsız işaret)
+    empty_games = []
+    for game in iter_historical_boxscores(start, end_date, empty_games=empty_games):
+        gid = str(game.get("game_id"))
+        if not game.get("is_final") or gid in applied:
+            continue
+        new_games[gid] = _game_rows(season, game)
+        applied.add(gid)
+
+    # Oyuncusu olmayan final maç (ertelenen / iptal) ya da fikstürde ertelenmiş
+    # görünen maç çözülmüş sayılır; watermark'ı sadece başarısız istekler tutar
+    void = {gid for gid, is_final in empty_games if is_final}
+    for d in date_list:
+        for g in schedule_index.get_games(d) or []:
+            if str(g.get("status", "")).lower() in VOID_STATUSES:
+                void.add(str(g["game_id"]))
+    for gid in void - applied:
+        new_games[gid] = []
+        applied.add(gid)
+
+    # Tüm maçları final + eklenmiş olmayan ilk günden önceki gün yeni watermark olur
+    pending = [d for d in failed_dates]
+    for d, ids in date_game_map.items():
+        if any(str(gid) not in applied for gid in ids):
+            pending.append(d)
+    if pending:
+        new_watermark = min(pending, key=_day_str) - timedelta(days=1)
+    else:
+        new_watermark = end_date
+    # Bugün henüz bitmediği için watermark en fazla dün olabilir
+    yesterday = datetime.now() - timedelta(days=1)
+    if _day_str(new_watermark) > _day_str(yesterday):
+        new_watermark = yesterday
+
+    stat_cols = ", ".join(col for _, col in TOTAL_COLUMNS)
+    placeholders = ", ".join("?" * (6 + len(TOTAL_COLUMNS)))
+    updates = ",\n                ".join(f"{col} = {col} + excluded.{col}" for _, col in TOTAL_COLUMNS)
+    sql = f"""
+        INSERT INTO season_totals (season, athlete_id, player, team, min, {stat_cols}, last_game_date, gp)
+        VALUES ({placeholders}, 1)
+        ON CONFLICT (season, athlete_id) DO UPDATE SET
+            gp = gp + 1,
+            min = min + excluded.min,
+            {updates},
+            player = CASE WHEN excluded.last_game_date >= last_game_date THEN excluded.player ELSE player END,
+            team = CASE WHEN excluded.last_game_date >= last_game_date THEN excluded.team ELSE team END,
+            last_game_date = MAX(last_game_date, excluded.last_game_date)
+    """
+
+    try:
+        with _write_lock:
+            # Önce maç işareti: işaret bu transaction'da eklenmediyse (changes() = 0)
+            # maç başka bir refresh tarafından zaten toplanmıştır, toplamlara dokunulmaz
+            added = 0
+            for gid, rows in new_games.items():
+                cur = conn.execute(
+                    "INSERT OR IGNORE INTO season_applied_games (season, game_id) VALUES (?, ?)", (season, gid)
+                )
+                if cur.rowcount == 1 and rows:
+                    conn.executemany(sql, rows)
+                    added += 1
+            if _day_str(new_watermark) >= season:
+                conn.execute(
+                    "INSERT OR REPLACE INTO season_watermarks (season, watermark, updated_at) VALUES (?, ?, ?)",
+                    (season, _day_str(new_watermark), time.time())
+                )
+            conn.commit()
+    except sqlite3.Error as e:
+        print(f"Season totals write error: {e}")
+        try:
+            conn.rollback()
+        except sqlite3.Error:
+            pass
+        return 0
+
+    print(f"Season totals: {added} new games applied, watermark {_day_str(new_watermark)}")
+    return added
+
+
+# =================================================================
+# OKUMA
+# =================================================================
+
+def load_totals(season_start) -> pd.DataFrame:
+    """Sezonun ham toplamlarını (oyuncu başına tek satır) döndürür."""
+    stat_cols = ", ".join(f"{col} AS '{key}'" for key, col in TOTAL_COLUMNS)
+    try:
+        conn = _get_connection()
+        return pd.read_sql_query(
+            f"SELECT athlete_id AS PLAYER_ID, player AS PLAYER, team AS TEAM, gp AS GP, min AS MIN, "
+            f"{stat_cols}, last_game_date FROM season_totals WHERE season = ?",
+            conn, params=(_day_str(season_start),)
+        )
+    except (sqlite3.Error, pd.errors.DatabaseError) as e:
+        print(f"Season totals read error: {e}")
+        return pd.DataFrame()
+
+
+def get_season_averages(season_start, min_avg_minutes=MIN_AVG_MINUTES) -> pd.DataFrame:
+    """
+    Toplamlardan maç başı ortalama tablosunu üretir (vektörel, oyuncu başına).
+    Kolonlar get_active_players_stats ile aynıdır.
+    """
+    df = load_totals(season_start)
+    if df.empty:
+        return df
+
+    df = df[df["GP"] > 0]
+    gp = df["GP"]
+    avg_minutes = df["MIN"] / gp
+    df = df[avg_minutes >= min_avg_minutes]
+    gp = df["GP"]
+
+    result = pd.DataFrame({
+        "PLAYER": df["PLAYER"],
+        "PLAYER_ID": df["PLAYER_ID"],
+        "TEAM": df["TEAM"],
+        "GP": gp,
+        "MIN": (df["MIN"] / gp).round(1),
+    })
+    for key, _ in TOTAL_COLUMNS:
+        result[key] = (df[key] / gp).round(1)
+    result["3PM"] = result["3Pts"]  # Duplicate for compatibility
+
+    def pct(made, att):
+        return (df[made] / df[att].where(df[att] > 0) * 100).fillna(0).round(1)
+
+    result["FG%"] = pct("FGM", "FGA")
+    result["FT%"] = pct("FTM", "FTA")
+    result["3P%"] = pct("3Pts", "3PTA")
+    result = result[AVERAGE_COLUMNS]
+    return result.reset_index(drop=True)
@@ -0,0 +1,122 @@
+import threading
+from typing import Callable, Dict, Hashable, Optional
+from urllib.parse import parse_qsl, urlsplit, urlunsplit
+
+
+# =================================================================
+# SINGLE-FLIGHT İSTEK BİRLEŞTİRME (PROCESS GENELİ)
+# =================================================================
+# Streamlit'te her kullanıcı oturumu ayrı thread'de çalışır. Tip-off
+# anında birçok oturum aynı scoreboard / boxscore / injuries isteğini
+# aynı anda atar. Aynı key (endpoint + parametreler) için eşzamanlı
+# çağrılardan sadece ilki (lider) gerçekten çalışır; diğerleri onun
+# sonucunu (ya da hatasını) paylaşır. Sonuç saklanmaz - cache değildir.
+
+DEFAULT_WAIT = 30           # Takipçilerin lideri bekleme süresi (sn)
+
+_lock = threading.Lock()
+_inflight: Dict[Hashable, "_Call"] = {}
+_stats: Dict[str, Dict[str, int]] = {}      # endpoint -> sayaçlar
+
+
+class _Call:
+    def __init__(self):
+        self.event = threading.Event()
+        self.value = None
+        self.error: Optional[BaseException] = None
+
+
+def make_key(url: str, params: Optional[Dict] = None, headers: Optional[Dict] = None) -> tuple:
+    """
+    URL + parametrelerden sıra bağımsız, hash'lenebilir key üretir.
+    URL'deki query string parametrelere katılır; key'in ilk elemanı
+    sayaçların tutulduğu endpoint'tir (query'siz URL).
+    """
+    parts = urlsplit(url)
+    merged = parse_qsl(parts.query, keep_blank_values=True) + list((params or {}).items())
+    endpoint = urlunsplit((parts.scheme, parts.netloc, parts.path, "", ""))
+
+    def frozen(items):
+        return tuple(sorted((str(k), str(v)) for k, v in items))
+    return (endpoint, frozen(merged), frozen((headers or {}).items()))
+
+
+def _endpoint(key: Hashable) -> str:
+    return str(key[0]) if isinstance(key, tuple) and key else str(key)
+
+
+def _count(endpoint: str, name: str):
+    counters = _stats.setdefault(endpoint, {"calls": 0, "executed": 0, "deduplicated": 0})
+    counters[name] += 1
+
+
+def do(key: Hashable, fn: Callable, wait: float = DEFAULT_WAIT, on_timeout: Optional[Callable] = None):
+    """
+    key için uçuşta bir çağrı varsa onun sonucunu bekler, yoksa fn()'i çalıştırır.
+    Lider hata verirse aynı hata bekleyenlere de fırlatılır. Bekleme süresi
+    aşılırsa takipçi fn()'i kendisi çalıştırır; on_timeout verilmişse onun
+    sonucunu döndürür (pahalı işler tekrar çalışmaz).
+    """
+    endpoint = _endpoint(key)
+    with _lock:
+        _count(endpoint, "calls")
+        call = _inflight.get(key)
+        leader = call is None
+        if leader:
+            call = _Call()
+            _inflight[key] = call
+            _count(endpoint, "executed")
+
+    if not leader:
+        if call.event.wait(wait):
+            with _lock:
+                _count(endpoint, "deduplicated")
+            if call.error is not None:
+                raise call.error
+            return call.value
+        if on_timeout is not None:
+            return on_timeout()
+        with _lock:
+            _count(endpoint, "executed")
+        return fn()
+
+    try:
+        call.value = fn()
+        return call.value
+    except BaseException as e:
+        call.error = e
+        raise
+    finally:
+        with _lock:
+            _inflight.pop(key, None)
+        call.event.set()
+
+
+def in_flight() -> int:
+    with _lock:
+        return len(_inflight)
+
+
+# =================================================================
+# İSTATİSTİKLER
+# =================================================================
+
+def get_stats() -> Dict:
+    """
+    Returns:
+        {'calls': n, 'executed': n, 'deduplicated': n,
+         'endpoints': {endpoint: {'calls', 'executed', 'deduplicated'}}}
+    """
+    with _lock:
+        endpoints = {name: dict(counters) for name, counters in _stats.items()}
+    totals = {"calls": 0, "executed": 0, "deduplicated": 0}
+    for counters in endpoints.values():
+        for name in totals:
+            totals[name] += counters[name]
+    totals["endpoints"] = endpoints
+    return totals
+
+
+def reset_stats():
+    with _lock:
+        _stats.clear()
@@ -0,0 +1,281 @@
+import json
+import multiprocessing
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+from services import boxscore_ingest, game_excitement, schedule_index
+
+try:
+    import orjson
+except ImportError:  # opsiyonel: yoksa standart json
+    orjson = None
+
+
+# =================================================================
+# SUMMARY PARSE AŞAMASI
+# =================================================================
+# ESPN summary yanıtı (maç başına ~0.5-1 MB) plays, winprobability,
+# news ... taşır; boxscore için sadece "header" ve "boxscore", heyecan
+# endeksi için "plays" gerekir.
+# - orjson kuruluysa gövde tek seferde orjson ile decode edilir (ölçümde
+#   standart json'la alt ağaç decode'undan ~2x hızlı)
+# - orjson yoksa sadece istenen alt ağaçlar decode edilir (json.raw_decode
+#   ile key'in başladığı yerden, değerin bittiği yere kadar); standart
+#   json'la tam decode'dan hızlı
+# - HOOPLIFE_PARSE_PROCESSES > 0 ise toplu parse process pool'a dağıtılır
+#   (GIL'i aşmak için; 0 = aynı thread'de)
+# - Maç başına indirilen byte ve parse süresi kaydedilir
+
+BOXSCORE_KEYS = ("header", "boxscore")
+FLOW_KEYS = ("plays",)      # Opsiyonel: başlamamış maçta yok
+# Yanlış (iç içe) eşleşmeyi elemek için alt ağacın şekli
+SUBTREE_SHAPE = {"header": "competitions", "boxscore": "teams", "plays": list}
+PARSE_PROCESSES = int(os.environ.get("HOOPLIFE_PARSE_PROCESSES", "0") or 0)
+METRICS_MAX = 5000          # Saklanan maç başı metrik sayısı
+
+_decoder = json.JSONDecoder()
+_pool = None
+_pool_lock = threading.Lock()
+_metrics_lock = threading.Lock()
+_game_metrics: "OrderedDict[str, Dict]" = OrderedDict()
+_totals = {"games": 0, "bytes": 0, "parse_seconds": 0.0, "subtree": 0, "full": 0}
+
+
+# =================================================================
+# DECODE
+# =================================================================
+
+def loads(body):
+    """Tam decode (orjson varsa orjson)."""
+    if orjson is not None:
+        return orjson.loads(body)
+    return json.loads(body)
+
+
+def _find_value_start(text: str, key: str) -> int:
+    marker = f'"{key}":'
+    idx = text.find(marker)
+    if idx < 0:
+        return -1
+    idx += len(marker)
+    while idx < len(text) and text[idx] in " \t\r\n":
+        idx += 1
+    return idx
+
+
+def _valid_subtree(key: str, value) -> bool:
+    shape = SUBTREE_SHAPE.get(key)
+    if shape is None:
+        return isinstance(value, (dict, list))
+    if isinstance(shape, type):
+        return isinstance(value, shape)
+    return isinstance(value, dict) and shape in value
+
+
+def extract(body, keys: Iterable[str] = BOXSCORE_KEYS, optional: Iterable[str] = ()) -> Tuple[Dict, bool]:
+    """
+    Yanıt gövdesinden istenen üst seviye key'leri döndürür (orjson varsa tam
+    decode, yoksa alt ağaç decode). optional içindeki key'ler bulunamazsa atlanır.
+    Returns: ({key: değer}, subtree_kullanıldı_mı). Alt ağaç bulunamazsa tam decode'a düşer.
+    """
+    keys, optional = list(keys), list(optional)
+    if orjson is not None:
+        data = orjson.loads(body)
+        return {k: data[k] for k in keys + optional if k in data}, False
+    text = body.decode("utf-8") if isinstance(body, (bytes, bytearray)) else body
+    result = {}
+    try:
+        for key in keys + optional:
+            start = _find_value_start(text, key)
+            if start < 0:
+                if key in optional:
+                    continue
+                raise ValueError(key)
+            value, _ = _decoder.raw_decode(text, start)
+            if not _valid_subtree(key, value):
+                raise ValueError(key)
+            result[key] = value
+        return result, True
+    except ValueError:
+        data = loads(body)
+        return {k: data[k] for k in keys + optional if k in data}, False
+
+
+# =================================================================
+# BOXSCORE PARSE
+# =================================================================
+
+def parse_summary(data):
+    """
+    Summary JSON'ından oyuncu satırlarını ve maç durumunu çıkarır.
+    Returns: (players, is_final, game_date)
+    """
+    players = []
+    is_final = False
+    game_date = None
+
+    try:
+        comp = data["header"]["competitions"][0]
+        status_type = comp["status"]["type"]
+        is_final = bool(status_type.get("completed")) or status_type.get("state") == "post"
+        game_date = schedule_index.game_day(comp.get("date"))
+    except (KeyError, IndexError, TypeError):
+        pass
+
+    if "boxscore" not in data or "players" not in data["boxscore"]:
+        return [], is_final, game_date
+
+    for team in data["boxscore"]["players"]:
+        for group in team.get("statistics", []):
+            if "athletes" not in group:
+                continue
+
+            labels = group["labels"]
+
+            for athlete in group["athletes"]:
+                raw_stats = athlete["stats"]
+                stats = dict(zip(labels, raw_stats))
+
+                stats["PLAYER"] = athlete["athlete"]["displayName"]
+                stats["PLAYER_ID"] = athlete["athlete"].get("id")
+                stats["TEAM"] = team["team"]["abbreviation"]
+
+                if "MIN" not in stats:
+                    stats["MIN"] = "--"
+
+                players.append(stats)
+
+    # Split / dakika / sayı dönüşümleri maç başına tek seferde, vektörel
+    players = boxscore_ingest.to_records(boxscore_ingest.ingest_players(players))
+
+    return players, is_final, game_date
+
+
+def parse_body(body) -> Tuple[list, bool, Optional[object], Optional[Dict], Dict]:
+    """
+    Ham summary gövdesi -> (players, is_final, game_date, akış, metrik).
+    Process pool worker'ı olarak da çalışır (modül seviyesinde, picklable).
+    """
+    t0 = time.perf_counter()
+    data, subtree = extract(body, BOXSCORE_KEYS, optional=FLOW_KEYS)
+    players, is_final, game_date = parse_summary(data)
+    try:
+        flow = game_excitement.flow_from_plays(data.get("plays"))
+    except Exception as e:
+        print(f"Play-by-play flow error: {e}")
+        flow = None
+    metric = {
+        "bytes": len(body),
+        "parse_ms": round((time.perf_counter() - t0) * 1000, 2),
+        "subtree": subtree,
+    }
+    return players, is_final, game_date, flow, metric
+
+
+# =================================================================
+# METRİKLER
+# =================================================================
+
+def record_metric(game_id, metric: Dict):
+    with _metrics_lock:
+        _game_metrics[str(game_id)] = metric
+        _game_metrics.move_to_end(str(game_id))
+        while len(_game_metrics) > METRICS_MAX:
+            _game_metrics.popitem(last=False)
+        _totals["games"] += 1
+        _totals["bytes"] += metric["bytes"]
+        _totals["parse_seconds"] += metric["parse_ms"] / 1000
+        _totals["subtree" if metric["subtree"] else "full"] += 1
+
+
+def get_game_metrics(game_id) -> Optional[Dict]:
+    with _metrics_lock:
+        return _game_metrics.get(str(game_id))
+
+
+def get_stats() -> Dict:
+    """
+    Returns: {'games', 'bytes', 'parse_seconds', 'avg_parse_ms', 'avg_kb',
+              'subtree', 'full', 'decoder', 'processes'}
+    """
+    with _metrics_lock:
+        result = dict(_totals)
+    games = result["games"] or 1
+    result["avg_parse_ms"] = round(result["parse_seconds"] * 1000 / games, 2)
+    result["avg_kb"] = round(result["bytes"] / 1024 / games, 1)
+    result["decoder"] = "orjson" if orjson is not None else "json"
+    result["processes"] = PARSE_PROCESSES
+    return result
+
+
+def reset_stats():
+    with _metrics_lock:
+        _game_metrics.clear()
+        for key in _totals:
+            _totals[key] = 0
+
+
+# =================================================================
+# TEKLİ / TOPLU PARSE
+# =================================================================
+
+def parse_game(game_id, body):
+    """Tek maç: aynı thread'de parse + metrik / akış kaydı. Returns: (players, is_final, game_date)"""
+    players, is_final, game_date, flow, metric = parse_body(body)
+    record_metric(game_id, metric)
+    game_excitement.record_flow(game_id, flow, is_final)
+    return players, is_final, game_date
+
+
+def _get_pool() -> Optional[ProcessPoolExecutor]:
+    global _pool
+    if PARSE_PROCESSES <= 0:
+        return None
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                # spawn: event loop / HTTP thread'leri olan process fork'lanmaz
+                _pool = ProcessPoolExecutor(max_workers=PARSE_PROCESSES,
+                                            mp_context=multiprocessing.get_context("spawn"))
+    return _pool
+
+
+def iter_parsed(bodies: Iterable[Tuple[object, bytes]]) -> Iterator[Tuple[object, Optional[tuple]]]:
+    """
+    (key, body) akışını parse eder, (key, (players, is_final, game_date)) üretir.
+    Parse hatasında ikinci eleman None olur. Process pool açıksa gövdeler
+    geldikçe pool'a verilir ve sonuçlar tamamlandıkça üretilir.
+    """
+    pool = _get_pool()
+    if pool is None:
+        for key, body in bodies:
+            try:
+                yield key, parse_game(key, body)
+            except Exception as e:
+                print(f"Summary parse error ({key}): {e}")
+                yield key, None
+        return
+
+    pending = {}
+    for key, body in bodies:
+        pending[pool.submit(parse_body, body)] = key
+        # Tamamlananları beklemeden topla (indirme ile parse örtüşür)
+        for future in [f for f in pending if f.done()]:
+            yield _collect(pending.pop(future), future)
+    for future in as_completed(list(pending)):
+        yield _collect(pending.pop(future), future)
+
+
+def _collect(key, future):
+    try:
+        players, is_final, game_date, flow, metric = future.result()
+    except Exception as e:
+        print(f"Summary parse error ({key}): {e}")
+        return key, None
+    record_metric(key, metric)
+    game_excitement.record_flow(key, flow, is_final)
+    return key, (players, is_final, game_date)
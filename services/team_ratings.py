@@ -0,0 +1,311 @@
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+import pandas as pd
+
+from services import boxscore_ingest, game_store
+
+
+# =================================================================
+# TAKIM OFFENSIVE / DEFENSIVE RATING + PACE
+# =================================================================
+# Kalıcı depodaki final maçların boxscore satırlarından hesaplanır,
+# ağ isteği yok. Artımlı: her maç team_game_stats'a bir kez yazılır ve
+# sezonluk toplamlar (team_ratings) sadece yeni maçlarla güncellenir.
+# - Possession = FGA - OREB + TO + 0.44 * FTA (iki takımın ortalaması)
+# - ORtg = 100 * PTS / poss, DRtg = 100 * rakip PTS / poss
+# - Pace = 48 dakikaya göre possession (takım dakikası / 5 = maç süresi)
+# İki takımı çıkmayan maçlar (eksik boxscore / TEAM'siz satırlar)
+# team_ratings_skipped'e yazılır; her update'te tekrar okunmazlar.
+
+FTA_FACTOR = 0.44
+GAME_MINUTES = 48
+UPDATE_INTERVAL = 60        # Depoya yeni maç geldi mi kontrolü (saniye)
+
+_lock = threading.Lock()
+_schema_ready = False
+_checked_at = 0.0
+_ratings_cache: Dict[int, Dict[str, Dict]] = {}     # sezon -> {takım: rating}
+_generation = 0             # Her update'te artar; eski okumalar cache'e yazılmaz
+
+
+def _season_of(game_date: Optional[str]) -> Optional[int]:
+    if not game_date:
+        return None
+    year, month = int(game_date[:4]), int(game_date[5:7])
+    return year if month >= 8 else year - 1
+
+
+def _get_connection():
+    global _schema_ready
+    conn = game_store.get_connection()
+    if not _schema_ready:
+        with _lock:
+            if not _schema_ready:
+                conn.executescript("""
+                    CREATE TABLE IF NOT EXISTS team_game_stats (
+                        game_id TEXT NOT NULL,
+                        team TEXT NOT NULL,
+                        season INTEGER,
+                        game_date TEXT,
+                        pts INTEGER,
+                        opp_pts INTEGER,
+                        possessions REAL,
+                        minutes REAL,
+                        PRIMARY KEY (game_id, team)
+                    );
+
+                    CREATE TABLE IF NOT EXISTS team_ratings (
+                        season INTEGER NOT NULL,
+                        team TEXT NOT NULL,
+                        games INTEGER NOT NULL DEFAULT 0,
+                        pts INTEGER NOT NULL DEFAULT 0,
+                        opp_pts INTEGER NOT NULL DEFAULT 0,
+                        possessions REAL NOT NULL DEFAULT 0,
+                        minutes REAL NOT NULL DEFAULT 0,
+                        updated_at REAL,
+                        PRIMARY KEY (season, team)
+                    );
+
+                    CREATE TABLE IF NOT EXISTS team_ratings_skipped (
+                        game_id TEXT PRIMARY KEY,
+                        skipped_at REAL
+                    );
+                """)
+                conn.commit()
+                _schema_ready = True
+    return conn
+
+
+# =================================================================
+# MAÇ BAŞI HESAP
+# =================================================================
+
+def team_game_lines(players_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Tipli oyuncu satırları (game_id, TEAM kolonlu) -> maç başı takım satırları:
+    game_id, team, pts, opp_pts, possessions, minutes. İki takımı olmayan maçlar atılır.
+    """
+    if players_df.empty:
+        return pd.DataFrame(columns=["game_id", "team", "pts", "opp_pts", "possessions", "minutes"])
+
+    df = players_df.astype({c: "float64" for c in ("PTS", "FGA", "FTA", "TO", "OREB", "MIN")})
+    totals = df.groupby(["game_id", "TEAM"], sort=False)[["PTS", "FGA", "FTA", "TO", "OREB", "MIN"]].sum()
+    totals = totals.reset_index()
+    totals = totals[totals.groupby("game_id")["TEAM"].transform("size") == 2]
+    if totals.empty:
+        return pd.DataFrame(columns=["game_id", "team", "pts", "opp_pts", "possessions", "minutes"])
+
+    raw_poss = totals["FGA"] - totals["OREB"] + totals["TO"] + FTA_FACTOR * totals["FTA"]
+    # Rakip sayısı = maç toplamı - kendi sayısı; possession ve dakika iki takımın ortalaması
+    by_game = totals.groupby("game_id")
+    opp_pts = by_game["PTS"].transform("sum") - totals["PTS"]
+    possessions = raw_poss.groupby(totals["game_id"]).transform("mean")
+    minutes = by_game["MIN"].transform("mean")
+
+    return pd.DataFrame({
+        "game_id": totals["game_id"].astype(str),
+        "team": totals["TEAM"].astype(str),
+        "pts": totals["PTS"].astype(int),
+        "opp_pts": opp_pts.astype(int),
+        "possessions": possessions.round(1),
+        "minutes": minutes.round(1),
+    })
+
+
+def game_rating(players: List[Dict]) -> Optional[float]:
+    """Tek maçın (canlı olabilir) ortalama offensive rating'i: 100 * toplam sayı / toplam possession."""
+    df = boxscore_ingest.ingest_players(players)
+    if df.empty or "TEAM" not in df:
+        return None
+    df["game_id"] = "_"
+    lines = team_game_lines(df)
+    if lines.empty or lines["possessions"].sum() <= 0:
+        return None
+    return round(100 * lines["pts"].sum() / lines["possessions"].sum(), 1)
+
+
+# =================================================================
+# ARTIMLI GÜNCELLEME
+# =================================================================
+
+def _pending_games(conn) -> List[tuple]:
+    return conn.execute("""
+        SELECT g.game_id, g.game_date FROM games g
+        WHERE g.is_final = 1
+          AND NOT EXISTS (SELECT 1 FROM team_game_stats t WHERE t.game_id = g.game_id)
+          AND NOT EXISTS (SELECT 1 FROM team_ratings_skipped s WHERE s.game_id = g.game_id)
+    """).fetchall()
+
+
+def update(force: bool = False) -> int:
+    """
+    Depoya yeni eklenen final maçları rating toplamlarına ekler.
+    Returns: eklenen maç sayısı
+    """
+    global _checked_at, _generation
+    if not force and time.time() - _checked_at < UPDATE_INTERVAL:
+        return 0
+
+    try:
+        conn = _get_connection()
+        with _lock:
+            _checked_at = time.time()
+            pending = _pending_games(conn)
+            if not pending:
+                return 0
+
+            dates = {gid: day for gid, day in pending}
+            frames = []
+            ids = list(dates)
+            for i in range(0, len(ids), 500):
+                chunk = ids[i:i + 500]
+                placeholders = ",".join("?" * len(chunk))
+                frames.append(pd.read_sql_query(
+                    f"SELECT game_id, team AS TEAM, min AS MIN, pts AS PTS, fga AS FGA, fta AS FTA, "
+                    f"tov AS \"TO\", oreb AS OREB FROM player_games WHERE game_id IN ({placeholders})",
+                    conn, params=chunk
+                ))
+            players = pd.concat(frames, ignore_index=True)
+            players["MIN"] = boxscore_ingest.parse_minutes_series(players["MIN"])
+            players[["PTS", "FGA", "FTA", "TO", "OREB"]] = players[["PTS", "FGA", "FTA", "TO", "OREB"]].fillna(0)
+
+            lines = team_game_lines(players)
+            lines["game_date"] = lines["game_id"].map(dates)
+
+            # Satır çıkmayan maçlar işlenmiş sayılır (bir daha okunmaz)
+            skipped = set(dates) - set(lines["game_id"])
+            now = time.time()
+            conn.executemany(
+                "INSERT OR IGNORE INTO team_ratings_skipped (game_id, skipped_at) VALUES (?, ?)",
+                [(gid, now) for gid in skipped]
+            )
+            lines["season"] = lines["game_date"].map(_season_of)
+
+            conn.executemany(
+                "INSERT OR IGNORE INTO team_game_stats "
+                "(game_id, team, season, game_date, pts, opp_pts, possessions, minutes) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                lines[["game_id", "team", "season", "game_date", "pts", "opp_pts", "possessions", "minutes"]]
+                .astype(object).itertuples(index=False, name=None)
+            )
+
+            totals = lines.groupby(["season", "team"]).agg(
+                games=("game_id", "size"), pts=("pts", "sum"), opp_pts=("opp_pts", "sum"),
+                possessions=("possessions", "sum"), minutes=("minutes", "sum")
+            ).reset_index()
+            conn.executemany("""
+                INSERT INTO team_ratings (season, team, games, pts, opp_pts, possessions, minutes, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (season, team) DO UPDATE SET
+                    games = games + excluded.games,
+                    pts = pts + excluded.pts,
+                    opp_pts = opp_pts + excluded.opp_pts,
+                    possessions = possessions + excluded.possessions,
+                    minutes = minutes + excluded.minutes,
+                    updated_at = excluded.updated_at
+            """, [(int(r.season), r.team, int(r.games), int(r.pts), int(r.opp_pts),
+                   float(r.possessions), float(r.minutes), now) for r in totals.itertuples(index=False)])
+            conn.commit()
+            _ratings_cache.clear()
+            _generation += 1
+
+        added = lines["game_id"].nunique()
+        print(f"✓ Team ratings: {added} new games added" + (f", {len(skipped)} skipped" if skipped else ""))
+        return added
+    except (sqlite3.Error, ValueError) as e:
+        print(f"Team ratings update error: {e}")
+        return 0
+
+
+# =================================================================
+# OKUMA
+# =================================================================
+
+def _current_season() -> int:
+    today = time.localtime()
+    return today.tm_year if today.tm_mon >= 8 else today.tm_year - 1
+
+
+def get_ratings(season: Optional[int] = None) -> Dict[str, Dict]:
+    """
+    Sezon rating'leri: {takım: {'offensive_rating', 'defensive_rating',
+    'net_rating', 'pace', 'games'}}. Önce yeni final maçlar eklenir.
+    """
+    update()
+    season = season if season is not None else _current_season()
+    with _lock:
+        cached = _ratings_cache.get(season)
+        generation = _generation
+    if cached is not None:
+        return cached
+
+    try:
+        rows = _get_connection().execute(
+            "SELECT team, games, pts, opp_pts, possessions, minutes FROM team_ratings WHERE season = ?",
+            (season,)
+        ).fetchall()
+    except sqlite3.Error as e:
+        print(f"Team ratings read error: {e}")
+        return {}
+
+    ratings = {}
+    for team, games, pts, opp_pts, poss, minutes in rows:
+        if not games or poss <= 0:
+            continue
+        ortg = 100 * pts / poss
+        drtg = 100 * opp_pts / poss
+        game_minutes = minutes / 5 if minutes else GAME_MINUTES * games
+        ratings[team] = {
+            "offensive_rating": round(ortg, 1),
+            "defensive_rating": round(drtg, 1),
+            "net_rating": round(ortg - drtg, 1),
+            "pace": round(GAME_MINUTES * poss / game_minutes, 1),
+            "games": games,
+        }
+    with _lock:
+        if generation == _generation:
+            _ratings_cache[season] = ratings
+    return ratings
+
+
+def get_team(team: str, season: Optional[int] = None) -> Optional[Dict]:
+    return get_ratings(season).get(str(team).upper())
+
+
+def league_average(season: Optional[int] = None) -> Optional[Dict]:
+    """Lig ortalaması ORtg / pace (takımların basit ortalaması)."""
+    ratings = get_ratings(season)
+    if not ratings:
+        return None
+    values = list(ratings.values())
+    return {
+        "offensive_rating": round(sum(r["offensive_rating"] for r in values) / len(values), 1),
+        "pace": round(sum(r["pace"] for r in values) / len(values), 1),
+    }
+
+
+def get_game_ratings(game_ids: Iterable) -> Dict[str, float]:
+    """Depodaki final maçlar için maç ortalaması ORtg: {game_id: rating}."""
+    ids = [str(g) for g in game_ids]
+    if not ids:
+        return {}
+    update()
+    result = {}
+    try:
+        conn = _get_connection()
+        for i in range(0, len(ids), 500):
+            chunk = ids[i:i + 500]
+            placeholders = ",".join("?" * len(chunk))
+            rows = conn.execute(
+                f"SELECT game_id, SUM(pts), SUM(possessions) FROM team_game_stats "
+                f"WHERE game_id IN ({placeholders}) GROUP BY game_id",
+                chunk
+            ).fetchall()
+            for gid, pts, poss in rows:
+                if poss:
+                    result[gid] = round(100 * pts / poss, 1)
+    except sqlite3.Error as e:
+        print(f"Team ratings read error: {e}")
+    return result
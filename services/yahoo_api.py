@@ -9,6 +9,8 @@ import json
 from typing import Dict, List, Optional
 import pandas as pd
 
+from services import http_client
+
 class YahooFantasyService:
     """Yahoo Fantasy Sports API entegrasyonu"""
     
@@ -34,7 +36,7 @@ class YahooFantasyService:
     
     def get_authorization_url(self) -> str:
         """OAuth authorization URL'ini döndürür"""
-        self.oauth = OAuth2Session(self.client_id, redirect_uri=self.redirect_uri)
+        self.oauth = http_client.mount_pools(OAuth2Session(self.client_id, redirect_uri=self.redirect_uri))
         authorization_url, state = self.oauth.authorization_url(self.authorization_base_url)
         return authorization_url
     
@@ -45,7 +47,7 @@ class YahooFantasyService:
         Args:
             code: Kullanıcının girdiği authorization code (Sadece kod stringi)
         """
-        self.oauth = OAuth2Session(self.client_id, redirect_uri=self.redirect_uri)
+        self.oauth = http_client.mount_pools(OAuth2Session(self.client_id, redirect_uri=self.redirect_uri))
         
         # authorization_response yerine code parametresini kullanıyoruz
         self.token = self.oauth.fetch_token(
@@ -58,7 +60,7 @@ class YahooFantasyService:
     def set_token(self, token: Dict):
         """Önceden kaydedilmiş token'ı set eder"""
         self.token = token
-        self.oauth = OAuth2Session(self.client_id, token=token)
+        self.oauth = http_client.mount_pools(OAuth2Session(self.client_id, token=token))
     
     def _make_request(self, endpoint: str) -> Dict:
         """
@@ -80,7 +82,7 @@ class YahooFantasyService:
         
         print(f"📡 Requesting: {url}") # Terminalde URL'i görmek için
         
-        response = self.oauth.get(url, headers=headers)
+        response = http_client.get(url, headers=headers, session=self.oauth)
         
         # Eğer hata varsa (400, 401, 500 vs.)
         if response.status_code != 200: